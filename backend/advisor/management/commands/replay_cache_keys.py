@@ -0,0 +1,53 @@
+import hashlib
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from pydantic import ValidationError
+
+from advisor.data_models import MatchRequest
+from advisor.services.cache_keys import content_hash
+from advisor.services.ml_client import MLServiceClient
+
+
+def legacy_cache_key(match_request: MatchRequest) -> str:
+    """The former key: MD5 of the raw request JSON."""
+    payload_str = json.dumps(match_request.model_dump(), sort_keys=True)
+    return f"ml_analysis_{hashlib.md5(payload_str.encode('utf-8')).hexdigest()}"
+
+
+class Command(BaseCommand):
+    help = ("Replays recorded match requests (JSON Lines, one MatchRequest "
+            "payload per line) against an unbounded cache and compares the hit "
+            "rate of the legacy raw-JSON keys with the canonical content keys.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="JSON Lines file of match requests.")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], encoding='utf-8') as f:
+                requests = [MatchRequest(**json.loads(line)) for line in f if line.strip()]
+        except (OSError, ValueError, ValidationError) as e:
+            raise CommandError(f"Cannot read {options['path']}: {e}")
+        if not requests:
+            raise CommandError("No requests to replay.")
+
+        # __new__: key building needs neither settings nor caches
+        client = MLServiceClient.__new__(MLServiceClient)
+        for name, make_key in (('legacy', legacy_cache_key),
+                               ('canonical', client._get_cache_key)):
+            start = time.perf_counter()
+            keys = [make_key(r) for r in requests]
+            per_key_us = (time.perf_counter() - start) / len(keys) * 1e6
+            hits = len(keys) - len(set(keys))
+            self.stdout.write(
+                f"{name:>9}: {len(set(keys))} distinct keys, {hits}/{len(keys)} hits "
+                f"({hits / len(keys):.1%}), {per_key_us:.1f} us/key")
+
+        # Either side alone is reusable (e.g. one job against many CVs)
+        for side, field in (('job', 'job_description'), ('cv', 'cv_text')):
+            raw = len({getattr(r, field) for r in requests})
+            canonical = len({content_hash(getattr(r, field)) for r in requests})
+            self.stdout.write(f"{side:>9}: {raw} distinct raw texts, "
+                              f"{canonical} distinct canonical texts")
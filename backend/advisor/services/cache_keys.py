@@ -0,0 +1,39 @@
+import hashlib
+import re
+
+# Same bullet / numbered-list pattern as the ML service's BaseParser
+BULLET = re.compile(r'^\s*(?:[-*•‣➤➔►◆▫▪]|\d+\.)\s+')
+BULLET_MARKERS = frozenset('-*•‣➤➔►◆▫▪')
+
+
+def canonical_text(text: str) -> str:
+    """
+    Canonical form of a CV or job description, mirroring the normalization
+    of `BaseParser._parse_core` in the ML service: lines are split on '\\n'
+    and stripped (so '\\r\\n' endings and indentation go), empty lines are
+    dropped and every bullet marker becomes '- '.
+
+    Texts with the same canonical form are parsed into the same sections;
+    a job offer without any signal section is analyzed in this very form
+    (`BaseParser.normalize`), not as raw text.
+    Whitespace inside a line is kept: header patterns such as
+    'work history' see it too.
+    """
+    lines = []
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        # Most lines cannot be bullets: skip the regex for them
+        if line[0] in BULLET_MARKERS or line[0].isdecimal():
+            bullet = BULLET.match(line)
+            if bullet:
+                line = '- ' + line[bullet.end():]
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def content_hash(text: str) -> str:
+    """128-bit BLAKE2b digest of the canonical form of a text."""
+    return hashlib.blake2b(canonical_text(text).encode('utf-8'),
+                           digest_size=16).hexdigest()
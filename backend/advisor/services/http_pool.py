@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+import httpx
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MLHttpPool:
+    """
+    Process-wide pooled, keep-alive HTTP client for backend -> ML service
+    calls.
+
+    The shared httpx.AsyncClient is opened and closed by the ASGI lifespan
+    (config.asgi) and is bound to the server's event loop. Calls made on any
+    other event loop (runserver/WSGI runs every async view in a fresh loop,
+    tests) get a short-lived client instead: they keep working, without
+    connection reuse.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.http2 = False
+        self.requests = 0
+        self.pooled_requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.connections_opened = 0
+        self.errors = 0
+
+    def _make_client(self, http2: bool = False) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.ML_SERVICE_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.ML_SERVICE_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.ML_SERVICE_KEEPALIVE_EXPIRY)
+        timeout = httpx.Timeout(settings.ML_SERVICE_TIMEOUT,
+                                pool=settings.ML_SERVICE_POOL_TIMEOUT)
+        return httpx.AsyncClient(limits=limits, timeout=timeout, http2=http2,
+                                 transport=self._transport)
+
+    async def start(self) -> None:
+        """Opens the shared client on the running (server) event loop."""
+        if self._client is not None:
+            return
+        http2 = settings.ML_SERVICE_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("ML_SERVICE_HTTP2 is set but the 'h2' package "
+                               "is not installed (httpx[http2]); using HTTP/1.1.")
+                http2 = False
+        self.http2 = http2
+        self._client = self._make_client(http2)
+        self._loop = asyncio.get_running_loop()
+        logger.info("ML service HTTP pool started "
+                    f"(max {settings.ML_SERVICE_MAX_CONNECTIONS} connections, "
+                    f"HTTP/{'2' if http2 else '1.1'})")
+
+    async def aclose(self) -> None:
+        """Closes the shared client and its connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            logger.info("ML service HTTP pool closed")
+        self._client = None
+        self._loop = None
+
+    @property
+    def started(self) -> bool:
+        return self._client is not None
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        """httpcore trace hook: counts the TCP connections actually opened."""
+        if event_name == "connection.connect_tcp.complete":
+            self.connections_opened += 1
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Sends a request through the shared client (or a short-lived one)."""
+        kwargs.setdefault("extensions", {})["trace"] = self._trace
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self._client is not None and self._loop is asyncio.get_running_loop():
+                self.pooled_requests += 1
+                return await self._client.request(method, url, **kwargs)
+            async with self._make_client() as client:
+                return await client.request(method, url, **kwargs)
+        except httpx.RequestError:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def probe(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Sends a health probe on a short-lived client, outside the counters:
+        probes skew neither the request counts nor the connection reuse rate.
+        """
+        async with self._make_client() as client:
+            return await client.request(method, url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool usage: requests, concurrency and connection reuse."""
+        return {
+            "started": self.started,
+            "http2": self.http2,
+            "max_connections": settings.ML_SERVICE_MAX_CONNECTIONS,
+            "max_keepalive_connections": settings.ML_SERVICE_MAX_KEEPALIVE_CONNECTIONS,
+            "requests": self.requests,
+            "pooled_requests": self.pooled_requests,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "connections_opened": self.connections_opened,
+            "connection_reuse_rate": (
+                round(1 - self.connections_opened / self.requests, 4)
+                if self.requests else 0.0),
+            "errors": self.errors,
+        }
+
+
+# Shared by every MLServiceClient of the process
+ml_http_pool = MLHttpPool()
@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set
+
+import httpx
+from django.conf import settings
+
+from advisor.services.http_pool import ml_http_pool
+
+logger = logging.getLogger(__name__)
+
+
+# Gateway / overload statuses; a plain 500 is the ML service failing on one
+# request (e.g. a CV it cannot process), not the service being down
+OUTAGE_STATUSES = frozenset({502, 503, 504})
+
+
+def is_outage(error: BaseException) -> bool:
+    """Errors that mean the ML service is unhealthy (not a rejected request)."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in OUTAGE_STATUSES
+    return isinstance(error, httpx.RequestError)
+
+
+class Replica:
+    """One ML service instance and its routing counters."""
+
+    def __init__(self, url: str):
+        self.url = url.rstrip('/')
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.ejections = 0
+
+    @property
+    def ejected(self) -> bool:
+        return time.monotonic() < self.ejected_until
+
+    def eject(self, seconds: float) -> None:
+        if not self.ejected:
+            self.ejections += 1
+        self.ejected_until = time.monotonic() + seconds
+
+    def stats(self) -> Dict[str, Any]:
+        return {"url": self.url, "ejected": self.ejected,
+                "outstanding": self.outstanding, "requests": self.requests,
+                "failures": self.failures, "ejections": self.ejections}
+
+
+class ReplicaPool:
+    """
+    Client-side load balancing across ML service replicas.
+
+    A request goes to the replica with the fewest outstanding requests
+    (counted by this process), except that the replica which last served
+    the same affinity key (the job description) is preferred while it has
+    at most `affinity_slack` more outstanding requests than the least busy
+    one: its caches already hold that job.
+
+    Replicas are ejected for `eject_seconds` after `eject_after` consecutive
+    connection errors / 502-504, and by the health checks (`start()`, run by the
+    ASGI lifespan when there are several replicas), which probe every
+    replica's readiness endpoint each `health_interval` seconds and
+    reinstate the ones that pass. If every replica is ejected, all of them
+    are used again rather than failing every request.
+    """
+
+    def __init__(self, urls: List[str], http=ml_http_pool,
+                 affinity_slack: int = 2, affinity_size: int = 10_000,
+                 eject_after: int = 3, eject_seconds: float = 30.0,
+                 health_interval: float = 5.0, health_path: str = '/health/ready'):
+        if not urls:
+            raise ValueError("At least one ML service URL is required.")
+        self.replicas = [Replica(url) for url in urls]
+        self.http = http
+        self.affinity_slack = affinity_slack
+        self.affinity_size = affinity_size
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self.health_interval = health_interval
+        self.health_path = health_path
+        self._affinity: 'OrderedDict[str, Replica]' = OrderedDict()
+        self._health_task: Optional[asyncio.Task] = None
+        self.affinity_routed = 0
+        self.all_ejected_routed = 0
+
+    def pick(self, affinity_key: Optional[str] = None,
+             avoid: Set[str] = frozenset()) -> Replica:
+        """The replica for the next request (not one of `avoid`, if possible)."""
+        candidates = [r for r in self.replicas if not r.ejected]
+        if not candidates:
+            self.all_ejected_routed += 1
+            candidates = self.replicas
+        candidates = [r for r in candidates if r.url not in avoid] or candidates
+
+        least = min(r.outstanding for r in candidates)
+        preferred = self._affinity.get(affinity_key) if affinity_key else None
+        if (preferred in candidates
+                and preferred.outstanding <= least + self.affinity_slack):
+            self.affinity_routed += 1
+            return preferred
+        return random.choice([r for r in candidates if r.outstanding == least])
+
+    def _remember(self, affinity_key: str, replica: Replica) -> None:
+        self._affinity[affinity_key] = replica
+        self._affinity.move_to_end(affinity_key)
+        if len(self._affinity) > self.affinity_size:
+            self._affinity.popitem(last=False)
+
+    async def post(self, path: str, affinity_key: Optional[str] = None,
+                   tried: Optional[Set[str]] = None, **kwargs) -> httpx.Response:
+        """
+        POSTs to the chosen replica; non-2xx responses raise HTTPStatusError.
+        The replica's URL is added to `tried`, so a hedged attempt of the
+        same call goes elsewhere.
+        """
+        replica = self.pick(affinity_key, tried or frozenset())
+        if tried is not None:
+            tried.add(replica.url)
+        replica.outstanding += 1
+        replica.requests += 1
+        try:
+            response = await self.http.post(f"{replica.url}{path}", **kwargs)
+            response.raise_for_status()
+        except Exception as e:
+            if is_outage(e):
+                self._failed(replica)
+            raise
+        finally:
+            replica.outstanding -= 1
+
+        replica.consecutive_failures = 0
+        if affinity_key:
+            self._remember(affinity_key, replica)
+        return response
+
+    def _failed(self, replica: Replica) -> None:
+        replica.failures += 1
+        replica.consecutive_failures += 1
+        if replica.consecutive_failures >= self.eject_after:
+            logger.warning(f"Ejecting ML replica {replica.url} after "
+                           f"{replica.consecutive_failures} failures")
+            replica.eject(self.eject_seconds)
+
+    # --- Health checks ---
+
+    async def check_health(self) -> None:
+        """Probes every replica once: ejects failing ones, reinstates the others."""
+        async def probe(replica: Replica) -> None:
+            try:
+                response = await self.http.probe(
+                    'GET', f"{replica.url}{self.health_path}", timeout=2.0)
+                healthy = response.status_code == 200
+            except httpx.RequestError:
+                healthy = False
+            if healthy:
+                replica.ejected_until = 0.0
+                replica.consecutive_failures = 0
+            else:
+                if not replica.ejected:
+                    logger.warning(f"ML replica {replica.url} failed its health check")
+                replica.eject(self.eject_seconds)
+
+        await asyncio.gather(*(probe(r) for r in self.replicas))
+
+    async def _health_loop(self) -> None:
+        while True:
+            try:
+                await self.check_health()
+            except Exception:
+                logger.exception("ML replica health check failed")
+            await asyncio.sleep(self.health_interval)
+
+    async def start(self) -> None:
+        """Starts the periodic health checks (pointless with one replica)."""
+        if self._health_task is None and len(self.replicas) > 1:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def aclose(self) -> None:
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+        self._health_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "health_checks": self._health_task is not None,
+            "affinity_entries": len(self._affinity),
+            "affinity_routed": self.affinity_routed,
+            "all_ejected_routed": self.all_ejected_routed,
+            "replicas": [r.stats() for r in self.replicas],
+        }
+
+
+# Shared by every MLServiceClient of the process
+ml_replicas = ReplicaPool(
+    settings.ML_SERVICE_URLS,
+    affinity_slack=settings.ML_REPLICA_AFFINITY_SLACK,
+    eject_after=settings.ML_REPLICA_EJECT_AFTER,
+    eject_seconds=settings.ML_REPLICA_EJECT_SECONDS,
+    health_interval=settings.ML_REPLICA_HEALTH_INTERVAL)
@@ -1,70 +1,205 @@
 import logging
-import json
-import hashlib
+import math
+import random
+import time
+from collections import Counter
+from typing import Any, Dict
+
 from django.conf import settings
-from django.core.cache import cache
+from django.core.cache import caches
 import httpx
 from pydantic import ValidationError
 
 from advisor.data_models import MatchRequest, MatchResponse
+from advisor.services.cache_keys import content_hash
+from advisor.services.load_balancer import is_outage, ml_replicas
+from advisor.services.resilience import CircuitBreaker, Hedger
+from advisor.services.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
+# Process-wide: a new MLServiceClient is created for every request
+match_flights = SingleFlight()
+cache_counters: Counter = Counter()
+ml_hedger = Hedger(percentile=settings.ML_HEDGE_PERCENTILE,
+                   min_delay=settings.ML_HEDGE_MIN_DELAY,
+                   max_ratio=settings.ML_HEDGE_MAX_RATIO)
+ml_breaker = CircuitBreaker(failure_threshold=settings.ML_CIRCUIT_FAILURE_THRESHOLD,
+                            reset_timeout=settings.ML_CIRCUIT_RESET_TIMEOUT,
+                            is_failure=is_outage)
+
+
+def final_score(semantic_score: float, keyword_score: float,
+                action_verb_score: float, alpha: float) -> float:
+    """
+    STEP 4 of the ML service's `calculate_match` (`_final_response`):
+    alpha-weighted semantic and keyword scores, plus up to 5% for action
+    verbs, clamped to [0, 1]. Computed from the rounded sub-scores of the
+    response, so it may differ from the service's own value by 1e-4.
+    """
+    base_score = alpha * semantic_score + (1.0 - alpha) * keyword_score
+    score = base_score * 0.95 + action_verb_score * 0.05
+    return round(max(0.0, min(score, 1.0)), 4)
+
+
+def with_final_score(data: Dict[str, Any], alpha: float) -> MatchResponse:
+    """MatchResponse from a cached alpha-free analysis, scored for `alpha`."""
+    return MatchResponse(**{**data, 'final_score': final_score(
+        data['semantic_score'], data['keyword_score'],
+        data['action_verb_score'], alpha)})
+
 
 class MLServiceClient:
     """Async client for communicating with the FastAPI ML service."""
 
     def __init__(self):
-        self.base_url = settings.ML_SERVICE_URL
-        self.timeout = settings.ML_SERVICE_TIMEOUT
+        # Replicas balanced by load and job affinity; connections come from
+        # the process-wide pool (keep-alive, limits)
+        self.replicas = ml_replicas
+        # Two-tier result cache shared by the worker processes
+        self.cache = caches[settings.ML_RESULT_CACHE]
         self.cache_ttl = 60 * 60  # Cache TTL in seconds (1 hour)
+        self.early_refresh_beta = settings.ML_CACHE_EARLY_REFRESH_BETA
+        # Expired entries are kept this long, for when the ML service is down
+        self.stale_ttl = settings.ML_CACHE_STALE_TTL
+        self.hedger = ml_hedger
+        self.breaker = ml_breaker
 
     def _get_cache_key(self, match_request: MatchRequest) -> str:
-        """Generate a secure, unique cache key using MD5 hash."""
-        payload_str = json.dumps(match_request.model_dump(), sort_keys=True)
-        key_hash = hashlib.md5(payload_str.encode('utf-8')).hexdigest()
-        return f"ml_analysis_{key_hash}"
+        """
+        Cache key from the content hashes of the job and the CV (hashed
+        separately, on their canonical form), so whitespace, bullet or
+        line-ending variants share one entry. Neither `alpha` nor
+        `ai_deep_analysis` changes the cached analysis: they are not part
+        of the key.
+        """
+        job_hash = content_hash(match_request.job_description)
+        cv_hash = content_hash(match_request.cv_text)
+        return f"ml_analysis_{job_hash}_{cv_hash}"
+
+    def _should_refresh_early(self, entry: Dict[str, Any]) -> bool:
+        """
+        Probabilistic early expiration (XFetch): the closer an entry is to
+        its expiry and the slower it was to compute, the likelier a reader
+        recomputes it now, so popular entries never expire all at once.
+        """
+        if self.early_refresh_beta <= 0:
+            return False
+        gap = -entry['delta'] * self.early_refresh_beta * math.log(
+            1.0 - random.random())
+        return time.time() + gap >= entry['expires']
 
     async def analyze_match(self,
                             match_request: MatchRequest
                             ) -> MatchResponse:
         """
         Analyze CV-job match with Django caching to reduce ML service calls.
+        The cache holds the alpha-free analysis and `final_score` is
+        computed for the requested alpha, so changing alpha never calls
+        the ML service. Concurrent misses for the same key share a single
+        ML call. When the ML service fails (or its circuit is open), an
+        expired entry is served instead.
         """
         cache_key = self._get_cache_key(match_request)
+        alpha = match_request.alpha
 
         # Check cache first
-        cached_data = await cache.aget(cache_key)
-        if cached_data:
+        entry = await self.cache.aget(cache_key)
+        stale = entry is not None and time.time() >= entry['expires']
+        if entry and not stale and not self._should_refresh_early(entry):
+            cache_counters['hits'] += 1
             logger.info(f"Cache HIT for key: {cache_key}")
-            return MatchResponse(**cached_data)
+            return with_final_score(entry['data'], alpha)
+
+        if entry and not stale:
+            # Still valid: recompute now, fall back to it on failure
+            cache_counters['early_refreshes'] += 1
+            logger.info(f"Cache early refresh for key: {cache_key}")
+        else:
+            # Cache miss - call ML service (once for all concurrent callers,
+            # whatever alpha each of them asked for)
+            cache_counters['misses'] += 1
+            logger.info(f"Cache MISS for key: {cache_key}")
+
+        try:
+            data = await match_flights.do(
+                cache_key, lambda: self._fetch(cache_key, match_request))
+        except Exception as e:
+            if entry is None:
+                raise
+            cache_counters['stale_served' if stale else 'refresh_failures'] += 1
+            logger.warning(f"ML call failed, serving cached analysis: {e}")
+            data = entry['data']
+        return with_final_score(data, alpha)
 
-        # Cache miss - call ML service
-        logger.info(f"Cache MISS for key: {cache_key}")
-        endpoint = f"{self.base_url}/match"
+    async def _fetch(self, cache_key: str,
+                     match_request: MatchRequest) -> Dict[str, Any]:
+        """
+        Calls the ML service through the circuit breaker (fails fast while
+        it is down), hedging slow attempts on another replica, and caches
+        the alpha-free analysis.
+        """
+        try:
+            # Pydantic -> Dict -> JSON (the ML service ignores the AI flag)
+            payload = match_request.model_dump(exclude={'ai_deep_analysis'})
+            # Same job -> same replica, whose caches already hold it
+            job_hash = content_hash(match_request.job_description)
+            tried = set()
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                # Pydantic -> Dict -> JSON
-                payload = match_request.model_dump()
+            start = time.perf_counter()
+            response = await self.breaker.call(lambda: self.hedger.run(
+                lambda: self.replicas.post('/match', affinity_key=job_hash,
+                                           tried=tried, json=payload)))
 
-                response = await client.post(endpoint, json=payload)
-                response.raise_for_status()
+            # JSON -> Pydantic; final_score is recomputed per alpha on read
+            data = MatchResponse(**response.json()).model_dump(
+                exclude={'final_score'})
 
-                # JSON -> Pydantic
-                result = MatchResponse(**response.json())
+            # Store in Django cache, with what early refresh needs:
+            # the recompute time and the absolute (fresh) expiry. The entry
+            # itself outlives it by the stale TTL.
+            await self.cache.aset(cache_key, {
+                'data': data,
+                'delta': time.perf_counter() - start,
+                'expires': time.time() + self.cache_ttl,
+            }, timeout=self.cache_ttl + self.stale_ttl)
 
-                # Store in Django cache
-                await cache.aset(cache_key, result.model_dump(),
-                                 timeout=self.cache_ttl)
+            return data
 
-                return result
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                "ML Service error "
+                f"{e.response.status_code}: {e.response.text}")
+            raise ValueError(f"ML Service error: {e.response.status_code}")
+        except (httpx.RequestError, ValidationError) as e:
+            logger.error(f"Connection/Validation error: {e}")
+            raise
 
-            except httpx.HTTPStatusError as e:
-                logger.error(
-                    "ML Service error "
-                    f"{e.response.status_code}: {e.response.text}")
-                raise ValueError(f"ML Service error: {e.response.status_code}")
-            except (httpx.RequestError, ValidationError) as e:
-                logger.error(f"Connection/Validation error: {e}")
-                raise
+    @staticmethod
+    async def stats() -> Dict[str, Any]:
+        """Result cache, coalescing, hedging, circuit breaker and replica counters."""
+        lookups = cache_counters['hits'] + cache_counters['misses']
+        result_cache = caches[settings.ML_RESULT_CACHE]
+        # Per-tier counters of the cache backend, when it has them (off the event loop)
+        if hasattr(result_cache, 'astats'):
+            result_cache_stats = await result_cache.astats()
+        elif hasattr(result_cache, 'stats'):
+            result_cache_stats = result_cache.stats()
+        else:
+            result_cache_stats = None
+        return {
+            'cache': {
+                'hits': cache_counters['hits'],
+                'misses': cache_counters['misses'],
+                'early_refreshes': cache_counters['early_refreshes'],
+                'refresh_failures': cache_counters['refresh_failures'],
+                'stale_served': cache_counters['stale_served'],
+                'hit_rate': (round(cache_counters['hits'] / lookups, 4)
+                             if lookups else 0.0),
+            },
+            'single_flight': match_flights.stats(),
+            'hedging': ml_hedger.stats(),
+            'circuit_breaker': ml_breaker.stats(),
+            'load_balancer': ml_replicas.stats(),
+            'result_cache': result_cache_stats,
+        }
@@ -0,0 +1,181 @@
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class Hedger:
+    """
+    Hedged requests: when the first attempt has not answered after the
+    `percentile` latency of recent attempts, a second one is sent and the
+    first success wins (the other attempt is cancelled).
+
+    No hedging until `min_samples` latencies were seen, and at most
+    `max_ratio` of the calls are hedged, so a slow service is not sent
+    twice the load. `percentile=0` disables hedging.
+    """
+
+    def __init__(self, percentile: float = 95, min_delay: float = 0.05,
+                 max_ratio: float = 0.1, min_samples: int = 20,
+                 window: int = 500):
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_ratio = max_ratio
+        self.min_samples = min_samples
+        self._latencies: deque = deque(maxlen=window)
+        self.calls = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.over_budget = 0
+
+    def record(self, seconds: float) -> None:
+        self._latencies.append(seconds)
+
+    def latency_percentile(self, q: float) -> Optional[float]:
+        if not self._latencies:
+            return None
+        ordered = sorted(self._latencies)
+        return ordered[max(math.ceil(q / 100 * len(ordered)) - 1, 0)]
+
+    def delay(self) -> Optional[float]:
+        """Seconds to wait before hedging, None while hedging is off."""
+        if self.percentile <= 0 or len(self._latencies) < max(self.min_samples, 1):
+            return None
+        return max(self.latency_percentile(self.percentile), self.min_delay)
+
+    async def _timed(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        # Failed and cancelled (out-hedged) attempts are recorded too, their
+        # elapsed time as a lower bound: only keeping the attempts that won
+        # would drag the percentile down to the fast ones
+        start = time.perf_counter()
+        try:
+            return await fn()
+        finally:
+            self.record(time.perf_counter() - start)
+
+    async def run(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Result of the first successful attempt of `fn`."""
+        self.calls += 1
+        delay = self.delay()
+        first = asyncio.ensure_future(self._timed(fn))
+        attempts = [first]
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait({first}, timeout=delay)
+                if not done:
+                    if self.hedged < self.max_ratio * self.calls:
+                        self.hedged += 1
+                        attempts.append(asyncio.ensure_future(self._timed(fn)))
+                    else:
+                        self.over_budget += 1
+
+            pending, error = set(attempts), None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in done:
+                    if attempt.exception() is None:
+                        if attempt is not first:
+                            self.hedge_wins += 1
+                        return attempt.result()
+                    error = attempt.exception()
+            raise error
+        finally:
+            for attempt in attempts:
+                if attempt.done() and not attempt.cancelled():
+                    attempt.exception()  # retrieved: no "never retrieved" warning
+                attempt.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        delay = self.delay()
+        p50, p95 = self.latency_percentile(50), self.latency_percentile(95)
+        return {
+            "calls": self.calls,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "over_budget": self.over_budget,
+            "hedge_rate": round(self.hedged / self.calls, 4) if self.calls else 0.0,
+            "delay_ms": round(delay * 1000, 1) if delay is not None else None,
+            "latency_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "latency_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a service whose circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Fails fast while a service is down: after `failure_threshold`
+    consecutive failures the circuit opens and calls raise
+    CircuitOpenError. After `reset_timeout` seconds one trial call is let
+    through (half-open); its success closes the circuit, its failure opens
+    it again.
+
+    `is_failure` decides which exceptions count (e.g. connection errors
+    and 502-504, not a rejected request).
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 is_failure: Callable[[BaseException], bool] = lambda e: True):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.is_failure = is_failure
+        self.consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self.counters = {"successes": 0, "failures": 0,
+                         "short_circuited": 0, "opened": 0}
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self.counters["opened"] += 1
+
+    async def call(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        state = self.state
+        if state == self.OPEN or (state == self.HALF_OPEN and self._trial_running):
+            self.counters["short_circuited"] += 1
+            raise CircuitOpenError("Circuit is open, failing fast")
+
+        trial = state == self.HALF_OPEN
+        self._trial_running = self._trial_running or trial
+        try:
+            result = await fn()
+        except Exception as e:
+            if not self.is_failure(e):
+                self._succeeded()
+                raise
+            self.counters["failures"] += 1
+            self.consecutive_failures += 1
+            if trial or (self._opened_at is None
+                         and self.consecutive_failures >= self.failure_threshold):
+                self._open()
+            raise
+        else:
+            self._succeeded()
+            return result
+        finally:
+            if trial:
+                self._trial_running = False
+
+    def _succeeded(self) -> None:
+        self.counters["successes"] += 1
+        self.consecutive_failures = 0
+        self._opened_at = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                **self.counters}
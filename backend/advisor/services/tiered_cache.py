@@ -0,0 +1,288 @@
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+
+class _ProcessState:
+    """L1 entries, counters and SQLite connections of one cache location."""
+
+    def __init__(self):
+        # key -> (expires or None, compressed value)
+        self.l1: 'OrderedDict[str, Tuple[Optional[float], bytes]]' = OrderedDict()
+        self.l1_bytes = 0
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.counters: Counter = Counter()
+
+
+# Django creates a backend instance per thread / async context; like
+# LocMemCache, the process-wide state lives at module level
+_states: Dict[str, _ProcessState] = {}
+_states_lock = threading.Lock()
+
+
+class TieredCache(BaseCache):
+    """
+    Two-tier Django cache backend for ML analyses.
+
+    L1: a small in-process LRU in front of
+    L2: a SQLite file shared by every worker process on the host.
+
+    Values are pickled and zlib-compressed once; both tiers hold the
+    compressed bytes and enforce a byte budget (least recently used entries
+    are evicted first; L2 may overshoot by ~1% between checks). L1 entries
+    live at most L1_TIMEOUT seconds, so a value replaced or deleted by
+    another worker is not served for long.
+
+    OPTIONS: L1_MAX_BYTES, L2_MAX_BYTES, L1_TIMEOUT, COMPRESS_LEVEL.
+    """
+
+    def __init__(self, location: str, params: Dict[str, Any]):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.path = Path(location)
+        self.l1_max_bytes = int(options.get('L1_MAX_BYTES', 16 * 1024 * 1024))
+        self.l2_max_bytes = int(options.get('L2_MAX_BYTES', 512 * 1024 * 1024))
+        self.l1_timeout = float(options.get('L1_TIMEOUT', 60))
+        self.compress_level = int(options.get('COMPRESS_LEVEL', 6))
+
+        with _states_lock:
+            self._state = _states.setdefault(str(self.path), _ProcessState())
+        self._l1 = self._state.l1
+        self._lock = self._state.lock
+        self._local = self._state.local
+        self.counters = self._state.counters
+
+    # --- Storage helpers ---
+
+    def _db(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections are not shareable)."""
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.execute('CREATE TABLE IF NOT EXISTS entries ('
+                       'key TEXT PRIMARY KEY, value BLOB NOT NULL, '
+                       'expires REAL, size INTEGER NOT NULL, accessed REAL NOT NULL)')
+            db.execute('CREATE INDEX IF NOT EXISTS entries_accessed '
+                       'ON entries (accessed)')
+            self._local.db = db
+        return db
+
+    def _encode(self, value: Any) -> bytes:
+        raw = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        blob = zlib.compress(raw, self.compress_level)
+        self._count(raw_bytes=len(raw), stored_bytes=len(blob))
+        return blob
+
+    def _count(self, **increments: int) -> None:
+        """Adds to the shared counters (they are updated from executor threads)."""
+        with self._lock:
+            self.counters.update(increments)
+
+    @staticmethod
+    def _decode(blob: bytes) -> Any:
+        return pickle.loads(zlib.decompress(blob))
+
+    @staticmethod
+    def _expired(expires: Optional[float], now: float) -> bool:
+        return expires is not None and expires <= now
+
+    def _l1_get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._l1.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry[0], time.time()):
+                self._l1_pop(key)
+                return None
+            self._l1.move_to_end(key)
+            return entry[1]
+
+    def _l1_set(self, key: str, blob: bytes, expires: Optional[float]) -> None:
+        if len(blob) > self.l1_max_bytes:
+            return
+        l1_expires = time.time() + self.l1_timeout
+        expires = l1_expires if expires is None else min(expires, l1_expires)
+        with self._lock:
+            self._l1_pop(key)
+            self._l1[key] = (expires, blob)
+            self._state.l1_bytes += len(blob)
+            while self._state.l1_bytes > self.l1_max_bytes:
+                _, (_, evicted) = self._l1.popitem(last=False)
+                self._state.l1_bytes -= len(evicted)
+                self.counters['l1_evictions'] += 1
+
+    def _l1_pop(self, key: str) -> None:
+        """Removes a key from L1 (caller holds the lock)."""
+        entry = self._l1.pop(key, None)
+        if entry is not None:
+            self._state.l1_bytes -= len(entry[1])
+
+    def _l2_get(self, key: str) -> Optional[Tuple[Optional[float], bytes]]:
+        db = self._db()
+        row = db.execute('SELECT expires, value FROM entries WHERE key = ?',
+                         (key,)).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if self._expired(row[0], now):
+            db.execute('DELETE FROM entries WHERE key = ?', (key,))
+            return None
+        db.execute('UPDATE entries SET accessed = ? WHERE key = ?', (now, key))
+        return row[0], row[1]
+
+    def _l2_set(self, key: str, blob: bytes, expires: Optional[float]) -> None:
+        if len(blob) > self.l2_max_bytes:
+            return
+        db = self._db()
+        now = time.time()
+        db.execute('INSERT OR REPLACE INTO entries (key, value, expires, size, accessed) '
+                   'VALUES (?, ?, ?, ?, ?)', (key, blob, expires, len(blob), now))
+        # Summing the sizes scans the table: only check once ~1% of the
+        # budget was written since the last check (by this process)
+        with self._lock:
+            self.counters['l2_unchecked_bytes'] += len(blob)
+            if self.counters['l2_unchecked_bytes'] < self.l2_max_bytes // 100:
+                return
+            self.counters['l2_unchecked_bytes'] = 0
+        self._l2_enforce_budget(db, now)
+
+    def _l2_enforce_budget(self, db: sqlite3.Connection, now: float) -> None:
+        """Drops expired, then least recently used rows until the budget holds."""
+        total = db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.l2_max_bytes:
+            return
+        db.execute('DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?', (now,))
+        total = db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        excess, victims = total - self.l2_max_bytes, []
+        for key, size in db.execute('SELECT key, size FROM entries ORDER BY accessed'):
+            if excess <= 0:
+                break
+            victims.append((key,))
+            excess -= size
+        db.executemany('DELETE FROM entries WHERE key = ?', victims)
+        self._count(l2_evictions=len(victims))
+
+    # --- Lookups shared by the sync and async API ---
+
+    def _lookup_l2(self, key: str) -> Optional[bytes]:
+        entry = self._l2_get(key)
+        if entry is None:
+            self._count(misses=1)
+            return None
+        self._count(l2_hits=1)
+        self._l1_set(key, entry[1], entry[0])
+        return entry[1]
+
+    def _store(self, key: str, value: Any, timeout) -> None:
+        expires = self.get_backend_timeout(timeout)
+        blob = self._encode(value)
+        self._l2_set(key, blob, expires)
+        self._l1_set(key, blob, expires)
+
+    # --- Django cache API ---
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        blob = self._l1_get(key)
+        if blob is not None:
+            self._count(l1_hits=1)
+        else:
+            blob = self._lookup_l2(key)
+        return default if blob is None else self._decode(blob)
+
+    async def aget(self, key, default=None, version=None):
+        # L1 answers on the event loop; only SQLite goes to a thread
+        key = self.make_and_validate_key(key, version=version)
+        blob = self._l1_get(key)
+        if blob is not None:
+            self._count(l1_hits=1)
+        else:
+            blob = await sync_to_async(self._lookup_l2, thread_sensitive=False)(key)
+        return default if blob is None else self._decode(blob)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self._store(self.make_and_validate_key(key, version=version), value, timeout)
+
+    async def aset(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        await sync_to_async(self._store, thread_sensitive=False)(key, value, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        if self.has_key(key, version=version):
+            return False
+        self.set(key, value, timeout, version=version)
+        return True
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._l1_get(key) is not None or self._l2_get(key) is not None
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        expires = self.get_backend_timeout(timeout)
+        updated = self._db().execute('UPDATE entries SET expires = ? WHERE key = ?',
+                                     (expires, key)).rowcount
+        with self._lock:
+            self._l1_pop(key)
+        return bool(updated)
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._lock:
+            self._l1_pop(key)
+        return bool(self._db().execute('DELETE FROM entries WHERE key = ?',
+                                       (key,)).rowcount)
+
+    def clear(self):
+        with self._lock:
+            self._l1.clear()
+            self._state.l1_bytes = 0
+        self._db().execute('DELETE FROM entries')
+
+    def close(self, **kwargs):
+        # Connections are per thread and reused across requests
+        pass
+
+    async def astats(self) -> Dict[str, Any]:
+        """stats() in a worker thread, for async views."""
+        return await sync_to_async(self.stats, thread_sensitive=False)()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-tier hit ratios, bytes held and compression (queries SQLite)."""
+        l2_entries, l2_bytes = self._db().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        with self._lock:
+            l1_entries, l1_bytes = len(self._l1), self._state.l1_bytes
+            c = Counter(self.counters)
+        lookups = c['l1_hits'] + c['l2_hits'] + c['misses']
+        l2_lookups = c['l2_hits'] + c['misses']
+        return {
+            'lookups': lookups,
+            'hit_ratio': round((c['l1_hits'] + c['l2_hits']) / lookups, 4) if lookups else 0.0,
+            'l1': {
+                'entries': l1_entries, 'bytes': l1_bytes, 'max_bytes': self.l1_max_bytes,
+                'hits': c['l1_hits'], 'evictions': c['l1_evictions'],
+                'hit_ratio': round(c['l1_hits'] / lookups, 4) if lookups else 0.0,
+            },
+            'l2': {
+                'entries': l2_entries, 'bytes': l2_bytes, 'max_bytes': self.l2_max_bytes,
+                'hits': c['l2_hits'], 'evictions': c['l2_evictions'],
+                # Share of the L1 misses that L2 answered
+                'hit_ratio': round(c['l2_hits'] / l2_lookups, 4) if l2_lookups else 0.0,
+            },
+            'misses': c['misses'],
+            'compression_ratio': (round(c['raw_bytes'] / c['stored_bytes'], 2)
+                                  if c['stored_bytes'] else 0.0),
+        }
@@ -0,0 +1,673 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import StringIO
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from config.asgi import LifespanApplication
+from .data_models import MatchRequest
+from .services.cache_keys import canonical_text, content_hash
+from .services.http_pool import MLHttpPool, ml_http_pool
+from .services.load_balancer import ReplicaPool, is_outage
+from .services.ml_client import MLServiceClient, final_score
+from .services.resilience import CircuitBreaker, CircuitOpenError, Hedger
+from .services.single_flight import SingleFlight
+from .services.tiered_cache import TieredCache, _states
+from .views import MLServiceStatsView
+
+
+async def keep_alive_server(body: bytes = b'{}'):
+    """Minimal HTTP/1.1 keep-alive server; returns (server, url, connections)."""
+    connections = []
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        while True:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+            except asyncio.IncompleteReadError:
+                break  # The client closed the connection
+            length = next((int(line.split(b':')[1]) for line in head.split(b'\r\n')
+                           if line.lower().startswith(b'content-length')), 0)
+            await reader.readexactly(length)
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                         b'Content-Length: %d\r\n\r\n%s' % (len(body), body))
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f'http://127.0.0.1:{port}', connections
+
+
+# final_score as the ML service computes it for the default alpha (0.7)
+ML_RESULT = {
+    'final_score': 0.6888, 'semantic_score': 0.74, 'keyword_score': 0.62,
+    'action_verb_score': 0.4, 'common_keywords': ['python'],
+    'missing_keywords': ['sql'], 'section_scores': {'experience': 0.8},
+    'details': [],
+}
+
+MATCH_REQUEST = MatchRequest(
+    job_description='Python developer with SQL experience for REST APIs. ' * 2,
+    cv_text='Built REST APIs in Python backed by PostgreSQL databases. ' * 2,
+)
+
+
+def result_cache_settings(**options):
+    """CACHES with the ML result cache in a fresh temporary SQLite file."""
+    location = str(Path(tempfile.mkdtemp()) / 'ml_results.sqlite3')
+    return {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+        'ml_results': {'BACKEND': 'advisor.services.tiered_cache.TieredCache',
+                       'LOCATION': location, 'OPTIONS': options},
+    }
+
+
+def ml_client(post: AsyncMock) -> MLServiceClient:
+    """MLServiceClient whose HTTP calls go to `post` (own breaker, no hedging)."""
+    client = MLServiceClient()
+    client.replicas = ReplicaPool(['http://ml'], http=MagicMock(post=post))
+    client.breaker = CircuitBreaker(failure_threshold=2, is_failure=is_outage)
+    client.hedger = Hedger(percentile=0)
+    return client
+
+
+def slow_response(result=ML_RESULT, delay: float = 0.05) -> AsyncMock:
+    async def post(url, **kwargs):
+        await asyncio.sleep(delay)
+        return httpx.Response(200, json=result, request=httpx.Request('POST', url))
+    return AsyncMock(side_effect=post)
+
+
+class MLHttpPoolTests(SimpleTestCase):
+    """Pooled backend -> ML service client."""
+
+    async def test_shared_client_reuses_connections(self):
+        server, url, connections = await keep_alive_server()
+        pool = MLHttpPool()
+        await pool.start()
+        try:
+            for _ in range(5):
+                response = await pool.post(f'{url}/match', json={'a': 1})
+                self.assertEqual(response.json(), {})
+        finally:
+            await pool.aclose()
+            server.close()
+
+        self.assertEqual(len(connections), 1)
+        stats = pool.stats()
+        self.assertEqual(stats['requests'], 5)
+        self.assertEqual(stats['pooled_requests'], 5)
+        self.assertEqual(stats['connections_opened'], 1)
+        self.assertEqual(stats['connection_reuse_rate'], 0.8)
+        self.assertEqual(stats['in_flight'], 0)
+        self.assertFalse(stats['started'])
+
+    async def test_without_lifespan_uses_short_lived_clients(self):
+        """Another event loop (runserver, tests) gets a one-off client."""
+        server, url, connections = await keep_alive_server()
+        pool = MLHttpPool()
+        try:
+            for _ in range(2):
+                await pool.post(f'{url}/match', json={})
+        finally:
+            server.close()
+
+        self.assertEqual(len(connections), 2)
+        self.assertEqual(pool.stats()['pooled_requests'], 0)
+
+    async def test_request_errors_are_counted(self):
+        def fail(request):
+            raise httpx.ConnectError('refused', request=request)
+
+        pool = MLHttpPool(transport=httpx.MockTransport(fail))
+        await pool.start()
+        with self.assertRaises(httpx.ConnectError):
+            await pool.post('http://ml/match', json={})
+        await pool.aclose()
+        self.assertEqual(pool.stats()['errors'], 1)
+
+
+class LifespanTests(SimpleTestCase):
+
+    async def test_lifespan_opens_and_closes_the_pool(self):
+        messages = iter([{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}])
+        sent, started = [], []
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            sent.append(message['type'])
+            started.append(ml_http_pool.started)
+
+        app = LifespanApplication(MagicMock())
+        await app({'type': 'lifespan'}, receive, send)
+
+        self.assertEqual(sent, ['lifespan.startup.complete', 'lifespan.shutdown.complete'])
+        self.assertEqual(started, [True, False])
+        app.app.assert_not_called()
+
+
+@override_settings(CACHES=result_cache_settings())
+class MLServiceStatsViewTests(SimpleTestCase):
+
+    async def test_staff_sees_pool_stats(self):
+        request = APIRequestFactory().get('/advisor/ml-service/stats/')
+        force_authenticate(request, user=MagicMock(pk=1, is_staff=True))
+        response = await MLServiceStatsView.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        stats = json.loads(response.render().content)
+        self.assertIn('connection_reuse_rate', stats['http_pool'])
+        self.assertIn('hit_ratio', stats['result_cache']['l1'])
+
+    async def test_result_cache_stats_run_off_the_event_loop(self):
+        loops = []
+        original = TieredCache.stats
+
+        def stats(cache):
+            try:
+                loops.append(asyncio.get_running_loop())
+            except RuntimeError:
+                loops.append(None)
+            return original(cache)
+
+        request = APIRequestFactory().get('/advisor/ml-service/stats/')
+        force_authenticate(request, user=MagicMock(pk=1, is_staff=True))
+        with patch.object(TieredCache, 'stats', stats):
+            response = await MLServiceStatsView.as_view()(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(loops, [None])  # SQLite was queried in a worker thread
+
+
+class SingleFlightTests(SimpleTestCase):
+
+    async def test_cancelled_caller_does_not_cancel_the_shared_call(self):
+        flights = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return 42
+
+        first = asyncio.create_task(flights.do('key', work))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flights.do('key', work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        self.assertEqual(await second, 42)
+        self.assertEqual(flights.stats()['calls'], 1)
+        self.assertEqual(flights.stats()['in_flight'], 0)
+
+
+@override_settings(CACHES=result_cache_settings())
+class MLServiceClientTests(SimpleTestCase):
+    """Result caching, request coalescing and early refresh."""
+
+    def setUp(self):
+        caches['ml_results'].clear()
+
+    async def test_concurrent_misses_share_one_ml_call(self):
+        post = slow_response()
+        client = ml_client(post)
+
+        results = await asyncio.gather(
+            *[client.analyze_match(MATCH_REQUEST) for _ in range(10)])
+
+        self.assertEqual(post.await_count, 1)
+        self.assertTrue(all(r == results[0] for r in results))
+        self.assertEqual(results[0].final_score, ML_RESULT['final_score'])
+        await client.analyze_match(MATCH_REQUEST)  # now a plain cache hit
+        self.assertEqual(post.await_count, 1)
+
+    async def test_failures_are_shared_and_not_cached(self):
+        async def refused(url, **kwargs):
+            await asyncio.sleep(0.01)
+            raise httpx.ConnectError('refused')
+
+        post = AsyncMock(side_effect=refused)
+        client = ml_client(post)
+        results = await asyncio.gather(
+            *[client.analyze_match(MATCH_REQUEST) for _ in range(3)],
+            return_exceptions=True)
+
+        self.assertTrue(all(isinstance(r, httpx.ConnectError) for r in results))
+        self.assertEqual(post.await_count, 1)
+        client.replicas.http.post = slow_response(delay=0)
+        self.assertEqual((await client.analyze_match(MATCH_REQUEST)).final_score, 0.6888)
+
+    async def test_early_refresh_near_expiry(self):
+        client = ml_client(slow_response(delay=0))
+        key = client._get_cache_key(MATCH_REQUEST)
+        stale = dict(ML_RESULT, semantic_score=0.1)
+        await client.cache.aset(key, {'data': stale, 'delta': 1.0,
+                               'expires': time.time() + 0.5})
+
+        with patch('advisor.services.ml_client.random.random', return_value=0.9):
+            result = await client.analyze_match(MATCH_REQUEST)
+
+        self.assertEqual(result.semantic_score, 0.74)
+        self.assertEqual((await client.cache.aget(key))['data']['semantic_score'], 0.74)
+        self.assertGreater((await client.cache.aget(key))['expires'], time.time() + 3000)
+
+    async def test_fresh_entry_is_not_refreshed(self):
+        post = slow_response(delay=0)
+        client = ml_client(post)
+        key = client._get_cache_key(MATCH_REQUEST)
+        await client.cache.aset(key, {'data': ML_RESULT, 'delta': 1.0,
+                               'expires': time.time() + 3600})
+
+        with patch('advisor.services.ml_client.random.random', return_value=0.9):
+            await client.analyze_match(MATCH_REQUEST)
+        post.assert_not_awaited()
+
+    async def test_failed_early_refresh_serves_cached_entry(self):
+        client = ml_client(AsyncMock(side_effect=httpx.ConnectError('refused')))
+        key = client._get_cache_key(MATCH_REQUEST)
+        await client.cache.aset(key, {'data': ML_RESULT, 'delta': 1.0,
+                               'expires': time.time() + 0.5})
+
+        with patch('advisor.services.ml_client.random.random', return_value=0.9):
+            result = await client.analyze_match(MATCH_REQUEST)
+        self.assertEqual(result.final_score, ML_RESULT['final_score'])
+
+    async def test_reformatted_cv_is_a_cache_hit(self):
+        post = slow_response(delay=0)
+        client = ml_client(post)
+        await client.analyze_match(MATCH_REQUEST)
+        reformatted = MATCH_REQUEST.model_copy(update={
+            'cv_text': '\r\n  ' + MATCH_REQUEST.cv_text + '\r\n\r\n'})
+        await client.analyze_match(reformatted)
+        self.assertEqual(post.await_count, 1)
+
+
+    async def test_alpha_and_ai_flag_reuse_the_cached_analysis(self):
+        post = slow_response(delay=0)
+        client = ml_client(post)
+        default = await client.analyze_match(MATCH_REQUEST)
+        semantic_only = await client.analyze_match(
+            MATCH_REQUEST.model_copy(update={'alpha': 1.0, 'ai_deep_analysis': True}))
+        keywords_only = await client.analyze_match(
+            MATCH_REQUEST.model_copy(update={'alpha': 0.0}))
+
+        self.assertEqual(post.await_count, 1)
+        self.assertNotIn('ai_deep_analysis', post.await_args.kwargs['json'])
+        self.assertEqual(default.final_score, ML_RESULT['final_score'])
+        self.assertEqual(semantic_only.final_score, round(0.74 * 0.95 + 0.4 * 0.05, 4))
+        self.assertEqual(keywords_only.final_score, round(0.62 * 0.95 + 0.4 * 0.05, 4))
+        self.assertEqual(semantic_only.details, default.details)
+
+    async def test_concurrent_alphas_share_one_ml_call(self):
+        post = slow_response()
+        client = ml_client(post)
+        results = await asyncio.gather(*[
+            client.analyze_match(MATCH_REQUEST.model_copy(update={'alpha': a}))
+            for a in (0.2, 0.5, 0.7)])
+
+        self.assertEqual(post.await_count, 1)
+        self.assertEqual([r.final_score for r in results],
+                         [final_score(0.74, 0.62, 0.4, a) for a in (0.2, 0.5, 0.7)])
+
+
+    async def test_open_circuit_serves_expired_entry(self):
+        post = AsyncMock(side_effect=httpx.ConnectError('refused'))
+        client = ml_client(post)
+        for _ in range(2):  # opens the circuit
+            with self.assertRaises(httpx.ConnectError):
+                await client.analyze_match(MATCH_REQUEST)
+        key = client._get_cache_key(MATCH_REQUEST)
+        await client.cache.aset(key, {'data': ML_RESULT, 'delta': 1.0,
+                                      'expires': time.time() - 60})
+
+        result = await client.analyze_match(MATCH_REQUEST)
+        self.assertEqual(result.final_score, ML_RESULT['final_score'])
+        self.assertEqual(post.await_count, 2)  # failed fast
+        self.assertEqual(client.breaker.stats()['short_circuited'], 1)
+
+        other = MATCH_REQUEST.model_copy(update={'cv_text': 'Another CV. ' * 10})
+        with self.assertRaises(CircuitOpenError):
+            await client.analyze_match(other)
+
+    async def test_rejected_requests_do_not_open_the_circuit(self):
+        # 422: invalid input; 500: the ML service failed on this one request
+        for status_code in (422, 500):
+            async def rejected(url, **kwargs):
+                return httpx.Response(status_code, json={}, request=httpx.Request('POST', url))
+
+            client = ml_client(AsyncMock(side_effect=rejected))
+            for _ in range(3):
+                with self.assertRaises(ValueError):
+                    await client.analyze_match(MATCH_REQUEST)
+            self.assertEqual(client.breaker.state, CircuitBreaker.CLOSED)
+            self.assertFalse(client.replicas.replicas[0].ejected)
+
+    def test_outage_errors(self):
+        request = httpx.Request('POST', 'http://ml/match')
+        for status_code, outage in [(500, False), (502, True), (503, True), (504, True), (422, False)]:
+            error = httpx.HTTPStatusError('', request=request,
+                                          response=httpx.Response(status_code, request=request))
+            self.assertEqual(is_outage(error), outage, status_code)
+        self.assertTrue(is_outage(httpx.ConnectError('refused', request=request)))
+
+
+class ReplicaPoolTests(SimpleTestCase):
+    """Least outstanding requests, job affinity and ejection."""
+
+    URLS = ['http://ml-a', 'http://ml-b', 'http://ml-c']
+
+    def replica_pool(self, handler, **kwargs) -> ReplicaPool:
+        """ReplicaPool over URLS, answered by `handler` (an httpx mock)."""
+        http = MLHttpPool(transport=httpx.MockTransport(handler))
+        return ReplicaPool(self.URLS, http=http, **kwargs)
+
+    @staticmethod
+    async def answer(request):
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={'host': request.url.host})
+
+    async def test_least_outstanding_requests(self):
+        pool = self.replica_pool(self.answer)
+        pool.replicas[0].outstanding, pool.replicas[1].outstanding = 3, 1
+        self.assertEqual(pool.pick().url, 'http://ml-c')
+
+        pool.replicas[0].outstanding = pool.replicas[1].outstanding = 0
+        responses = await asyncio.gather(*[pool.post('/match', json={}) for _ in range(6)])
+        hosts = [r.json()['host'] for r in responses]
+        self.assertEqual(sorted(hosts.count(h) for h in set(hosts)), [2, 2, 2])
+        self.assertTrue(all(r.outstanding == 0 for r in pool.replicas))
+
+    async def test_same_job_prefers_the_same_replica(self):
+        pool = self.replica_pool(self.answer, affinity_slack=1)
+        first = (await pool.post('/match', affinity_key='job', json={})).json()['host']
+        for _ in range(3):
+            response = await pool.post('/match', affinity_key='job', json={})
+            self.assertEqual(response.json()['host'], first)
+        self.assertEqual(pool.stats()['affinity_routed'], 3)
+
+        # ...unless it is busier than the others by more than the slack
+        preferred = next(r for r in pool.replicas if r.url == f'http://{first}')
+        preferred.outstanding = 2
+        self.assertNotEqual(pool.pick('job'), preferred)
+
+    async def test_hedged_attempt_avoids_the_tried_replica(self):
+        pool = self.replica_pool(self.answer)
+        tried = set()
+        await pool.post('/match', tried=tried, json={})
+        await pool.post('/match', tried=tried, json={})
+        self.assertEqual(len(tried), 2)
+
+    async def test_failing_replica_is_ejected(self):
+        def handler(request):
+            if request.url.host == 'ml-a':
+                raise httpx.ConnectError('refused', request=request)
+            return httpx.Response(200, json={'host': request.url.host})
+
+        pool = self.replica_pool(handler, eject_after=2)
+        pool.replicas[1].outstanding = pool.replicas[2].outstanding = 5  # busy
+        for _ in range(2):
+            with self.assertRaises(httpx.ConnectError):
+                await pool.post('/match', json={})
+        self.assertTrue(pool.replicas[0].ejected)
+        self.assertEqual((await pool.post('/match', json={})).status_code, 200)
+        self.assertEqual(pool.stats()['replicas'][0]['ejections'], 1)
+
+    async def test_health_checks_eject_and_reinstate(self):
+        ready = {'ml-a': True, 'ml-b': False, 'ml-c': True}
+
+        def handler(request):
+            self.assertEqual(request.url.path, '/health/ready')
+            return httpx.Response(200 if ready[request.url.host] else 503)
+
+        pool = self.replica_pool(handler)
+        await pool.check_health()
+        self.assertEqual([r.ejected for r in pool.replicas], [False, True, False])
+        self.assertTrue(all(pool.pick().url != 'http://ml-b' for _ in range(20)))
+
+        ready['ml-b'] = True
+        await pool.check_health()
+        self.assertFalse(pool.replicas[1].ejected)
+        self.assertEqual(pool.http.stats()['requests'], 0)  # probes are not ML calls
+
+    async def test_all_ejected_still_routes(self):
+        pool = self.replica_pool(self.answer)
+        for replica in pool.replicas:
+            replica.eject(30)
+        self.assertEqual((await pool.post('/match', json={})).status_code, 200)
+        self.assertEqual(pool.stats()['all_ejected_routed'], 1)
+
+    async def test_health_checks_run_from_start_to_aclose(self):
+        pool = self.replica_pool(lambda request: httpx.Response(503),
+                                       health_interval=0.01)
+        await pool.start()
+        await asyncio.sleep(0.05)
+        await pool.aclose()
+        self.assertTrue(all(r.ejected for r in pool.replicas))
+        self.assertFalse(pool.stats()['health_checks'])
+
+
+class HedgerTests(SimpleTestCase):
+
+    def hedger(self, latency: float = 0.01, **kwargs) -> Hedger:
+        hedger = Hedger(min_samples=5, **kwargs)
+        for _ in range(5):
+            hedger.record(latency)
+        return hedger
+
+    async def test_slow_attempt_is_hedged_and_cancelled(self):
+        hedger, attempts = self.hedger(max_ratio=1.0), []
+
+        async def call():
+            attempts.append(asyncio.current_task())
+            await asyncio.sleep(5 if len(attempts) == 1 else 0)
+            return len(attempts)
+
+        start = time.perf_counter()
+        self.assertEqual(await hedger.run(call), 2)
+        self.assertLess(time.perf_counter() - start, 1)
+        await asyncio.sleep(0)
+        self.assertTrue(attempts[0].cancelled())
+        stats = hedger.stats()
+        self.assertEqual((stats['hedged'], stats['hedge_wins']), (1, 1))
+        # The cancelled attempt is recorded with (at least) the 50 ms hedge
+        # delay, which is now the p95 of the 7 samples
+        self.assertEqual(len(hedger._latencies), 7)
+        self.assertGreaterEqual(stats['delay_ms'], 50.0)
+        self.assertGreaterEqual(stats['latency_p95_ms'], 50.0)
+
+    async def test_fast_attempts_and_warmup_are_not_hedged(self):
+        call = AsyncMock(return_value='ok')
+        cold = Hedger(min_samples=5)
+        self.assertIsNone(cold.delay())
+        self.assertEqual(await cold.run(call), 'ok')
+        warm = self.hedger()
+        self.assertEqual(await warm.run(call), 'ok')
+        self.assertEqual((cold.hedged, warm.hedged, call.await_count), (0, 0, 2))
+
+    async def test_hedge_budget(self):
+        hedger = self.hedger(max_ratio=0.0)
+
+        async def slow():
+            await asyncio.sleep(0.1)
+            return 'ok'
+
+        self.assertEqual(await hedger.run(slow), 'ok')
+        self.assertEqual((hedger.hedged, hedger.over_budget), (0, 1))
+
+    async def test_error_is_raised_when_every_attempt_fails(self):
+        hedger = self.hedger()
+        with self.assertRaises(httpx.ConnectError):
+            await hedger.run(AsyncMock(side_effect=httpx.ConnectError('refused')))
+        self.assertEqual(len(hedger._latencies), 6)  # failed attempts are recorded
+
+
+class CircuitBreakerTests(SimpleTestCase):
+
+    async def test_opens_fails_fast_and_recovers(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+        failing = AsyncMock(side_effect=httpx.ConnectError('refused'))
+        for _ in range(2):
+            with self.assertRaises(httpx.ConnectError):
+                await breaker.call(failing)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError):
+            await breaker.call(failing)
+        self.assertEqual(failing.await_count, 2)
+
+        await asyncio.sleep(0.06)
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        with self.assertRaises(httpx.ConnectError):  # failed trial: open again
+            await breaker.call(failing)
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        await asyncio.sleep(0.06)
+        self.assertEqual(await breaker.call(AsyncMock(return_value='ok')), 'ok')
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(breaker.stats()['opened'], 2)
+
+    async def test_one_trial_call_while_half_open(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        with self.assertRaises(httpx.ConnectError):
+            await breaker.call(AsyncMock(side_effect=httpx.ConnectError('refused')))
+
+        async def trial():
+            await asyncio.sleep(0.02)
+            return 'ok'
+
+        results = await asyncio.gather(breaker.call(trial), breaker.call(trial),
+                                       return_exceptions=True)
+        self.assertEqual(results[0], 'ok')
+        self.assertIsInstance(results[1], CircuitOpenError)
+
+
+class FinalScoreTests(SimpleTestCase):
+
+    def test_clamped_and_rounded(self):
+        self.assertEqual(final_score(1.0, 1.0, 1.0, 0.3), 1.0)
+        self.assertEqual(final_score(0.0, 0.0, 0.0, 0.3), 0.0)
+        self.assertEqual(final_score(1 / 3, 0.5, 0.0, 0.5), round((1 / 3 + 0.5) / 2 * 0.95, 4))
+
+
+class CacheKeyTests(SimpleTestCase):
+    """Cache keys on the canonical content of the job and the CV."""
+
+    CV = 'Experience\n- Built REST APIs in Python.\n- Tuned PostgreSQL queries.\n'
+
+    def test_formatting_variants_share_a_key(self):
+        variants = [
+            self.CV.replace('\n', '\r\n'),
+            self.CV.replace('- ', '• '),
+            self.CV.replace('- ', '1.\t'),
+            '  Experience  \n\n\n-   Built REST APIs in Python.\n - Tuned PostgreSQL queries.',
+        ]
+        for variant in variants:
+            self.assertEqual(canonical_text(variant), canonical_text(self.CV))
+            self.assertEqual(content_hash(variant), content_hash(self.CV))
+
+    def test_parser_relevant_differences_change_the_key(self):
+        for other in [self.CV.replace('Python', 'Go'),
+                      self.CV.replace('- Tuned', 'Tuned'),       # no longer a bullet
+                      self.CV.replace('\n- Tuned', ' Tuned'),    # lines joined
+                      self.CV.replace('REST APIs', 'REST  APIs')]:
+            self.assertNotEqual(content_hash(other), content_hash(self.CV))
+
+    def test_job_and_cv_are_hashed_separately(self):
+        key = MLServiceClient.__new__(MLServiceClient)._get_cache_key(MATCH_REQUEST)
+        self.assertIn(content_hash(MATCH_REQUEST.job_description), key)
+        self.assertIn(content_hash(MATCH_REQUEST.cv_text), key)
+
+    def test_replay_reports_both_hit_rates(self):
+        path = Path(tempfile.mkdtemp()) / 'replay.jsonl'
+        requests = [MATCH_REQUEST.model_dump(),
+                    dict(MATCH_REQUEST.model_dump(),
+                         cv_text='- ' + MATCH_REQUEST.cv_text + '\r\n'),
+                    dict(MATCH_REQUEST.model_dump(),
+                         cv_text='* ' + MATCH_REQUEST.cv_text)]
+        path.write_text('\n'.join(json.dumps(r) for r in requests))
+        out = StringIO()
+        call_command('replay_cache_keys', str(path), stdout=out)
+        self.assertIn('legacy: 3 distinct keys, 0/3 hits', out.getvalue())
+        self.assertIn('canonical: 2 distinct keys, 1/3 hits', out.getvalue())
+
+
+class TieredCacheTests(SimpleTestCase):
+    """Two-tier compressed result cache."""
+
+    def make_cache(self, location=None, **options) -> TieredCache:
+        location = location or str(Path(tempfile.mkdtemp()) / 'cache.sqlite3')
+        return TieredCache(location, {'OPTIONS': options})
+
+    def other_worker(self, cache: TieredCache, **options) -> TieredCache:
+        """A cache on the same file with its own process state."""
+        del _states[str(cache.path)]
+        return self.make_cache(str(cache.path), **options)
+
+    def test_tiers_and_compression(self):
+        cache = self.make_cache()
+        value = {'data': {'details': [f'Built REST APIs in Python ({i}).' for i in range(50)]}}
+        cache.set('key', value)
+
+        self.assertEqual(cache.get('key'), value)            # L1
+        other = self.other_worker(cache)
+        self.assertEqual(other.get('key'), value)            # L2, then L1
+        self.assertEqual(other.get('key'), value)
+        self.assertIsNone(other.get('missing'))
+
+        stats = other.stats()
+        self.assertEqual((stats['l1']['hits'], stats['l2']['hits'], stats['misses']), (1, 1, 1))
+        self.assertEqual(stats['l2']['hit_ratio'], 0.5)
+        self.assertEqual(stats['l2']['entries'], 1)
+        self.assertGreater(cache.stats()['compression_ratio'], 3)
+
+    def test_l1_byte_budget(self):
+        cache = self.make_cache(L1_MAX_BYTES=2500)
+        for key in 'abc':
+            cache.set(key, os.urandom(1000))  # incompressible
+        stats = cache.stats()
+        self.assertEqual(stats['l1']['entries'], 2)
+        self.assertLessEqual(stats['l1']['bytes'], 2500)
+        self.assertEqual(stats['l2']['entries'], 3)
+
+    def test_l2_byte_budget_evicts_least_recently_used(self):
+        cache = self.make_cache(L2_MAX_BYTES=3500)
+        for key in 'abc':
+            cache.set(key, os.urandom(1000))
+        other = self.other_worker(cache, L2_MAX_BYTES=3500)
+        other.get('a')  # 'b' becomes the least recently used row
+        other.set('d', os.urandom(1000))
+
+        fresh = self.other_worker(other, L2_MAX_BYTES=3500)
+        self.assertEqual([fresh.get(k) is not None for k in 'abcd'], [True, False, True, True])
+        self.assertLessEqual(fresh.stats()['l2']['bytes'], 3500)
+
+    def test_expiry_and_delete(self):
+        cache = self.make_cache()
+        cache.set('gone', 1, timeout=0)
+        cache.set('key', 2)
+        self.assertIsNone(cache.get('gone'))
+        self.assertTrue(cache.delete('key'))
+        self.assertIsNone(self.other_worker(cache).get('key'))
+
+    def test_counters_from_concurrent_threads(self):
+        cache = self.make_cache()
+        cache.set('key', 1)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(lambda _: cache.get('key'), range(4000)))
+        self.assertEqual(cache.stats()['l1']['hits'], 4000)
+
+    async def test_async_api(self):
+        cache = self.make_cache()
+        await cache.aset('key', {'a': 1})
+        self.assertEqual(await self.other_worker(cache).aget('key'), {'a': 1})
@@ -1,5 +1,6 @@
 from django.urls import path
-from .views import AnalyzeMatchView, GenerateCvView, AdviceCareerView
+from .views import (AnalyzeMatchView, GenerateCvView, AdviceCareerView,
+                    MLServiceStatsView)
 
 
 app_name = 'advisor'
@@ -8,4 +9,6 @@ urlpatterns = [
     path('analyze/match/', AnalyzeMatchView.as_view(), name='analyze_match'),
     path('generate/cv/', GenerateCvView.as_view(), name='generate_cv'),
     path('advice/career/', AdviceCareerView.as_view(), name='career_advice'),
+    path('ml-service/stats/', MLServiceStatsView.as_view(),
+         name='ml_service_stats'),
 ]
@@ -7,6 +7,7 @@ from pydantic import ValidationError
 
 from .data_models import MatchRequest
 from .services.ml_client import MLServiceClient
+from .services.http_pool import ml_http_pool
 from .services.response_curator import curate_response
 
 logger = logging.getLogger(__name__)
@@ -91,3 +92,17 @@ class AdviceCareerView(APIView):
 
     async def post(self, request, *args, **kwargs):
         return Response({"status": "Coming soon"}, status=200)
+
+
+class MLServiceStatsView(APIView):
+    """
+    Runtime counters of the backend -> ML service client (connection pool,
+    result cache, request coalescing, hedging, circuit breaker, replicas).
+    Staff only.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    async def get(self, request, *args, **kwargs):
+        return Response({"http_pool": ml_http_pool.stats(),
+                         **await MLServiceClient.stats()},
+                        status=status.HTTP_200_OK)
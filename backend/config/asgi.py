@@ -2,15 +2,63 @@
 ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Django itself ignores ASGI lifespan events; the wrapper below uses them to
+open and close process-wide resources (the pooled ML service client and
+the ML replica health checks).
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
 
+import logging
 import os
 
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.staticfiles.handlers import ASGIStaticFilesHandler  # noqa: E402
+
+from advisor.services.http_pool import ml_http_pool  # noqa: E402
+from advisor.services.load_balancer import ml_replicas  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+class LifespanApplication:
+    """Handles ASGI lifespan events, passes every other scope to `app`."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'lifespan':
+            await self.app(scope, receive, send)
+            return
+
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    await ml_http_pool.start()
+                    await ml_replicas.start()
+                except Exception as e:
+                    logger.exception("Startup failed")
+                    await send({'type': 'lifespan.startup.failed',
+                                'message': str(e)})
+                    return
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await ml_replicas.aclose()
+                await ml_http_pool.aclose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+# Static files are served by the ASGI app itself in development, as runserver does
+application = LifespanApplication(
+    ASGIStaticFilesHandler(django_application) if settings.DEBUG
+    else django_application)
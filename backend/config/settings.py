@@ -142,12 +142,50 @@ ALLOWED_HOSTS = os.environ.get('ALLOWED_HOSTS',
 
 # AI/ML
 ML_SERVICE_URL = os.environ.get('ML_SERVICE_URL', 'http://ml_service:8001')
+# Comma-separated ML service replicas, balanced by the backend
+# (advisor.services.load_balancer); defaults to the single ML_SERVICE_URL
+ML_SERVICE_URLS = [url.strip() for url in os.environ.get(
+    'ML_SERVICE_URLS', ML_SERVICE_URL).split(',') if url.strip()]
 AZURE_OPENAI_API_KEY = os.environ.get('AZURE_OPENAI_API_KEY', '')
 ML_DEFAULT_ALPHA = float(os.environ.get(
     'DEFAULT_ALPHA', '0.7'
     ))  # Semantic (alpha) vs Keywords (1 - alpha) weight
 ML_SERVICE_TIMEOUT = float(os.environ.get('ML_SERVICE_TIMEOUT', '20.0'))
 
+# Pooled keep-alive client for backend -> ML service calls
+# (advisor.services.http_pool, opened/closed by the ASGI lifespan)
+ML_SERVICE_MAX_CONNECTIONS = int(os.environ.get('ML_SERVICE_MAX_CONNECTIONS', '100'))
+ML_SERVICE_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get(
+    'ML_SERVICE_MAX_KEEPALIVE_CONNECTIONS', '20'))
+ML_SERVICE_KEEPALIVE_EXPIRY = float(os.environ.get('ML_SERVICE_KEEPALIVE_EXPIRY', '30.0'))
+# Seconds to wait for a free connection when all of them are busy
+ML_SERVICE_POOL_TIMEOUT = float(os.environ.get('ML_SERVICE_POOL_TIMEOUT', '5.0'))
+# Needs the 'h2' package (pip install httpx[http2]); HTTP/1.1 otherwise
+ML_SERVICE_HTTP2 = os.environ.get('ML_SERVICE_HTTP2', 'false').lower() == 'true'
+# Probabilistic early refresh of cached analyses (XFetch): higher values refresh
+# earlier before the TTL runs out, 0 disables it
+ML_CACHE_EARLY_REFRESH_BETA = float(os.environ.get('ML_CACHE_EARLY_REFRESH_BETA', '1.0'))
+# Seconds an expired analysis is kept to be served while the ML service is down
+ML_CACHE_STALE_TTL = int(os.environ.get('ML_CACHE_STALE_TTL', str(24 * 60 * 60)))
+# Hedged requests: a second attempt once the first is slower than this
+# percentile of recent ML call latencies (0 disables), never sooner than
+# the min delay, for at most MAX_RATIO of the calls
+ML_HEDGE_PERCENTILE = float(os.environ.get('ML_HEDGE_PERCENTILE', '95'))
+ML_HEDGE_MIN_DELAY = float(os.environ.get('ML_HEDGE_MIN_DELAY', '0.05'))
+ML_HEDGE_MAX_RATIO = float(os.environ.get('ML_HEDGE_MAX_RATIO', '0.1'))
+# Circuit breaker: opens after this many consecutive connection errors / 502-504,
+# lets a trial call through after the reset timeout (seconds)
+ML_CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get('ML_CIRCUIT_FAILURE_THRESHOLD', '5'))
+ML_CIRCUIT_RESET_TIMEOUT = float(os.environ.get('ML_CIRCUIT_RESET_TIMEOUT', '30.0'))
+# Replica routing: the replica that last served a job is preferred while it has
+# at most AFFINITY_SLACK more outstanding requests than the least busy one.
+# A replica is ejected for EJECT_SECONDS after EJECT_AFTER consecutive
+# failures or a failed health check (every HEALTH_INTERVAL seconds)
+ML_REPLICA_AFFINITY_SLACK = int(os.environ.get('ML_REPLICA_AFFINITY_SLACK', '2'))
+ML_REPLICA_EJECT_AFTER = int(os.environ.get('ML_REPLICA_EJECT_AFTER', '3'))
+ML_REPLICA_EJECT_SECONDS = float(os.environ.get('ML_REPLICA_EJECT_SECONDS', '30.0'))
+ML_REPLICA_HEALTH_INTERVAL = float(os.environ.get('ML_REPLICA_HEALTH_INTERVAL', '5.0'))
+
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
@@ -230,8 +268,22 @@ CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         'LOCATION': 'unique-snowflake',
-    }
+    },
+    # ML service analyses: compressed, in-process LRU in front of a SQLite
+    # file shared by all worker processes (advisor.services.tiered_cache)
+    'ml_results': {
+        'BACKEND': 'advisor.services.tiered_cache.TieredCache',
+        'LOCATION': os.environ.get('ML_RESULT_CACHE_PATH',
+                                   str(BASE_DIR / 'cache' / 'ml_results.sqlite3')),
+        'TIMEOUT': 60 * 60,
+        'OPTIONS': {
+            'L1_MAX_BYTES': int(os.environ.get('ML_RESULT_CACHE_L1_MB', '16')) * 1024 * 1024,
+            'L2_MAX_BYTES': int(os.environ.get('ML_RESULT_CACHE_L2_MB', '512')) * 1024 * 1024,
+            'L1_TIMEOUT': 60,
+        },
+    },
 }
+ML_RESULT_CACHE = 'ml_results'
 
 # Security Settings
 if not DEBUG:
@@ -1,28 +1,86 @@
 import asyncio
+import json
 import os
 from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
-from typing import Dict, Optional
+from typing import AsyncIterator, Dict, Iterator, Optional, Union
 
 from fastapi import FastAPI, HTTPException, Depends
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel
 
+from src.config import EXECUTION_MODE, PROCESS_POOL_WORKERS, SHUTDOWN_LOADER_TIMEOUT
 from src.orchestrator import HybridMatchEngine
-from src.data_models import MatchRequest, MatchResponse
+from src.worker_pool import ProcessPoolEngine
+from src.data_models import (MatchRequest, MatchResponse, RankRequest, RankResponse,
+                             JobsMatchRequest, JobsMatchResponse, JobRegisterRequest,
+                             JobInfo, CandidateIndexRequest, CandidateSearchRequest,
+                             CandidateSearchResponse)
+from src.job_registry import JobNotFoundError
+from src.candidate_index import CandidateIndex
+from src.startup import BackgroundLoader, load_warmup_corpus, warm_up
+from src.utils import ComponentStatus
+
+
+def _load_models(components: ComponentStatus) -> None:
+    """
+    Startup work, run by the background loader: engine, candidate index and
+    the warmup corpus through the executor that serves the API. Endpoints
+    answer 503 until the engine is in ml_models; /health/ready stays 503
+    until the warmup finished too. A failed warmup only fails the 'warmup'
+    component: the engine serves cold and liveness stays green.
+    """
+    if EXECUTION_MODE == "process":
+        with components.measure("engine"):
+            engine = ProcessPoolEngine()
+    else:
+        engine = HybridMatchEngine(components)
+    ml_models['engine'] = engine
+
+    with components.measure("candidate_index"):
+        ml_models['candidates'] = CandidateIndex(engine)
+
+    # The engine already serves: a failed warmup is reported, not fatal
+    try:
+        with components.measure("warmup"):
+            if isinstance(engine, ProcessPoolEngine):
+                # Every worker already ran the corpus before it answered
+                engine.check_warmup()
+                print(f"🔥 Workers warmed up ({engine.workers} processes).")
+            else:
+                requests = warm_up(engine, load_warmup_corpus(), executor)
+                print(f"🔥 Warmup done ({requests} requests).")
+    except Exception as e:
+        print(f"⚠️  Warmup failed, serving cold: {e}")
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
-    """Handles startup (loading models) and shutdown (clean up)"""
-    ml_models['engine'] = HybridMatchEngine()
+    """Handles startup (loading models in the background) and shutdown (clean up)"""
+    global executor, loader
+    if EXECUTION_MODE == "process":
+        # Threads only wait on worker processes; keep every worker busy
+        workers = PROCESS_POOL_WORKERS * 2
+    else:
+        workers = max(os.cpu_count() - 1, 1)
 
-    global executor
-    workers = max(os.cpu_count() - 1, 1)
     executor = ThreadPoolExecutor(max_workers=workers)
+    loader = BackgroundLoader()
+    loader.start(_load_models)
 
     yield
-    ml_models.clear()
+    # Whatever is still loading has to finish before it can be released,
+    # but a slow model download must not block the shutdown
+    loader.wait(SHUTDOWN_LOADER_TIMEOUT)
+    if loader.status == "loading":
+        print(f"⚠️  Startup still running after {SHUTDOWN_LOADER_TIMEOUT}s, shutting down anyway.")
     if executor:
-        executor.shutdown(wait=True)
+        executor.shutdown(wait=loader.status != "loading", cancel_futures=True)
+    if 'candidates' in ml_models:
+        ml_models['candidates'].close()
+    if 'engine' in ml_models:
+        ml_models['engine'].close()
+    ml_models.clear()
 
 # --- DEPENDENCY INJECTION ---
 def get_engine():
@@ -32,12 +90,30 @@ def get_engine():
     return ml_models["engine"]
 
 
+def get_candidate_index():
+    """Helper for FastAPI to inject the candidate search index."""
+    if "candidates" not in ml_models:
+        raise HTTPException(status_code=503, detail="AI Engine is not ready.")
+    return ml_models["candidates"]
+
+
 executor: Optional[ThreadPoolExecutor] = None
-ml_models: Dict[str, HybridMatchEngine] = {}
+loader = BackgroundLoader()
+ml_models: Dict[str, Union[HybridMatchEngine, ProcessPoolEngine, CandidateIndex]] = {}
 app = FastAPI(title="RecruitMate ML Service",
               lifespan=lifespan)
 
 
+def _json_response(result: BaseModel) -> Response:
+    """
+    Serializes an engine result once, with pydantic-core's JSON encoder.
+    The engine already built (and validated) the model: returning a Response
+    skips FastAPI's response_model re-validation and encoding pass, while
+    response_model still documents the schema in OpenAPI.
+    """
+    return Response(content=result.model_dump_json(), media_type="application/json")
+
+
 # --- ENDPOINTS ---
 
 @app.post("/match", response_model=MatchResponse)
@@ -48,6 +124,7 @@ async def match_cv_to_offer(
     """
     Compares a job offer against a CV using the hybrid (SBERT + TF-IDF) engine.
     The 'alpha' parameter controls the weight given to the semantic score.
+    The offer is either raw text or the 'job_id' of a registered job.
     """
     try:
         loop = asyncio.get_running_loop()
@@ -56,12 +133,195 @@ async def match_cv_to_offer(
             engine.calculate_match,
             request
         )
-        return result
+        return _json_response(result)
+    except JobNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Job '{request.job_id}' not found or expired.")
     except Exception as e:
         # Log error in production environment
         raise HTTPException(status_code=500, detail=f"Internal processing error: {str(e)}")
 
+async def _ndjson_events(events: Iterator[Dict], job_id: Optional[str] = None
+                         ) -> AsyncIterator[str]:
+    """
+    Pulls the engine's event generator stage by stage in the executor and
+    writes one JSON object per line. Failures after the response has started
+    are reported as a final 'error' event, worded like the /match errors.
+    """
+    loop = asyncio.get_running_loop()
+    done = object()
+    try:
+        while True:
+            event = await loop.run_in_executor(executor, next, events, done)
+            if event is done:
+                break
+            yield json.dumps(event) + "\n"
+    except JobNotFoundError:
+        yield json.dumps({"event": "error", "detail": f"Job '{job_id}' not found or expired."}) + "\n"
+    except Exception as e:
+        yield json.dumps({"event": "error", "detail": f"Internal processing error: {str(e)}"}) + "\n"
+
+@app.post("/match/stream")
+async def match_cv_to_offer_stream(
+    request: MatchRequest,
+    engine: HybridMatchEngine = Depends(get_engine)
+):
+    """
+    Streaming variant of /match: newline-delimited JSON events, one per stage
+    as soon as it completes (sections, keywords, action_verbs, semantic,
+    final). The 'final' event carries the full /match response.
+    """
+    return StreamingResponse(_ndjson_events(engine.iter_match_events(request), request.job_id),
+                             media_type="application/x-ndjson")
+
+@app.post("/match/rank", response_model=RankResponse)
+async def rank_cvs_for_offer(
+    request: RankRequest,
+    engine: HybridMatchEngine = Depends(get_engine)
+):
+    """
+    Ranks many CVs against one job offer (best match first).
+    The job offer is processed once; every CV gets the same scores as /match.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            executor,
+            engine.rank_cvs,
+            request
+        )
+        return _json_response(result)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal processing error: {str(e)}")
+
+@app.post("/match/jobs", response_model=JobsMatchResponse)
+async def match_cv_to_offers(
+    request: JobsMatchRequest,
+    engine: HybridMatchEngine = Depends(get_engine)
+):
+    """
+    Compares one CV against many job offers (one result per offer, in order).
+    The CV is processed once for all offers.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            executor,
+            engine.match_jobs,
+            request
+        )
+        return _json_response(result)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal processing error: {str(e)}")
+
+@app.post("/jobs", response_model=JobInfo)
+async def register_job(
+    request: JobRegisterRequest,
+    engine: HybridMatchEngine = Depends(get_engine)
+):
+    """
+    Registers a job offer: it is parsed, chunked, encoded and NER-tagged once
+    and can then be matched by its 'job_id'. Registering the same text again
+    refreshes it and returns the same id.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, engine.register_job, request)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal processing error: {str(e)}")
+
+@app.get("/jobs/{job_id}", response_model=JobInfo)
+async def get_job(job_id: str, engine: HybridMatchEngine = Depends(get_engine)):
+    """Metadata of a registered job offer."""
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(executor, engine.get_job, job_id)
+    except JobNotFoundError:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found or expired.")
+
+@app.delete("/jobs/{job_id}", status_code=204)
+async def delete_job(job_id: str, engine: HybridMatchEngine = Depends(get_engine)):
+    """Removes a job offer from the registry."""
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(executor, engine.delete_job, job_id):
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found.")
+
+@app.post("/candidates")
+async def index_candidate(
+    request: CandidateIndexRequest,
+    candidates: CandidateIndex = Depends(get_candidate_index)
+):
+    """Adds (or replaces) a CV in the candidate search index."""
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, candidates.add_cv, request)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal processing error: {str(e)}")
+
+@app.delete("/candidates/{cv_id}", status_code=204)
+async def remove_candidate(cv_id: str,
+                           candidates: CandidateIndex = Depends(get_candidate_index)):
+    """Removes a CV from the candidate search index."""
+    loop = asyncio.get_running_loop()
+    if not await loop.run_in_executor(executor, candidates.remove_cv, cv_id):
+        raise HTTPException(status_code=404, detail=f"Candidate '{cv_id}' not found.")
+
+@app.post("/candidates/search", response_model=CandidateSearchResponse)
+async def search_candidates(
+    request: CandidateSearchRequest,
+    candidates: CandidateIndex = Depends(get_candidate_index)
+):
+    """
+    Finds the CVs whose chunks best match one requirement (approximate
+    nearest-neighbour search over all indexed CV chunks).
+    """
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, candidates.search, request)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Internal processing error: {str(e)}")
+
 @app.get("/health")
 async def health_check():
     """Basic health check to ensure the service is running and models are loaded."""
-    return {"status": "ok", "models_loaded": "engine" in ml_models}
+    health = {"status": "ok", "models_loaded": "engine" in ml_models, "ready": loader.ready}
+    engine = ml_models.get("engine")
+    if isinstance(engine, ProcessPoolEngine):
+        health["workers"] = engine.health()
+    return health
+
+
+@app.get("/health/live")
+async def liveness():
+    """
+    Liveness probe: the process is up and serving. Only a failed startup
+    (which a restart may fix) makes it fail.
+    """
+    if loader.status == "failed":
+        return JSONResponse(status_code=503, content={"status": "failed", "error": loader.error})
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness():
+    """
+    Readiness probe: 200 once every model is loaded and the warmup corpus
+    went through the pipeline, 503 before. Reports the status and load time
+    of every component either way.
+    """
+    report = loader.report()
+    engine = ml_models.get("engine")
+    if isinstance(engine, ProcessPoolEngine):
+        report["workers"] = engine.health()
+    return JSONResponse(status_code=200 if loader.ready else 503, content=report)
+
+
+@app.get("/stats")
+async def engine_stats(engine: HybridMatchEngine = Depends(get_engine)):
+    """Runtime counters (batching, caches) for tuning and monitoring."""
+    # In process mode this waits on a worker (and reads SQLite): off the loop
+    loop = asyncio.get_running_loop()
+    stats = await loop.run_in_executor(executor, engine.get_stats)
+    if "candidates" in ml_models:
+        stats["candidate_index"] = ml_models["candidates"].stats()
+    return stats
+
@@ -0,0 +1,86 @@
+"""
+Recall vs latency of the IVF candidate index against exact (brute-force) search.
+
+The corpus is synthetic: clustered, L2-normalized vectors with the dimension
+of all-MiniLM-L6-v2, grouped into "CVs" of CHUNKS_PER_CV chunks. Queries are
+perturbed corpus vectors, so every query has real close neighbours.
+
+Run from the ml_service directory:
+    python scripts/benchmark_ann.py
+"""
+import sys
+import time
+import statistics
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.ann_index import IVFIndex  # noqa: E402
+
+DIM = 384
+CORPUS_SIZES = [50_000, 300_000]
+CHUNKS_PER_CV = 20
+N_LISTS = 256
+N_PROBES = [1, 4, 8, 16, 32, 64]
+NUM_QUERIES = 200
+K = 10
+
+
+def make_corpus(n: int, rng: np.random.Generator) -> np.ndarray:
+    centers = rng.normal(size=(n // 500, DIM)).astype(np.float32)
+    data = centers[rng.integers(0, len(centers), n)]
+    data += 0.7 * rng.normal(size=(n, DIM)).astype(np.float32)
+    return data / np.linalg.norm(data, axis=1, keepdims=True)
+
+
+def timed_search(index: IVFIndex, queries: np.ndarray, **kwargs):
+    latencies, results = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(index.search(query, k=K, **kwargs)[0])
+        latencies.append((time.perf_counter() - start) * 1000)
+    return results, latencies
+
+
+def keys(hits):
+    return {(doc_id, payload["chunk"]) for doc_id, _, payload in hits}
+
+
+rng = np.random.default_rng(0)
+rows = []
+for size in CORPUS_SIZES:
+    data = make_corpus(size, rng)
+    index = IVFIndex(DIM, n_lists=N_LISTS)
+
+    start = time.perf_counter()
+    for cv, offset in enumerate(range(0, size, CHUNKS_PER_CV)):
+        index.add(f"cv{cv}", data[offset:offset + CHUNKS_PER_CV],
+                  [{"chunk": i} for i in range(CHUNKS_PER_CV)])
+    build_s = time.perf_counter() - start
+
+    picks = rng.choice(size, NUM_QUERIES, replace=False)
+    queries = data[picks] + 0.2 * rng.normal(size=(NUM_QUERIES, DIM)).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+
+    exact, exact_ms = timed_search(index, queries, exact=True)
+    rows.append((size, "exact", 1.0, statistics.median(exact_ms), build_s))
+
+    for n_probe in N_PROBES:
+        approx, approx_ms = timed_search(index, queries, n_probe=n_probe)
+        recall = statistics.mean(
+            len(keys(a) & keys(e)) / K for a, e in zip(approx, exact))
+        rows.append((size, f"ivf p={n_probe}", recall, statistics.median(approx_ms), build_s))
+    print(f"  {size} vectors done (build {build_s:.1f}s, {index.stats()['bytes'] / 2**20:.0f} MB)")
+
+print("\n" + "=" * 60)
+print(f"⚡ IVF recall@{K} vs latency ({N_LISTS} lists) ⚡")
+print(f"{'vectors':>8} {'method':<12} {'recall':>8} {'p50 (ms)':>10} {'speedup':>8}")
+exact_latency = {}
+for size, method, recall, latency, _ in rows:
+    if method == "exact":
+        exact_latency[size] = latency
+    print(f"{size:>8} {method:<12} {recall:>8.3f} {latency:>10.3f} "
+          f"{exact_latency[size] / latency:>7.1f}x")
+print("=" * 60)
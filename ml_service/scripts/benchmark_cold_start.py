@@ -0,0 +1,99 @@
+"""
+Cold start of the NER pipeline: built from the skill patterns (no snapshot)
+vs loaded from a snapshot (scripts/build_ner_snapshot.py).
+
+Every measurement runs in a fresh interpreter (imports included), at ESCO
+size: the skill patterns are padded with synthetic labels like
+benchmark_skill_matcher.py does when the full ESCO CSV is absent. The
+snapshot is written to a temporary directory, the service's one is untouched.
+
+Run from the ml_service directory:
+    python scripts/benchmark_cold_start.py
+"""
+import pickle
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmark_skill_matcher import full_size_patterns  # noqa: E402
+from src.config import SKILL_MATCHER_BACKEND  # noqa: E402
+
+NUM_RUNS = 3
+
+# Runs in a child process: argv = processed patterns, snapshot path, mode
+CHILD = """
+import sys, time
+start = time.perf_counter()
+from unittest.mock import patch
+import spacy
+from src.config import NER_SKILLS_DATA_PATH, SPACY_MODEL_NAME
+from src.document import add_newline_boundaries
+from src.ner_snapshot import build_snapshot, load_base_pipeline, load_snapshot, pipeline_name
+from src.processors.ner import NERProcessor
+imported = time.perf_counter()
+
+def base_pipeline():
+    if spacy.util.is_package(SPACY_MODEL_NAME):
+        return load_base_pipeline(SPACY_MODEL_NAME)
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer", name="parser")
+    add_newline_boundaries(nlp)
+    return nlp
+
+processed, path, mode = sys.argv[1:]
+with patch.dict(NER_SKILLS_DATA_PATH, processed=processed):
+    if mode == "build":
+        build_snapshot(base_pipeline(), path)
+    elif mode == "live":
+        NERProcessor(base_pipeline())
+    else:
+        import json
+        name = json.load(open(path + "/meta.json"))["spacy_model"]
+        load_snapshot(path, model_name=name)
+end = time.perf_counter()
+print(end - start, imported - start)
+"""
+
+
+def child(mode: str, processed: str, path: str):
+    """(total seconds, seconds spent importing spaCy and the service modules)"""
+    out = subprocess.run([sys.executable, "-c", CHILD, processed, path, mode],
+                         capture_output=True, text=True, check=True,
+                         cwd=Path(__file__).resolve().parent.parent)
+    total, imports = out.stdout.strip().splitlines()[-1].split()
+    return float(total), float(imports)
+
+
+patterns, uri_to_canonical, label_to_canonical, real_patterns = full_size_patterns()
+print(f"Patterns: {len(patterns)} ({real_patterns} from the raw CSVs), "
+      f"backend: {SKILL_MATCHER_BACKEND}")
+
+with tempfile.TemporaryDirectory() as tmp:
+    processed = str(Path(tmp) / "skills_en.pkl")
+    with open(processed, 'wb') as f:
+        pickle.dump({"patterns": patterns, "canonical": uri_to_canonical,
+                     "label_to_canonical": label_to_canonical}, f)
+    snapshot = str(Path(tmp) / "snapshot")
+
+    print("⏳ Building the snapshot...")
+    build_s = child("build", processed, snapshot)[0]
+    size_mb = sum(p.stat().st_size for p in Path(snapshot).rglob("*") if p.is_file()) / 2**20
+    live = [child("live", processed, snapshot) for _ in range(NUM_RUNS)]
+    loaded = [child("snapshot", processed, snapshot) for _ in range(NUM_RUNS)]
+
+print("\n" + "=" * 66)
+print("⚡ NER pipeline cold start (fresh process, median) ⚡")
+print(f"{'':<18} {'total (s)':>10} {'imports (s)':>12} {'pipeline + NER (s)':>19}")
+rows = {"without snapshot": live, "from snapshot": loaded}
+for name, runs in rows.items():
+    total = statistics.median(run[0] for run in runs)
+    imports = statistics.median(run[1] for run in runs)
+    print(f"{name:<18} {total:>10.2f} {imports:>12.2f} {total - imports:>19.2f}")
+before, after = (statistics.median(run[0] - run[1] for run in runs) for runs in rows.values())
+print(f"Pipeline + NER setup {before / after:.1f}x faster from the snapshot; "
+      f"build {build_s:.2f} s, {size_mb:.0f} MB on disk")
+print("=" * 66)
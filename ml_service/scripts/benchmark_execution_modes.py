@@ -0,0 +1,98 @@
+"""
+Compares the 'thread' and 'process' execution modes of the ML service.
+
+For every mode a fresh uvicorn server is started with ML_EXECUTION_MODE set,
+then /match is hammered at several concurrency levels.
+
+Run from the ml_service directory:
+    python scripts/benchmark_execution_modes.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVICE_DIR))
+
+from tests.test_data import JOB_OFFERS, CV_CANDIDATE  # noqa: E402
+
+PORT = 5011
+BASE_URL = f"http://127.0.0.1:{PORT}"
+MODES = ["thread", "process"]
+CONCURRENCY_LEVELS = [1, 4, 8, 16, 32]
+REQUESTS_PER_LEVEL = 64
+STARTUP_TIMEOUT_S = 900
+
+PAYLOAD = {
+    "job_description": JOB_OFFERS['perfect']['text'],
+    "cv_text": CV_CANDIDATE,
+}
+
+
+def start_server(mode: str) -> subprocess.Popen:
+    env = {**os.environ, "ML_EXECUTION_MODE": mode}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app",
+         "--host", "127.0.0.1", "--port", str(PORT)],
+        cwd=SERVICE_DIR, env=env,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT_S
+    while time.monotonic() < deadline:
+        try:
+            # Ready = models loaded and warmed up: no warmup in the timings
+            if httpx.get(f"{BASE_URL}/health/ready").status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(1)
+    server.terminate()
+    raise RuntimeError(f"Server in '{mode}' mode did not start in time.")
+
+
+def run_level(client: httpx.Client, concurrency: int) -> dict:
+    def one_request(_):
+        start = time.perf_counter()
+        response = client.post(f"{BASE_URL}/match", json=PAYLOAD, timeout=120)
+        response.raise_for_status()
+        return time.perf_counter() - start
+
+    start_total = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = sorted(pool.map(one_request, range(REQUESTS_PER_LEVEL)))
+    total = time.perf_counter() - start_total
+
+    return {
+        "throughput_rps": REQUESTS_PER_LEVEL / total,
+        "p50_s": statistics.median(latencies),
+        "p95_s": latencies[int(len(latencies) * 0.95) - 1],
+    }
+
+
+results = {}
+for mode in MODES:
+    print(f"\n⏳ Starting server in '{mode}' mode...")
+    server = start_server(mode)
+    try:
+        limits = httpx.Limits(max_connections=max(CONCURRENCY_LEVELS))
+        with httpx.Client(limits=limits) as client:
+            run_level(client, 1)  # warmup
+            for level in CONCURRENCY_LEVELS:
+                results[(mode, level)] = run_level(client, level)
+                print(f"  {mode:<8} c={level:<3} done")
+    finally:
+        server.terminate()
+        server.wait()
+
+print("\n" + "=" * 64)
+print("⚡ Execution mode benchmark (/match) ⚡")
+print(f"{'mode':<8} {'conc':>5} {'req/s':>10} {'p50 (s)':>10} {'p95 (s)':>10}")
+for (mode, level), r in results.items():
+    print(f"{mode:<8} {level:>5} {r['throughput_rps']:>10.2f} "
+          f"{r['p50_s']:>10.4f} {r['p95_s']:>10.4f}")
+print("=" * 64)
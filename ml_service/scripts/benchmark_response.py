@@ -0,0 +1,74 @@
+"""
+Compares how a large /match response leaves the API:
+  - response_model path: the handler returns the MatchResponse, FastAPI
+    validates it again against response_model and encodes it
+  - fast path:           the handler returns the bytes of model_dump_json()
+                         (main._json_response)
+
+The response is synthetic (a long job ad: one MatchDetail per job chunk), so
+only serialization is measured, not the engine.
+
+Run from the ml_service directory:
+    python scripts/benchmark_response.py
+"""
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import fastapi
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from main import _json_response  # noqa: E402
+from src.data_models import MatchDetail, MatchResponse  # noqa: E402
+
+DETAIL_COUNTS = [20, 200, 1000]
+NUM_REQUESTS = 200
+
+
+def make_response(details: int) -> MatchResponse:
+    return MatchResponse(
+        final_score=0.71, semantic_score=0.74, keyword_score=0.62, action_verb_score=0.4,
+        common_keywords=[f"skill {i}" for i in range(20)],
+        missing_keywords=[f"missing skill {i}" for i in range(10)],
+        section_scores={"experience": 0.8, "skills": 0.7, "education": 0.5},
+        details=[MatchDetail(job_requirement=f"Requirement {i}: design and operate REST APIs "
+                                             f"in Python with PostgreSQL and Kubernetes.",
+                             best_cv_match=f"Built REST services in Python backed by PostgreSQL ({i}).",
+                             cv_section="experience", score=0.8123, raw_semantic_score=0.6248)
+                 for i in range(details)],
+    )
+
+
+def app_for(response: MatchResponse) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/model", response_model=MatchResponse)
+    async def model_path():
+        return response
+
+    @app.get("/fast", response_model=MatchResponse)
+    async def fast_path():
+        return _json_response(response)
+
+    return TestClient(app)
+
+
+print(f"FastAPI {fastapi.__version__}")
+print(f"{'details':>8} {'response_model (ms)':>20} {'fast path (ms)':>15} {'speedup':>8}")
+for count in DETAIL_COUNTS:
+    client = app_for(make_response(count))
+    assert client.get("/model").json() == client.get("/fast").json()
+    medians = {}
+    for path in ("/model", "/fast"):
+        times = []
+        for _ in range(NUM_REQUESTS):
+            start = time.perf_counter()
+            client.get(path)
+            times.append((time.perf_counter() - start) * 1000)
+        medians[path] = statistics.median(times)
+    print(f"{count:>8} {medians['/model']:>20.2f} {medians['/fast']:>15.2f} "
+          f"{medians['/model'] / medians['/fast']:>7.1f}x")
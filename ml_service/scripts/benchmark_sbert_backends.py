@@ -0,0 +1,61 @@
+"""
+Parity and throughput of the SBERT CPU inference backends.
+
+Parity: every backend is compared with the fp32 reference on the job offers
+and CV of the test data (embedding agreement, job x CV score deltas and best
+match agreement). Throughput: texts encoded per second on the same corpus.
+
+Run from the ml_service directory:
+    python scripts/benchmark_sbert_backends.py
+"""
+import sys
+from pathlib import Path
+
+import torch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.inference_backends import (BACKENDS, load_sbert, parity_report,  # noqa: E402
+                                    measure_throughput)
+from tests.test_data import JOB_OFFERS, CV_CANDIDATE  # noqa: E402
+
+THROUGHPUT_TEXTS = 512
+
+
+def lines(text: str):
+    return [line.strip() for line in text.split("\n") if len(line.split()) >= 4]
+
+
+job_chunks = [chunk for offer in JOB_OFFERS.values() for chunk in lines(offer['text'])]
+cv_chunks = lines(CV_CANDIDATE)
+corpus = job_chunks + cv_chunks
+throughput_corpus = (corpus * (THROUGHPUT_TEXTS // len(corpus) + 1))[:THROUGHPUT_TEXTS]
+
+print(f"Reference corpus: {len(job_chunks)} job chunks x {len(cv_chunks)} CV chunks, "
+      f"torch threads: {torch.get_num_threads()}")
+
+reference = load_sbert("fp32")
+results = {}
+for backend_name in BACKENDS:
+    print(f"\n⏳ Loading '{backend_name}' backend...")
+    try:
+        backend = reference if backend_name == "fp32" else load_sbert(backend_name)
+    except RuntimeError as e:
+        print(f"  skipped: {e}")
+        continue
+    results[backend_name] = {
+        **parity_report(backend, reference, job_chunks, cv_chunks),
+        "texts_per_s": measure_throughput(backend, throughput_corpus),
+    }
+
+base = results["fp32"]["texts_per_s"]
+print("\n" + "=" * 86)
+print("⚡ SBERT inference backends (CPU) ⚡")
+print(f"{'backend':<8} {'texts/s':>9} {'speedup':>8} {'min cos':>9} "
+      f"{'max Δscore':>11} {'mean Δscore':>12} {'max Δbest':>10} {'best agree':>11}")
+for name, r in results.items():
+    print(f"{name:<8} {r['texts_per_s']:>9.1f} {r['texts_per_s'] / base:>7.2f}x "
+          f"{r['min_embedding_cosine']:>9.4f} {r['max_score_delta']:>11.4f} "
+          f"{r['mean_score_delta']:>12.5f} {r['max_best_match_score_delta']:>10.4f} "
+          f"{r['best_match_agreement']:>11.2%}")
+print("=" * 86)
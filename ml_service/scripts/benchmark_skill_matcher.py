@@ -0,0 +1,118 @@
+"""
+Compares the skill extraction backends of NERProcessor at full ESCO size:
+  - ruler:  EntityRuler pipeline component (runs on every parsed doc)
+  - phrase: PhraseMatcher called only on the docs whose skills are needed
+  - trie:   SkillIndex (Aho-Corasick automaton in flat arrays), same call sites
+
+Reports build time (traced by tracemalloc, so slower than untraced),
+memory held by the matcher, parse + extraction time on
+the test corpus and whether both backends extract the same skills.
+
+If the full ESCO CSV (data/raw/skills_en.csv) is missing, the pattern list is
+padded with synthetic labels up to ESCO_LABELS so the sizes stay realistic.
+
+Run from the ml_service directory:
+    python scripts/benchmark_skill_matcher.py
+"""
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from unittest.mock import patch
+
+import spacy
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import SPACY_MODEL_NAME  # noqa: E402
+from src.processors.ner import NERProcessor  # noqa: E402
+from tests.test_data import JOB_OFFERS, CV_CANDIDATE  # noqa: E402
+
+ESCO_LABELS = 100_000  # ESCO v1.1: ~13.9k skills with ~100k preferred/alt/hidden labels
+NUM_RUNS = 3
+
+
+def load_nlp():
+    try:
+        return spacy.load(SPACY_MODEL_NAME, disable=["ner"])
+    except OSError:
+        print(f"⚠️  '{SPACY_MODEL_NAME}' not installed, using a blank pipeline.")
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer", name="parser")
+        return nlp
+
+
+def full_size_patterns():
+    """Real patterns (raw CSVs) padded with synthetic labels to ESCO size."""
+    loader = NERProcessor.__new__(NERProcessor)
+    loader.nlp = spacy.blank("en")
+    loader.uri_to_canonical, loader.label_to_canonical = {}, {}
+    patterns = loader._get_mvp_patterns()
+    real = len(patterns)
+
+    rng = random.Random(0)
+    vocab = sorted({w.lower() for text in [CV_CANDIDATE] + [o['text'] for o in JOB_OFFERS.values()]
+                    for w in text.split() if w.isalpha()})
+    vocab += [f"skill{i}" for i in range(20_000)]
+    seen = {" ".join(t["LOWER"] for t in p["pattern"]) for p in patterns}
+    # Same share of tokenizer special cases (c++, asp.net, tcp/ip...) as the real labels
+    special_share = sum(any(ch in label for ch in "+.#/") for label in seen) / max(len(seen), 1)
+    while len(patterns) < ESCO_LABELS:
+        words = rng.sample(vocab, rng.randint(1, 4))
+        if rng.random() < special_share:
+            words[-1] += rng.choice(["++", ".js", ".net", "#", "/ip"])
+        label = " ".join(words)
+        if label in seen:
+            continue
+        seen.add(label)
+        patterns.append({"label": "SKILL", "pattern": [{"LOWER": w} for w in words],
+                         "id": f"synthetic/{len(patterns) // 7}"})
+    return patterns, loader.uri_to_canonical, loader.label_to_canonical, real
+
+
+def build(backend, patterns, uri_to_canonical, label_to_canonical):
+    nlp = load_nlp()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with patch.object(NERProcessor, "_get_mvp_patterns", return_value=patterns):
+        processor = NERProcessor(nlp, backend=backend)
+    build_s = time.perf_counter() - start
+    memory_mb = tracemalloc.get_traced_memory()[0] / 2**20
+    tracemalloc.stop()
+    processor.uri_to_canonical = uri_to_canonical
+    processor.label_to_canonical = label_to_canonical
+    return processor, build_s, memory_mb
+
+
+def run(processor, texts):
+    docs = list(processor.nlp.pipe(texts))
+    return [processor._extract_skills(doc) for doc in docs]
+
+
+if __name__ == "__main__":
+    patterns, uri_to_canonical, label_to_canonical, real_patterns = full_size_patterns()
+    print(f"Patterns: {len(patterns)} ({real_patterns} from the raw CSVs)")
+
+    texts = [offer['text'] for offer in JOB_OFFERS.values()] + [CV_CANDIDATE]
+    results, extracted = {}, {}
+    for backend in ("ruler", "phrase", "trie"):
+        print(f"⏳ Building '{backend}'...")
+        processor, build_s, memory_mb = build(backend, patterns, uri_to_canonical, label_to_canonical)
+        run(processor, texts[:1])  # warmup
+        times = []
+        for _ in range(NUM_RUNS):
+            start = time.perf_counter()
+            extracted[backend] = run(processor, texts)
+            times.append(time.perf_counter() - start)
+        results[backend] = (build_s, memory_mb, statistics.median(times))
+
+    same = extracted["ruler"] == extracted["phrase"] == extracted["trie"]
+    print("\n" + "=" * 66)
+    print(f"⚡ Skill extraction backends ({len(texts)} docs) ⚡")
+    print(f"{'backend':<8} {'build (s)':>10} {'memory (MB)':>12} {'parse+extract (ms/doc)':>23}")
+    for backend, (build_s, memory_mb, run_s) in results.items():
+        print(f"{backend:<8} {build_s:>10.2f} {memory_mb:>12.1f} {run_s / len(texts) * 1000:>23.2f}")
+    print(f"Identical skills: {'✅' if same else '❌'}")
+    print("=" * 66)
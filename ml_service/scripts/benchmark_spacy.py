@@ -0,0 +1,69 @@
+"""
+Compares the spaCy stage of the pipeline:
+  - per-call path: one nlp() call per text (job signal + every CV section)
+  - pipe path:     all texts of a batch of requests through one nlp.pipe call
+
+Run from the ml_service directory:
+    python scripts/benchmark_spacy.py
+"""
+import sys
+import time
+import statistics
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.orchestrator import HybridMatchEngine  # noqa: E402
+from src.data_models import MatchRequest  # noqa: E402
+from tests.test_data import JOB_OFFERS, CV_CANDIDATE  # noqa: E402
+
+BATCH_SIZES = [1, 8, 32]
+NUM_RUNS = 5
+
+
+def per_call_path(engine: HybridMatchEngine, requests):
+    """The previous behaviour: nlp() once per text."""
+    for request in requests:
+        cv_sections = engine.cv_parser.parse(request.cv_text)
+        job_data = engine.job_parser.parse(request.job_description)
+        job_signal_text = " ".join(job_data.values()) or request.job_description
+        engine.nlp(job_signal_text)
+        {sec: engine.nlp(txt) for sec, txt in cv_sections.items()}
+
+
+def pipe_path(engine: HybridMatchEngine, requests):
+    engine._build_documents(requests)
+
+
+def measure(fn, engine, requests) -> float:
+    times = []
+    for _ in range(NUM_RUNS):
+        start = time.perf_counter()
+        fn(engine, requests)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+engine = HybridMatchEngine()
+offers = [offer['text'] for offer in JOB_OFFERS.values()]
+
+# Warmup (lazy allocations, vocab growth)
+pipe_path(engine, [MatchRequest(job_description=offers[0], cv_text=CV_CANDIDATE)])
+
+print("\n" + "=" * 50)
+print("⚡ spaCy stage: per-call vs nlp.pipe ⚡")
+for batch_size in BATCH_SIZES:
+    requests = [
+        MatchRequest(job_description=offers[i % len(offers)], cv_text=CV_CANDIDATE)
+        for i in range(batch_size)
+    ]
+    t_call = measure(per_call_path, engine, requests)
+    t_pipe = measure(pipe_path, engine, requests)
+    print(f"Batch of {batch_size:>3} requests | per-call: {t_call * 1000:8.2f} ms"
+          f" | pipe: {t_pipe * 1000:8.2f} ms | speedup: {t_call / t_pipe:.2f}x")
+
+print("\nStage timings (pipe path):")
+for stage, values in engine.timings.stats().items():
+    print(f"  {stage:<16} avg {values['avg_ms']:8.3f} ms over {values['count']} runs")
+print("=" * 50)
+engine.close()
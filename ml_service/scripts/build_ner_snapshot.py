@@ -0,0 +1,35 @@
+"""
+Builds the NER pipeline snapshot loaded by HybridMatchEngine at startup.
+
+Loads the spaCy model, adds the ESCO skill patterns and tokenizer special
+cases (the slow part of a cold start) and writes the configured pipeline,
+the canonical maps and version metadata to NER_SNAPSHOT_PATH.
+
+Rebuild after changing the skill CSVs, the spaCy model or version, or
+ML_SKILL_MATCHER: the engine ignores (and reports) a stale snapshot.
+
+Run from the ml_service directory:
+    python scripts/build_ner_snapshot.py [--path data/snapshots/ner]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import NER_SNAPSHOT_PATH, SKILL_MATCHER_BACKEND, SPACY_MODEL_NAME  # noqa: E402
+from src.ner_snapshot import build_snapshot, load_base_pipeline  # noqa: E402
+from src.processors.ner import SKILL_MATCHER_BACKENDS  # noqa: E402
+
+parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+parser.add_argument("--path", default=NER_SNAPSHOT_PATH)
+parser.add_argument("--backend", default=SKILL_MATCHER_BACKEND, choices=SKILL_MATCHER_BACKENDS)
+args = parser.parse_args()
+
+print(f"⏳ Loading Spacy ({SPACY_MODEL_NAME})...")
+nlp = load_base_pipeline(SPACY_MODEL_NAME)
+print(f"⏳ Building the '{args.backend}' skill matcher snapshot...")
+meta = build_snapshot(nlp, args.path, backend=args.backend)
+print(f"✅ Snapshot written to {args.path}")
+print(json.dumps(meta, indent=2))
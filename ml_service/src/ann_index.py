@@ -0,0 +1,321 @@
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import (ANN_N_LISTS, ANN_N_PROBE, ANN_TRAIN_FACTOR,
+                        ANN_KMEANS_ITERS, ANN_RETRAIN_GROWTH, ANN_COMPACT_RATIO)
+
+# (doc_id, cosine score, payload)
+Hit = Tuple[str, float, Dict[str, Any]]
+
+
+class IVFIndex:
+    """
+    Inverted-file (IVF-Flat) index for L2-normalized vectors, on NumPy.
+
+    Vectors are grouped under the nearest of `n_lists` centroids (spherical
+    k-means); a query only scans the `n_probe` lists closest to it. Until the
+    index holds enough vectors to train the centroids, search is exact.
+
+    Vectors belong to a document (e.g. all chunks of one CV): documents are
+    inserted, replaced and deleted as a whole. Deleted rows are tombstoned and
+    dropped on compaction. All methods are thread-safe.
+    """
+
+    def __init__(self, dim: int, n_lists: int = ANN_N_LISTS,
+                 n_probe: int = ANN_N_PROBE, seed: int = 0):
+        self.dim = dim
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.RLock()
+
+        self._vectors = np.empty((0, dim), dtype=np.float32)
+        self._alive = np.empty(0, dtype=bool)
+        self._list_of = np.empty(0, dtype=np.int32)
+        self._size = 0
+        self._row_doc: List[str] = []
+        self._row_payload: List[Dict[str, Any]] = []
+        self._doc_rows: Dict[str, List[int]] = {}
+
+        self.centroids: Optional[np.ndarray] = None
+        self._trained_size = 0
+        self._lists: List[List[int]] = []
+        self._list_arrays: List[Optional[np.ndarray]] = []
+
+    # --- Mutations ---
+
+    def add(self, doc_id: str, vectors: np.ndarray,
+            payloads: Optional[List[Dict[str, Any]]] = None) -> None:
+        """Inserts the vectors of a document, replacing its previous ones."""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(-1, self.dim)
+        payloads = payloads or [{} for _ in range(len(vectors))]
+
+        with self._lock:
+            if self._remove_rows(doc_id):
+                self._maybe_compact()
+            if not len(vectors):
+                return
+
+            start = self._size
+            self._reserve(start + len(vectors))
+            self._vectors[start:start + len(vectors)] = vectors
+            self._alive[start:start + len(vectors)] = True
+            self._size += len(vectors)
+            self._row_doc.extend([doc_id] * len(vectors))
+            self._row_payload.extend(payloads)
+            rows = list(range(start, self._size))
+            self._doc_rows[doc_id] = rows
+
+            if self.centroids is None:
+                self._list_of[rows] = -1
+                if self.live_count() >= self.n_lists * ANN_TRAIN_FACTOR:
+                    self.train()
+            elif self.live_count() > self._trained_size * ANN_RETRAIN_GROWTH:
+                self.train()
+            else:
+                self._assign(np.asarray(rows))
+
+    def remove(self, doc_id: str) -> bool:
+        """Deletes all vectors of a document."""
+        with self._lock:
+            removed = self._remove_rows(doc_id)
+            self._maybe_compact()
+            return removed
+
+    def train(self) -> None:
+        """(Re)builds the centroids with spherical k-means and re-assigns every vector."""
+        with self._lock:
+            live_rows = np.flatnonzero(self._alive[:self._size])
+            if len(live_rows) < self.n_lists:
+                return
+            sample = live_rows
+            max_sample = self.n_lists * 256
+            if len(sample) > max_sample:
+                sample = self._rng.choice(live_rows, max_sample, replace=False)
+
+            self.centroids = self._kmeans(self._vectors[sample])
+            self._trained_size = len(live_rows)
+            self._lists = [[] for _ in range(self.n_lists)]
+            self._list_arrays = [None] * self.n_lists
+            self._list_of[:self._size] = -1
+            self._assign(live_rows)
+
+    # --- Queries ---
+
+    def search(self, queries: np.ndarray, k: int = 10,
+               n_probe: Optional[int] = None, exact: bool = False) -> List[List[Hit]]:
+        """
+        Top-k vectors by cosine similarity for every query row.
+        `exact=True` scans everything (reference for recall measurements).
+        """
+        queries = np.asarray(queries, dtype=np.float32).reshape(-1, self.dim)
+        n_probe = min(n_probe or self.n_probe, self.n_lists)
+
+        with self._lock:
+            if exact or self.centroids is None:
+                all_rows = np.flatnonzero(self._alive[:self._size])
+                return [self._top_k(query, all_rows, k) for query in queries]
+
+            # Closest lists per query, shape (Q, n_probe)
+            centroid_scores = queries @ self.centroids.T
+            probes = np.argpartition(-centroid_scores, n_probe - 1, axis=1)[:, :n_probe]
+
+            results = []
+            for query, lists in zip(queries, probes):
+                rows = np.concatenate([self._list_array(i) for i in lists])
+                rows = rows[self._alive[rows]]
+                results.append(self._top_k(query, rows, k))
+            return results
+
+    def live_count(self) -> int:
+        return int(self._alive[:self._size].sum())
+
+    def __len__(self) -> int:
+        return self.live_count()
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_rows
+
+    def documents(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Payloads of the live rows, per document."""
+        with self._lock:
+            return {doc_id: [self._row_payload[row] for row in rows]
+                    for doc_id, rows in self._doc_rows.items()}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            list_sizes = [len(rows) for rows in self._lists]
+            return {
+                "vectors": self.live_count(),
+                "documents": len(self._doc_rows),
+                "tombstones": self._size - self.live_count(),
+                "trained": self.centroids is not None,
+                "n_lists": self.n_lists,
+                "n_probe": self.n_probe,
+                "max_list_size": max(list_sizes, default=0),
+                "bytes": int(self._vectors[:self._size].nbytes),
+            }
+
+    # --- Persistence ---
+
+    def save(self, path: str) -> None:
+        """Writes the index atomically (temp file + rename)."""
+        with self._lock:
+            self._compact()
+            meta = {
+                "dim": self.dim,
+                "n_lists": self.n_lists,
+                "n_probe": self.n_probe,
+                "trained_size": self._trained_size,
+                "row_doc": self._row_doc,
+                "row_payload": self._row_payload,
+            }
+            arrays = {
+                "vectors": self._vectors[:self._size],
+                "list_of": self._list_of[:self._size],
+                "meta": np.array(json.dumps(meta)),
+            }
+            if self.centroids is not None:
+                arrays["centroids"] = self.centroids
+
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "IVFIndex":
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            index = cls(meta["dim"], meta["n_lists"], meta["n_probe"])
+            vectors = data["vectors"]
+            list_of = data["list_of"]
+            centroids = data["centroids"] if "centroids" in data else None
+
+        size = len(vectors)
+        index._reserve(size)
+        index._vectors[:size] = vectors
+        index._alive[:size] = True
+        index._list_of[:size] = list_of
+        index._size = size
+        index._row_doc = meta["row_doc"]
+        index._row_payload = meta["row_payload"]
+        for row, doc_id in enumerate(index._row_doc):
+            index._doc_rows.setdefault(doc_id, []).append(row)
+
+        if centroids is not None:
+            index.centroids = centroids
+            index._trained_size = meta["trained_size"]
+            index._lists = [[] for _ in range(index.n_lists)]
+            index._list_arrays = [None] * index.n_lists
+            for row, list_id in enumerate(list_of.tolist()):
+                index._lists[list_id].append(row)
+        return index
+
+    # --- Internals ---
+
+    def _reserve(self, capacity: int) -> None:
+        """Grows the row storage geometrically."""
+        if capacity <= len(self._vectors):
+            return
+        new_capacity = max(capacity, 2 * len(self._vectors), 1024)
+        vectors = np.empty((new_capacity, self.dim), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        alive = np.zeros(new_capacity, dtype=bool)
+        alive[:self._size] = self._alive[:self._size]
+        list_of = np.full(new_capacity, -1, dtype=np.int32)
+        list_of[:self._size] = self._list_of[:self._size]
+        self._vectors, self._alive, self._list_of = vectors, alive, list_of
+
+    def _remove_rows(self, doc_id: str) -> bool:
+        rows = self._doc_rows.pop(doc_id, None)
+        if not rows:
+            return False
+        self._alive[rows] = False
+        return True
+
+    def _assign(self, rows: np.ndarray) -> None:
+        """Puts rows into the list of their nearest centroid."""
+        for start in range(0, len(rows), 4096):
+            batch = rows[start:start + 4096]
+            nearest = np.argmax(self._vectors[batch] @ self.centroids.T, axis=1)
+            self._list_of[batch] = nearest
+            for row, list_id in zip(batch.tolist(), nearest.tolist()):
+                self._lists[list_id].append(row)
+                self._list_arrays[list_id] = None
+
+    def _list_array(self, list_id: int) -> np.ndarray:
+        """Rows of one list as an array (cached until the list changes)."""
+        array = self._list_arrays[list_id]
+        if array is None:
+            array = np.asarray(self._lists[list_id], dtype=np.int64)
+            self._list_arrays[list_id] = array
+        return array
+
+    def _top_k(self, query: np.ndarray, rows: np.ndarray, k: int) -> List[Hit]:
+        if not len(rows):
+            return []
+        scores = self._vectors[rows] @ query
+        if len(rows) > k:
+            best = np.argpartition(-scores, k - 1)[:k]
+        else:
+            best = np.arange(len(rows))
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [(self._row_doc[row], float(scores[i]), self._row_payload[row])
+                for i, row in zip(best.tolist(), rows[best].tolist())]
+
+    def _kmeans(self, data: np.ndarray) -> np.ndarray:
+        """Spherical k-means: centroids are re-normalized after every update."""
+        centroids = data[self._rng.choice(len(data), self.n_lists, replace=False)].copy()
+        for _ in range(ANN_KMEANS_ITERS):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            counts = np.bincount(labels, minlength=self.n_lists)
+
+            # Per-cluster sums in one pass over the label-sorted data
+            empty = counts == 0
+            starts = (np.cumsum(counts) - counts)[~empty]
+            sums = np.zeros_like(centroids)
+            sums[~empty] = np.add.reduceat(
+                data[np.argsort(labels, kind="stable")], starts, axis=0)
+
+            if empty.any():
+                # Re-seed empty lists with random points
+                sums[empty] = data[self._rng.choice(len(data), int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.maximum(norms, 1e-12)
+        return centroids.astype(np.float32)
+
+    def _maybe_compact(self) -> None:
+        """Compacts once tombstones exceed ANN_COMPACT_RATIO of the rows."""
+        dead = self._size - self.live_count()
+        if self._size and dead / self._size > ANN_COMPACT_RATIO:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Drops tombstoned rows and renumbers the rest."""
+        live_rows = np.flatnonzero(self._alive[:self._size])
+        if len(live_rows) == self._size:
+            return
+        remap = np.full(self._size, -1, dtype=np.int64)
+        remap[live_rows] = np.arange(len(live_rows))
+
+        self._vectors = self._vectors[live_rows].copy()
+        self._list_of = self._list_of[live_rows].copy()
+        self._alive = np.ones(len(live_rows), dtype=bool)
+        self._row_doc = [self._row_doc[row] for row in live_rows.tolist()]
+        self._row_payload = [self._row_payload[row] for row in live_rows.tolist()]
+        self._size = len(live_rows)
+        self._doc_rows = {doc_id: remap[rows].tolist()
+                          for doc_id, rows in self._doc_rows.items()}
+
+        if self.centroids is not None:
+            self._lists = [[] for _ in range(self.n_lists)]
+            self._list_arrays = [None] * self.n_lists
+            for row, list_id in enumerate(self._list_of.tolist()):
+                self._lists[list_id].append(row)
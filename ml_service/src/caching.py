@@ -0,0 +1,144 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import torch
+from spacy.tokens import Doc, DocBin
+from spacy.vocab import Vocab
+
+from src.config import (EMBEDDING_CACHE_MAX_ENTRIES, EMBEDDING_CACHE_MAX_BYTES,
+                        PARSED_DOC_CACHE_MAX_ENTRIES, PARSED_DOC_CACHE_MAX_BYTES)
+
+
+class LRUCache:
+    """
+    Thread-safe LRU store bounded by entry count AND total bytes.
+    Shared by the executor threads, so every access goes through one lock.
+    Subclasses decide how keys are built and how big a value is.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value: Any, size: int) -> None:
+        if size > self.max_bytes:
+            return  # Never let a single giant entry flush the whole cache
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._data[key] = (value, size)
+            self._bytes += size
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drops least recently used entries until both bounds hold."""
+        while self._data and (len(self._data) > self.max_entries
+                              or self._bytes > self.max_bytes):
+            _, (_, size) = self._data.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class EmbeddingCache(LRUCache):
+    """
+    Chunk-level SBERT embedding cache.
+    Keys are a hash of the model name + chunk text, so switching models
+    never returns stale vectors.
+    """
+
+    def __init__(self, model_name: str,
+                 max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES,
+                 max_bytes: int = EMBEDDING_CACHE_MAX_BYTES):
+        super().__init__(max_entries, max_bytes)
+        self.model_name = model_name
+
+    def make_key(self, text: str) -> str:
+        raw = f"{self.model_name}\x00{text}".encode("utf-8")
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    def get_many(self, texts: List[str]) -> List[Optional[torch.Tensor]]:
+        """Cached rows in input order (None for misses)."""
+        return [self.get(self.make_key(t)) for t in texts]
+
+    def put_many(self, texts: List[str], embeddings: torch.Tensor) -> None:
+        for text, row in zip(texts, embeddings):
+            # clone() detaches the row from the batch storage; otherwise a
+            # single cached row would keep the whole batch tensor alive.
+            row = row.detach().to("cpu").clone()
+            self.put(self.make_key(text), row,
+                     row.element_size() * row.nelement())
+
+
+class ParsedDocCache(LRUCache):
+    """
+    Parsed spaCy docs (CV sections, job signal texts), stored serialized as
+    a one-doc DocBin: compressed token attributes instead of live Doc objects.
+    Keys are a hash of the pipeline version + text, so another model,
+    component list or skill matcher never returns stale annotations.
+    """
+
+    def __init__(self, vocab: Vocab, pipeline_version: str,
+                 max_entries: int = PARSED_DOC_CACHE_MAX_ENTRIES,
+                 max_bytes: int = PARSED_DOC_CACHE_MAX_BYTES):
+        super().__init__(max_entries, max_bytes)
+        self.vocab = vocab
+        self.pipeline_version = pipeline_version
+
+    def make_key(self, text: str) -> str:
+        raw = f"{self.pipeline_version}\x00{text}".encode("utf-8")
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    def get_many(self, texts: List[str]) -> List[Optional[Doc]]:
+        """Cached docs in input order (None for misses), deserialized."""
+        docs = []
+        for text in texts:
+            data = self.get(self.make_key(text))
+            docs.append(None if data is None
+                        else next(DocBin().from_bytes(data).get_docs(self.vocab)))
+        return docs
+
+    def put_many(self, texts: List[str], docs: List[Doc]) -> None:
+        if not self.max_bytes:
+            return  # Disabled: skip the serialization too
+        for text, doc in zip(texts, docs):
+            data = DocBin(docs=[doc]).to_bytes()
+            self.put(self.make_key(text), data, len(data))
@@ -0,0 +1,109 @@
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.ann_index import IVFIndex
+from src.config import ANN_INDEX_PATH, ANN_AUTOSAVE_EVERY
+from src.data_models import (CandidateIndexRequest, CandidateSearchRequest,
+                             CandidateSearchResponse, CandidateHit)
+
+# Chunks fetched per requested candidate (one CV often owns several top chunks)
+CHUNKS_PER_CANDIDATE = 5
+
+
+class CandidateIndex:
+    """
+    Candidate search over the chunk embeddings of indexed CVs.
+
+    Embeddings come from the engine (the same chunking and SBERT encoding as
+    /match); the IVF index itself lives in the API process, so in 'process'
+    mode all workers feed and query one shared index.
+    """
+
+    def __init__(self, engine, path: str = ANN_INDEX_PATH):
+        self.engine = engine
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending_changes = 0
+        # The dimension is only known from the first embeddings when starting empty
+        self.index: Optional[IVFIndex] = self._load() if Path(path).exists() else None
+
+    def _load(self) -> IVFIndex:
+        """
+        Loads the persisted index. If it was built with another SBERT model
+        (different dimension), every stored chunk is re-embedded with the
+        current one.
+        """
+        index = IVFIndex.load(self.path)
+        dim = self.engine.embed_texts(["dimension probe"]).shape[1]
+        if index.dim == dim:
+            return index
+
+        print(f"⚠️  ANN index at {self.path} has dim {index.dim}, expected {dim}. Rebuilding...")
+        rebuilt = IVFIndex(dim, index.n_lists, index.n_probe)
+        for cv_id, payloads in index.documents().items():
+            rebuilt.add(cv_id, self.engine.embed_texts([p["text"] for p in payloads]), payloads)
+        rebuilt.save(self.path)
+        print(f"✅ ANN index rebuilt ({len(rebuilt)} vectors).")
+        return rebuilt
+
+    def add_cv(self, request: CandidateIndexRequest) -> Dict[str, Any]:
+        """Indexes (or re-indexes) every chunk of a CV."""
+        payloads, vectors = self.engine.embed_cv(request.cv_text)
+        with self._lock:
+            if self.index is None:
+                if not payloads:
+                    return {"cv_id": request.cv_id, "chunks": 0}
+                self.index = IVFIndex(vectors.shape[1])
+            self.index.add(request.cv_id, vectors, payloads)
+            self._changed()
+        return {"cv_id": request.cv_id, "chunks": len(payloads)}
+
+    def remove_cv(self, cv_id: str) -> bool:
+        with self._lock:
+            if self.index is None or not self.index.remove(cv_id):
+                return False
+            self._changed()
+            return True
+
+    def search(self, request: CandidateSearchRequest) -> CandidateSearchResponse:
+        """Best chunk of the top_k CVs closest to the requirement."""
+        if self.index is None or not len(self.index):
+            return CandidateSearchResponse(results=[])
+
+        query = self.engine.embed_texts([request.requirement])
+        hits = self.index.search(query, k=request.top_k * CHUNKS_PER_CANDIDATE,
+                                 n_probe=request.n_probe)[0]
+
+        # Hits are sorted by score: the first hit of a CV is its best chunk
+        results = {}
+        for cv_id, score, payload in hits:
+            if cv_id not in results:
+                results[cv_id] = CandidateHit(cv_id=cv_id, score=round(score, 4),
+                                              cv_section=payload["section"],
+                                              best_cv_match=payload["text"])
+                if len(results) == request.top_k:
+                    break
+        return CandidateSearchResponse(results=list(results.values()))
+
+    def save(self) -> None:
+        with self._lock:
+            if self.index is not None:
+                self.index.save(self.path)
+            self._pending_changes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        if self.index is None:
+            return {"vectors": 0, "documents": 0}
+        return self.index.stats()
+
+    def close(self) -> None:
+        if self._pending_changes:
+            self.save()
+
+    def _changed(self) -> None:
+        """Counts a mutation; saves every ANN_AUTOSAVE_EVERY of them (lock held)."""
+        self._pending_changes += 1
+        if self._pending_changes >= ANN_AUTOSAVE_EVERY:
+            self.index.save(self.path)
+            self._pending_changes = 0
@@ -1,9 +1,78 @@
+import os
+
+# Execution mode of the API:
+#   'thread'  - one shared engine, requests run in a ThreadPoolExecutor (default)
+#   'process' - every worker process loads its own engine (sidesteps the GIL)
+EXECUTION_MODE = os.environ.get('ML_EXECUTION_MODE', 'thread')
+PROCESS_POOL_WORKERS = int(os.environ.get(
+    'ML_PROCESS_WORKERS', max((os.cpu_count() or 2) - 1, 1)))
+# Torch intra-op threads per worker process (avoids N processes x N threads)
+PROCESS_POOL_TORCH_THREADS = max((os.cpu_count() or 1) // PROCESS_POOL_WORKERS, 1)
+# Seconds to wait for all workers to load their engine at startup
+PROCESS_POOL_START_TIMEOUT = 600
+
+# Startup: models load in a background thread, then the warmup corpus (a JSON
+# list of /match requests) runs WARMUP_ROUNDS times through the full pipeline.
+# /health/ready only reports ready once both are done. '' disables the warmup.
+WARMUP_CORPUS_PATH = os.environ.get('ML_WARMUP_CORPUS', 'data/warmup/corpus.json')
+WARMUP_ROUNDS = int(os.environ.get('ML_WARMUP_ROUNDS', 2))
+# Seconds the shutdown waits for a startup still in progress (e.g. a model download)
+SHUTDOWN_LOADER_TIMEOUT = float(os.environ.get('ML_SHUTDOWN_LOADER_TIMEOUT', 10))
+
 # Sentence Transformer Model (for semantic search)
 SBERT_MODEL_NAME = 'all-MiniLM-L6-v2'  # faster than 'all-mpnet-base-v2'
+# CPU inference backend: 'fp32' (reference), 'int8', 'bf16' or 'onnx'
+# (see src/inference_backends.py and scripts/benchmark_sbert_backends.py)
+SBERT_BACKEND = os.environ.get('ML_SBERT_BACKEND', 'fp32')
+
+# Cross-request micro-batching in front of SBERT.
+# Chunks from concurrent requests are collected for up to MAX_WAIT_MS
+# (or until MAX_SIZE texts are queued) and encoded in a single forward pass.
+ENCODE_BATCH_MAX_WAIT_MS = 5
+ENCODE_BATCH_MAX_SIZE = 256
+
+# Chunk embedding cache (LRU, bounded by entries AND bytes).
+# all-MiniLM-L6-v2 rows are 384 floats (~1.5 KB each).
+EMBEDDING_CACHE_MAX_ENTRIES = 50_000
+EMBEDDING_CACHE_MAX_BYTES = 128 * 1024 * 1024
+
+# Parsed spaCy doc cache (DocBin bytes per CV section / job text; 0 bytes disables)
+PARSED_DOC_CACHE_MAX_ENTRIES = 20_000
+PARSED_DOC_CACHE_MAX_BYTES = int(os.environ.get('ML_PARSED_DOC_CACHE_MB', 64)) * 1024 * 1024
 
 # SpaCy Model (for sentence splitting and lemmatization)
 SPACY_MODEL_NAME = 'en_core_web_sm'
 
+# nlp.pipe settings used to parse all texts of a request (or a batch of requests).
+# n_process > 1 forks worker processes per pipe call: only worth it for large batches.
+SPACY_PIPE_BATCH_SIZE = 32
+SPACY_N_PROCESS = 1
+
+# /match/rank: max CVs per call and how many CVs are parsed/encoded together
+RANK_MAX_CVS = 2000
+RANK_BATCH_SIZE = 128
+# /match/jobs: max job offers matched against one CV per call
+MATCH_JOBS_MAX = 100
+
+# Job registry (/jobs): SQLite file with precomputed job artifacts.
+# Postings expire after TTL days unless registered with their own expiry.
+JOB_REGISTRY_PATH = os.getenv("ML_JOB_REGISTRY_PATH", "data/registry/jobs.sqlite3")
+JOB_REGISTRY_TTL_DAYS = float(os.getenv("ML_JOB_REGISTRY_TTL_DAYS", "30"))
+
+# Candidate search: IVF index over the chunk embeddings of indexed CVs.
+# The index is exact until it holds N_LISTS * TRAIN_FACTOR vectors, then
+# k-means lists are trained; they are retrained when the index grows RETRAIN_GROWTH x.
+ANN_INDEX_PATH = os.getenv("ML_ANN_INDEX_PATH", "data/index/cv_chunks.npz")
+ANN_N_LISTS = 256
+ANN_N_PROBE = 16
+ANN_TRAIN_FACTOR = 39
+ANN_KMEANS_ITERS = 15
+ANN_RETRAIN_GROWTH = 4.0
+# Tombstoned share of rows that triggers compaction
+ANN_COMPACT_RATIO = 0.3
+# CVs inserted/removed between automatic saves (the index is also saved on shutdown)
+ANN_AUTOSAVE_EVERY = 500
+
 # Default Algorithm Settings
 DEFAULT_ALPHA = 0.7  # 70% Semantics, 30% Keywords
 
@@ -33,6 +102,15 @@ NER_SKILLS_DATA_PATH = {
     'processed': 'data/processed/skills_en.pkl',
 }
 
+# Skill extraction: 'phrase' (PhraseMatcher, only on docs whose skills are needed),
+# 'trie' (Aho-Corasick SkillIndex in compact arrays, same call sites)
+# or 'ruler' (EntityRuler pipeline component on every doc)
+SKILL_MATCHER_BACKEND = os.environ.get('ML_SKILL_MATCHER', 'phrase')
+
+# Prebuilt NER pipeline (scripts/build_ner_snapshot.py), loaded at startup
+# instead of rebuilding patterns and tokenizer special cases. '' disables it.
+NER_SNAPSHOT_PATH = os.environ.get('ML_NER_SNAPSHOT_PATH', 'data/snapshots/ner')
+
 STRONG_ROOTS = {
             # --- Leadership & Management ---
             "lead", "manage", "spearhead", "orchestrate", "direct", "supervise", "oversee",
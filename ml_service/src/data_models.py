@@ -1,9 +1,9 @@
 from typing import List, Annotated, Optional, Dict
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 # from enum import Enum
 
-from src.config import DEFAULT_ALPHA
+from src.config import DEFAULT_ALPHA, RANK_MAX_CVS, MATCH_JOBS_MAX
 
 
 # Should be handel by frontend or backend
@@ -31,14 +31,25 @@ class MatchDetail(BaseModel):
 
 
 class MatchRequest(BaseModel):
-    """Input validation for the matching engine."""
-    job_description: Annotated[str, Field(..., min_length=50,
-                                          description="Full text of the job offer.")]
+    """
+    Input validation for the matching engine.
+    The job offer is given either as raw text or as the id of a registered job.
+    """
+    job_description: Annotated[Optional[str], Field(None, min_length=50,
+                                                    description="Full text of the job offer.")]
+    job_id: Annotated[Optional[str], Field(None,
+                                           description="Id of a job registered via POST /jobs.")]
     cv_text: Annotated[str, Field(..., min_length=50,
                                   description="Full text of the candidate's CV.")]
     alpha: Annotated[float, Field(DEFAULT_ALPHA, ge=0.0, le=1.0,
                                   description="Weight for Semantic Score (0.0-1.0).")]
 
+    @model_validator(mode="after")
+    def check_job_source(self) -> "MatchRequest":
+        if (self.job_description is None) == (self.job_id is None):
+            raise ValueError("Provide exactly one of 'job_description' or 'job_id'.")
+        return self
+
 
 class MatchResponse(BaseModel):
     """Output structure returned by the engine."""
@@ -72,3 +83,96 @@ class MatchResponse(BaseModel):
     # List of all processed chunks with their individual matches
     details: Annotated[List[MatchDetail], Field(...,
                                                 description="Detailed scoring for each sentence/chunk comparison.")]
+
+
+class RankRequest(BaseModel):
+    """Input for ranking many CVs against one job offer."""
+    job_description: Annotated[str, Field(..., min_length=50,
+                                          description="Full text of the job offer.")]
+    cv_texts: Annotated[List[Annotated[str, Field(min_length=50)]],
+                        Field(..., min_length=1, max_length=RANK_MAX_CVS,
+                              description="Full texts of the candidates' CVs.")]
+    alpha: Annotated[float, Field(DEFAULT_ALPHA, ge=0.0, le=1.0,
+                                  description="Weight for Semantic Score (0.0-1.0).")]
+    top_k: Annotated[Optional[int], Field(None, ge=1,
+                                          description="Return only the K best CVs.")]
+    include_details: Annotated[bool, Field(False,
+                                           description="Include per-chunk details "
+                                           "(compact response when False).")]
+
+
+class RankedCV(MatchResponse):
+    """Match result of one CV, with its position in the request."""
+    cv_index: Annotated[int, Field(..., ge=0,
+                                   description="Index of the CV in 'cv_texts'.")]
+
+
+class RankResponse(BaseModel):
+    """CVs sorted by final_score (best first)."""
+    total_cvs: Annotated[int, Field(..., description="Number of CVs ranked.")]
+    results: Annotated[List[RankedCV], Field(...,
+                                             description="Ranked CVs (top_k if requested).")]
+
+
+class JobsMatchRequest(BaseModel):
+    """Input for matching one CV against many job offers."""
+    cv_text: Annotated[str, Field(..., min_length=50,
+                                  description="Full text of the candidate's CV.")]
+    job_descriptions: Annotated[List[Annotated[str, Field(min_length=50)]],
+                                Field(..., min_length=1, max_length=MATCH_JOBS_MAX,
+                                      description="Full texts of the job offers.")]
+    alpha: Annotated[float, Field(DEFAULT_ALPHA, ge=0.0, le=1.0,
+                                  description="Weight for Semantic Score (0.0-1.0).")]
+
+
+class JobsMatchResponse(BaseModel):
+    """One MatchResponse per job offer, in request order."""
+    results: List[MatchResponse]
+
+
+class JobRegisterRequest(BaseModel):
+    """Input for registering a job offer in the registry."""
+    job_description: Annotated[str, Field(..., min_length=50,
+                                          description="Full text of the job offer.")]
+    expires_in_days: Annotated[Optional[float], Field(None, gt=0, le=365,
+                                                      description="Lifetime of the posting (default from config).")]
+
+
+class JobInfo(BaseModel):
+    """Metadata of a registered job offer."""
+    job_id: str
+    created_at: float
+    expires_at: float
+    sections: Dict[str, str]
+    chunks: int
+    skills: List[str]
+
+
+class CandidateIndexRequest(BaseModel):
+    """Input for adding (or replacing) a CV in the candidate search index."""
+    cv_id: Annotated[str, Field(..., min_length=1, max_length=200,
+                                description="Caller-side id of the CV.")]
+    cv_text: Annotated[str, Field(..., min_length=50,
+                                  description="Full text of the candidate's CV.")]
+
+
+class CandidateSearchRequest(BaseModel):
+    """Input for finding the CVs that best match one requirement."""
+    requirement: Annotated[str, Field(..., min_length=3,
+                                      description="Requirement sentence to search for.")]
+    top_k: Annotated[int, Field(10, ge=1, le=200,
+                                description="Number of candidates to return.")]
+    n_probe: Annotated[Optional[int], Field(None, ge=1,
+                                            description="IVF lists to scan (speed vs recall).")]
+
+
+class CandidateHit(BaseModel):
+    """Best matching chunk of one candidate."""
+    cv_id: str
+    score: float
+    cv_section: str
+    best_cv_match: str
+
+
+class CandidateSearchResponse(BaseModel):
+    results: List[CandidateHit]
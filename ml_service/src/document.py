@@ -0,0 +1,124 @@
+from typing import Dict, List, Optional
+
+import torch
+from spacy.language import Language
+from spacy.tokens import Doc, Span
+
+
+@Language.component("newline_sentence_boundaries")
+def newline_sentence_boundaries(doc: Doc) -> Doc:
+    """
+    Forces a sentence start after every newline token.
+    Parsed sections are chunked line by line, so a sentence must never
+    run across a line break (the parser respects preset boundaries).
+    """
+    for token in doc[:-1]:
+        if "\n" in token.text:
+            doc[token.i + 1].is_sent_start = True
+    return doc
+
+
+def add_newline_boundaries(nlp: Language) -> None:
+    """Registers the newline boundary component before the parser (idempotent)."""
+    if "newline_sentence_boundaries" in nlp.pipe_names:
+        return
+    if "parser" in nlp.pipe_names:
+        nlp.add_pipe("newline_sentence_boundaries", before="parser")
+    else:
+        nlp.add_pipe("newline_sentence_boundaries")
+
+
+class CVDocument:
+    """
+    The whole CV as a single Doc with a Span per section.
+    Built from sections that were each parsed exactly once.
+    """
+
+    def __init__(self, doc: Doc, sections: Dict[str, Span]):
+        self.doc = doc
+        self.sections = sections
+        # Lemmatized text for the TF-IDF fallback (filled on first use)
+        self.lemmatized_text: Optional[str] = None
+
+    @classmethod
+    def from_section_docs(cls, nlp: Language,
+                          section_docs: Dict[str, Doc]) -> "CVDocument":
+        """
+        Merges already parsed CV sections into one CV Doc and records where
+        every section lives in it.
+        """
+        names = list(section_docs.keys())
+        docs = [section_docs[name] for name in names]
+
+        cv_doc: Optional[Doc] = Doc.from_docs(docs) if docs else None
+        if cv_doc is None:
+            return cls(nlp.make_doc(""), {})
+
+        sections: Dict[str, Span] = {}
+        start = 0
+        for name, doc in zip(names, docs):
+            end = start + len(doc)
+            sections[name] = cv_doc[start:end]
+            start = end
+
+        return cls(cv_doc, sections)
+
+    def section(self, name: str) -> Optional[Span]:
+        return self.sections.get(name)
+
+    def select(self, names: List[str]) -> List[Span]:
+        """Spans of the requested sections that exist in this CV."""
+        return [self.sections[n] for n in names if n in self.sections]
+
+
+class PreparedJob:
+    """
+    Job-side artifacts that do not depend on the CV: chunks, their
+    (normalized) embeddings and the extracted skills. Computed once and
+    reused against any number of CVs.
+    `job_doc` may be None when the artifacts were restored from storage;
+    the lemmatized text for the TF-IDF fallback is then stored as well.
+    """
+
+    def __init__(self, chunks: List[str], embeddings: Optional[torch.Tensor],
+                 skills: List[str], job_doc: Optional[Doc] = None,
+                 lemmatized_text: Optional[str] = None):
+        self.chunks = chunks
+        self.embeddings = embeddings
+        self.skills = skills
+        self.job_doc = job_doc
+        self.lemmatized_text = lemmatized_text
+
+
+class MatchDocument:
+    """
+    Annotated representation of one match request, produced ONCE per request.
+
+    Holds the parsed job signal text (None for a registered job) and the
+    whole CV as a single Doc with a Span per section. Chunking, NER, action verbs and the TF-IDF fallback all
+    read from it, so the spaCy pipeline never runs twice on the same text.
+    """
+
+    def __init__(self, job_doc: Optional[Doc], cv: CVDocument):
+        self.job_doc = job_doc
+        self.cv = cv
+
+    @classmethod
+    def from_docs(cls, nlp: Language, job_doc: Optional[Doc],
+                  cv_section_docs: Dict[str, Doc]) -> "MatchDocument":
+        return cls(job_doc, CVDocument.from_section_docs(nlp, cv_section_docs))
+
+    @property
+    def cv_doc(self) -> Doc:
+        return self.cv.doc
+
+    @property
+    def cv_sections(self) -> Dict[str, Span]:
+        return self.cv.sections
+
+    def section(self, name: str) -> Optional[Span]:
+        return self.cv.section(name)
+
+    def sections(self, names: List[str]) -> List[Span]:
+        """Spans of the requested sections that exist in this CV."""
+        return self.cv.select(names)
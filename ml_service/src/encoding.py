@@ -0,0 +1,154 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional, Dict, Union
+
+from sentence_transformers import SentenceTransformer
+
+from src.config import ENCODE_BATCH_MAX_WAIT_MS, ENCODE_BATCH_MAX_SIZE
+from src.inference_backends import SBERTBackend
+
+
+class _EncodeJob:
+    """A single caller's chunk list waiting for its embeddings."""
+    __slots__ = ("texts", "future")
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.future: Future = Future()
+
+
+class BatchingEncoder:
+    """
+    Dynamic micro-batching front for a SentenceTransformer.
+
+    Every request runs in its own executor thread and used to call
+    `model.encode` with a handful of chunks. Here callers only enqueue their
+    texts; a single worker thread collects texts from concurrent requests for a
+    short window, runs ONE forward pass and scatters the rows back.
+    Exposes the same `encode` signature as the wrapped model, so processors
+    don't need to know whether batching is enabled.
+    """
+
+    def __init__(self, model: Union[SentenceTransformer, SBERTBackend],
+                 max_wait_ms: float = ENCODE_BATCH_MAX_WAIT_MS,
+                 max_batch_size: int = ENCODE_BATCH_MAX_SIZE):
+        self.model = model
+        self.max_wait = max(max_wait_ms, 0) / 1000.0
+        self.max_batch_size = max(max_batch_size, 1)
+
+        self._queue: "queue.Queue[Optional[_EncodeJob]]" = queue.Queue()
+        # Guards enqueueing against close(): no job may follow the sentinel
+        self._queue_lock = threading.Lock()
+        self._closed = False
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._requests = 0
+        self._texts = 0
+
+        self._worker = threading.Thread(
+            target=self._run, name="sbert-batcher", daemon=True)
+        self._worker.start()
+
+    def encode(self, sentences: List[str], convert_to_tensor: bool = True):
+        """
+        Blocks the calling thread until its embeddings are ready.
+        Returns a tensor (or numpy array) with one row per input sentence.
+        """
+        if not sentences:
+            return self.model.encode(sentences,
+                                     convert_to_tensor=convert_to_tensor)
+        job = _EncodeJob(list(sentences))
+        with self._queue_lock:
+            if self._closed or not self._worker.is_alive():
+                raise RuntimeError("Batching encoder is closed.")
+            self._queue.put(job)
+        embeddings = job.future.result()
+
+        if convert_to_tensor:
+            return embeddings
+        return embeddings.cpu().numpy()
+
+    def close(self) -> None:
+        """Stops the worker thread after the queued jobs are processed."""
+        with self._queue_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join()
+
+    def stats(self) -> Dict[str, float]:
+        """Batching counters (useful to tune the wait window)."""
+        with self._stats_lock:
+            batches = self._batches
+            return {
+                "batches": batches,
+                "requests": self._requests,
+                "texts": self._texts,
+                "avg_requests_per_batch": round(
+                    self._requests / batches, 2) if batches else 0.0,
+                "avg_texts_per_batch": round(
+                    self._texts / batches, 2) if batches else 0.0,
+            }
+
+    def _run(self) -> None:
+        """Worker loop: gather -> encode -> scatter."""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            batch, stop = self._collect(job)
+            self._encode_batch(batch)
+            if stop:
+                return
+
+    def _collect(self, first: _EncodeJob):
+        """
+        Collects jobs until the wait window closes or the batch is full.
+        Returns (batch, stop_requested).
+        """
+        batch = [first]
+        size = len(first.texts)
+        deadline = time.monotonic() + self.max_wait
+
+        while size < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    job = self._queue.get(timeout=remaining)
+                else:
+                    # Window closed: still take what is already queued
+                    job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if job is None:
+                return batch, True
+            batch.append(job)
+            size += len(job.texts)
+
+        return batch, False
+
+    def _encode_batch(self, batch: List[_EncodeJob]) -> None:
+        """Runs one forward pass for the whole batch and scatters the rows."""
+        texts = [t for job in batch for t in job.texts]
+        try:
+            embeddings = self.model.encode(texts, convert_to_tensor=True)
+        except Exception as e:
+            for job in batch:
+                job.future.set_exception(e)
+            return
+
+        offset = 0
+        for job in batch:
+            end = offset + len(job.texts)
+            job.future.set_result(embeddings[offset:end])
+            offset = end
+
+        with self._stats_lock:
+            self._batches += 1
+            self._requests += len(batch)
+            self._texts += len(texts)
@@ -0,0 +1,122 @@
+import time
+import warnings
+from typing import Dict, List, Union
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+from sentence_transformers import SentenceTransformer
+
+from src.config import SBERT_MODEL_NAME, SBERT_BACKEND
+
+# CPU inference backends for the SBERT model:
+#   fp32 - eager PyTorch, the reference
+#   int8 - Linear layers dynamically quantized to int8 (weights int8, activations quantized per batch)
+#   bf16 - weights and activations in bfloat16 (fast on CPUs with AVX512-BF16 / AMX)
+#   onnx - exported graph run by ONNX Runtime (needs `sentence-transformers[onnx]`)
+BACKENDS = ("fp32", "int8", "bf16", "onnx")
+
+
+class SBERTBackend:
+    """
+    A loaded SBERT model plus the backend it runs on.
+    `encode` always returns float32 tensors (or, like
+    SentenceTransformer.encode, an ndarray with convert_to_tensor=False), so
+    scores, caches and the registry never see backend-specific types.
+    """
+
+    def __init__(self, model: SentenceTransformer, backend: str, model_name: str):
+        self.model = model
+        self.backend = backend
+        self.model_name = model_name
+
+    @property
+    def model_id(self) -> str:
+        """Model + backend: embeddings of different backends are never mixed in caches."""
+        if self.backend == "fp32":
+            return self.model_name
+        return f"{self.model_name}:{self.backend}"
+
+    def encode(self, sentences: List[str], convert_to_tensor: bool = True
+               ) -> Union[torch.Tensor, np.ndarray]:
+        with torch.inference_mode():
+            embeddings = self.model.encode(sentences, convert_to_tensor=True)
+        embeddings = embeddings.float()
+        return embeddings if convert_to_tensor else embeddings.cpu().numpy()
+
+
+def load_sbert(backend: str = SBERT_BACKEND,
+               model_name: str = SBERT_MODEL_NAME) -> SBERTBackend:
+    """Loads the SBERT model on CPU with the requested inference backend."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown SBERT backend '{backend}', expected one of {BACKENDS}.")
+
+    if backend == "onnx":
+        try:
+            model = SentenceTransformer(model_name, device="cpu", backend="onnx")
+        except ImportError as e:
+            raise RuntimeError(
+                "The 'onnx' backend needs ONNX Runtime: "
+                "pip install 'sentence-transformers[onnx]'") from e
+        return SBERTBackend(model, backend, model_name)
+
+    model = SentenceTransformer(model_name, device="cpu")
+    model.eval()
+    if backend == "int8":
+        model = quantize_linear_layers(model)
+    elif backend == "bf16":
+        model = model.to(torch.bfloat16)
+    return SBERTBackend(model, backend, model_name)
+
+
+def quantize_linear_layers(model: torch.nn.Module) -> torch.nn.Module:
+    """Dynamic int8 quantization of every nn.Linear (the bulk of BERT compute)."""
+    with warnings.catch_warnings():
+        # torch.ao.quantization is deprecated in favour of torchao, which is not a dependency
+        warnings.simplefilter("ignore", DeprecationWarning)
+        warnings.simplefilter("ignore", UserWarning)
+        return torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def parity_report(candidate: SBERTBackend, reference: SBERTBackend,
+                  job_chunks: List[str], cv_chunks: List[str]) -> Dict[str, float]:
+    """
+    Compares a backend against the fp32 reference on a corpus of job and CV
+    chunks: embedding agreement, job x CV similarity deltas (the scores the
+    engine aggregates) and how often the best CV match per job chunk changes.
+    """
+    def normalized(backend: SBERTBackend, texts: List[str]) -> torch.Tensor:
+        return F.normalize(backend.encode(texts, convert_to_tensor=True).cpu(), dim=1)
+
+    ref_job, ref_cv = normalized(reference, job_chunks), normalized(reference, cv_chunks)
+    cand_job, cand_cv = normalized(candidate, job_chunks), normalized(candidate, cv_chunks)
+
+    embedding_cos = torch.cat([(ref_job * cand_job).sum(dim=1),
+                               (ref_cv * cand_cv).sum(dim=1)])
+    ref_sim = ref_job @ ref_cv.T
+    cand_sim = cand_job @ cand_cv.T
+    delta = (cand_sim - ref_sim).abs()
+    best_match_agreement = (ref_sim.argmax(dim=1) == cand_sim.argmax(dim=1)).float().mean()
+    best_score_delta = (cand_sim.max(dim=1).values - ref_sim.max(dim=1).values).abs()
+
+    return {
+        "min_embedding_cosine": round(float(embedding_cos.min()), 5),
+        "mean_embedding_cosine": round(float(embedding_cos.mean()), 5),
+        "max_score_delta": round(float(delta.max()), 5),
+        "mean_score_delta": round(float(delta.mean()), 5),
+        "max_best_match_score_delta": round(float(best_score_delta.max()), 5),
+        "best_match_agreement": round(float(best_match_agreement), 4),
+    }
+
+
+def measure_throughput(backend: SBERTBackend, texts: List[str],
+                       runs: int = 3) -> float:
+    """Encoded texts per second (best of `runs`, after one warmup pass)."""
+    backend.encode(texts[:8])
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        backend.encode(texts)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import torch
+
+from src.config import JOB_REGISTRY_PATH, JOB_REGISTRY_TTL_DAYS
+from src.document import PreparedJob
+
+
+class JobNotFoundError(KeyError):
+    """Raised when a job_id is unknown, expired or was deleted."""
+
+
+class JobRegistry:
+    """
+    Durable store of registered job offers and their precomputed artifacts
+    (parsed sections, chunks, chunk embeddings, skills, lemmatized text).
+
+    Backed by a local SQLite file, so registrations survive restarts and are
+    shared by all worker processes. Every job has an expiry time; expired
+    rows are treated as missing and purged on registration and, at most every
+    `evict_interval` seconds, on lookups and stats.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS jobs (
+            job_id          TEXT PRIMARY KEY,
+            model_name      TEXT NOT NULL,
+            created_at      REAL NOT NULL,
+            expires_at      REAL NOT NULL,
+            sections        TEXT NOT NULL,
+            chunks          TEXT NOT NULL,
+            embeddings      BLOB,
+            dim             INTEGER NOT NULL,
+            skills          TEXT NOT NULL,
+            lemmatized_text TEXT NOT NULL
+        )
+    """
+
+    def __init__(self, model_name: str, path: str = JOB_REGISTRY_PATH,
+                 ttl_days: float = JOB_REGISTRY_TTL_DAYS, evict_interval: float = 60.0):
+        self.model_name = model_name
+        self.path = path
+        self.default_ttl = ttl_days * 86400
+        self.evict_interval = evict_interval
+        self._last_eviction = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by the executor threads, guarded by the lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(self._SCHEMA)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_expires_at ON jobs (expires_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_job_id(job_description: str) -> str:
+        """Content-derived id: registering the same text twice yields the same job."""
+        return hashlib.blake2b(job_description.encode("utf-8"), digest_size=16).hexdigest()
+
+    def register(self, job_id: str, sections: Dict[str, str], job: PreparedJob,
+                 ttl_days: Optional[float] = None) -> Dict[str, Any]:
+        """Stores (or refreshes) a job and returns its metadata."""
+        now = time.time()
+        ttl = self.default_ttl if ttl_days is None else ttl_days * 86400
+        embeddings = job.embeddings
+        blob, dim = None, 0
+        if embeddings is not None:
+            array = embeddings.detach().to("cpu", torch.float32).numpy()
+            blob, dim = array.tobytes(), array.shape[1]
+
+        with self._lock:
+            self._evict(now)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, self.model_name, now, now + ttl, json.dumps(sections),
+                 json.dumps(job.chunks), blob, dim, json.dumps(job.skills),
+                 job.lemmatized_text or ""))
+            self._conn.commit()
+
+        return self._info(job_id, now, now + ttl, sections, job.chunks, job.skills)
+
+    def get(self, job_id: str) -> PreparedJob:
+        """Restores the prepared job; raises JobNotFoundError if unavailable."""
+        self._maybe_evict()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT chunks, embeddings, dim, skills, lemmatized_text FROM jobs "
+                "WHERE job_id = ? AND model_name = ? AND expires_at > ?",
+                (job_id, self.model_name, time.time())).fetchone()
+            if row is None:
+                self.misses += 1
+                raise JobNotFoundError(job_id)
+            self.hits += 1
+
+        chunks_json, blob, dim, skills_json, lemmatized_text = row
+        embeddings = None
+        if blob is not None:
+            embeddings = torch.from_numpy(
+                np.frombuffer(blob, dtype=np.float32).reshape(-1, dim).copy())
+        return PreparedJob(json.loads(chunks_json), embeddings, json.loads(skills_json),
+                           lemmatized_text=lemmatized_text)
+
+    def info(self, job_id: str) -> Dict[str, Any]:
+        """Metadata of a live job; raises JobNotFoundError if unavailable."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at, expires_at, sections, chunks, skills FROM jobs "
+                "WHERE job_id = ? AND model_name = ? AND expires_at > ?",
+                (job_id, self.model_name, time.time())).fetchone()
+        if row is None:
+            raise JobNotFoundError(job_id)
+        created_at, expires_at, sections_json, chunks_json, skills_json = row
+        return self._info(job_id, created_at, expires_at, json.loads(sections_json),
+                          json.loads(chunks_json), json.loads(skills_json))
+
+    def delete(self, job_id: str) -> bool:
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM jobs WHERE job_id = ?", (job_id,)).rowcount
+            self._conn.commit()
+        return bool(deleted)
+
+    def evict_expired(self) -> int:
+        """Removes expired postings; returns how many were dropped."""
+        with self._lock:
+            removed = self._evict(time.time())
+            self._conn.commit()
+        return removed
+
+    def _maybe_evict(self) -> None:
+        """Purges expired postings if the last purge is evict_interval old."""
+        if time.time() - self._last_eviction >= self.evict_interval:
+            self.evict_expired()
+
+    def _evict(self, now: float) -> int:
+        """Deletes expired rows (caller holds the lock and commits)."""
+        removed = self._conn.execute(
+            "DELETE FROM jobs WHERE expires_at <= ?", (now,)).rowcount
+        self.evictions += removed
+        self._last_eviction = now
+        return removed
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE expires_at > ?", (time.time(),)).fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and live jobs (a read: expired rows are left to lookups)."""
+        lookups = self.hits + self.misses
+        return {
+            "jobs": len(self),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _info(job_id: str, created_at: float, expires_at: float, sections: Dict[str, str],
+              chunks: List[str], skills: List[str]) -> Dict[str, Any]:
+        return {
+            "job_id": job_id,
+            "created_at": created_at,
+            "expires_at": expires_at,
+            "sections": sections,
+            "chunks": len(chunks),
+            "skills": skills,
+        }
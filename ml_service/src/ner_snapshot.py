@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import spacy
+from spacy.language import Language
+
+from src.config import (SPACY_MODEL_NAME, SKILL_MATCHER_BACKEND, NER_SKILLS_DATA_PATH,
+                        NER_SNAPSHOT_PATH)
+from src.document import add_newline_boundaries
+from src.processors.ner import NERProcessor
+
+# Bumped whenever the layout or the NERProcessor state changes
+SNAPSHOT_FORMAT = 2
+
+# Snapshot layout:
+#   meta.json      - format, versions and the fingerprint of the skill sources
+#   pipeline/      - nlp.to_disk: tokenizer special cases, vocab, entity_ruler ('ruler')
+#   ner_state.pkl  - NERProcessor.export_state: canonical maps, phrase table ('phrase'),
+#                    skill index ('trie')
+
+
+class SnapshotMismatchError(ValueError):
+    """The snapshot was built for another format, backend, model or skill data."""
+
+
+def load_base_pipeline(model_name: str = SPACY_MODEL_NAME) -> Language:
+    """The spaCy pipeline the engine runs, before any skill patterns are added."""
+    try:
+        # Explicitly disable 'ner': skills come from the NERProcessor.
+        # Tagger/parser are needed for Action Verbs & Chunking.
+        nlp = spacy.load(model_name, disable=["ner"])
+    except OSError:
+        print(f"❌ Spacy model '{model_name}' not found. Downloading...")
+        from spacy.cli import download
+        download(model_name)
+        nlp = spacy.load(model_name, disable=["ner"])
+    # Line breaks always end a sentence (chunking works line by line)
+    add_newline_boundaries(nlp)
+    return nlp
+
+
+def skills_fingerprint() -> str:
+    """Content hash of the skill sources (raw CSVs, else the processed patterns)."""
+    sources = [Path(NER_SKILLS_DATA_PATH[key]) for key in ('raw_eu', 'raw_add')]
+    sources = [path for path in sources if path.exists()]
+    if not sources and Path(NER_SKILLS_DATA_PATH['processed']).exists():
+        sources = [Path(NER_SKILLS_DATA_PATH['processed'])]
+
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sources:
+        digest.update(path.name.encode("utf-8"))
+        with path.open('rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def pipeline_name(nlp: Language) -> str:
+    return f"{nlp.meta.get('lang', '')}_{nlp.meta.get('name', '')}"
+
+
+def pipeline_version(nlp: Language, backend: str = SKILL_MATCHER_BACKEND) -> str:
+    """Identifies the annotations `nlp` produces (model, spaCy, components, skill matcher)."""
+    return (f"{pipeline_name(nlp)}-{nlp.meta.get('version')}/spacy-{spacy.__version__}/"
+            f"{'+'.join(nlp.pipe_names)}/{backend}")
+
+
+def build_snapshot(nlp: Language, path: str = NER_SNAPSHOT_PATH,
+                   backend: str = SKILL_MATCHER_BACKEND) -> Dict[str, Any]:
+    """
+    Configures `nlp` with the skill patterns (the slow part of a cold start)
+    and writes the result to `path`. The previous snapshot is replaced only
+    once the new one is complete.
+    """
+    start = time.perf_counter()
+    processor = NERProcessor(nlp, backend=backend)
+    state = processor.export_state()
+
+    target = Path(path)
+    staging = target.with_name(target.name + ".tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+
+    nlp.to_disk(staging / "pipeline")
+    with (staging / "ner_state.pkl").open('wb') as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    meta = {
+        "format": SNAPSHOT_FORMAT,
+        "backend": backend,
+        "spacy_version": spacy.__version__,
+        "spacy_model": pipeline_name(nlp),
+        "spacy_model_version": nlp.meta.get("version"),
+        "skills_fingerprint": skills_fingerprint(),
+        "skill_concepts": len(state["canonical"]),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "build_seconds": round(time.perf_counter() - start, 2),
+    }
+    (staging / "meta.json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(staging, target)
+    return meta
+
+
+def read_meta(path: str = NER_SNAPSHOT_PATH) -> Dict[str, Any]:
+    """Snapshot metadata; FileNotFoundError when there is no snapshot."""
+    return json.loads((Path(path) / "meta.json").read_text(encoding="utf-8"))
+
+
+def check_meta(meta: Dict[str, Any], backend: str = SKILL_MATCHER_BACKEND,
+               model_name: str = SPACY_MODEL_NAME) -> None:
+    """Raises SnapshotMismatchError if the snapshot does not fit this service."""
+    expected = {
+        "format": SNAPSHOT_FORMAT,
+        "backend": backend,
+        "spacy_version": spacy.__version__,
+        "spacy_model": model_name,
+        "skills_fingerprint": skills_fingerprint(),
+    }
+    # A model upgraded in place keeps its name: compare the installed package version
+    installed = spacy.util.get_package_version(model_name)
+    if installed is not None:
+        expected["spacy_model_version"] = installed
+    for key, value in expected.items():
+        if meta.get(key) != value:
+            raise SnapshotMismatchError(
+                f"snapshot {key} is {meta.get(key)!r}, expected {value!r}")
+
+
+def load_snapshot(path: str = NER_SNAPSHOT_PATH, backend: str = SKILL_MATCHER_BACKEND,
+                  model_name: str = SPACY_MODEL_NAME) -> Tuple[Language, NERProcessor]:
+    """
+    The configured pipeline and its NERProcessor, straight from disk.
+    Raises FileNotFoundError (no snapshot) or SnapshotMismatchError (stale).
+    """
+    check_meta(read_meta(path), backend, model_name)
+    nlp = spacy.load(Path(path) / "pipeline")
+    with (Path(path) / "ner_state.pkl").open('rb') as f:
+        state = pickle.load(f)
+    return nlp, NERProcessor(nlp, backend=backend, state=state)
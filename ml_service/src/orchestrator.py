@@ -1,16 +1,28 @@
-from typing import Dict, List
-
-import spacy
-from spacy.tokens import Doc
-from sentence_transformers import SentenceTransformer
-
-from src.config import SPACY_MODEL_NAME, SBERT_MODEL_NAME, STRONG_ROOTS
-from src.data_models import MatchRequest, MatchResponse
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import torch
+from spacy.tokens import Doc, Span
+
+from src.config import (SPACY_MODEL_NAME, SBERT_MODEL_NAME, SBERT_BACKEND, STRONG_ROOTS,
+                        SPACY_PIPE_BATCH_SIZE, SPACY_N_PROCESS, RANK_BATCH_SIZE,
+                        JOB_REGISTRY_PATH, NER_SNAPSHOT_PATH)
+from src.data_models import (MatchRequest, MatchResponse, MatchDetail, RankRequest,
+                             RankResponse, RankedCV, JobsMatchRequest, JobsMatchResponse,
+                             JobRegisterRequest, JobInfo)
 from src.parsers import CVParser, JobOfferParser
+from src.encoding import BatchingEncoder
+from src.inference_backends import load_sbert
+from src.caching import EmbeddingCache, ParsedDocCache
+from src.document import MatchDocument, CVDocument, PreparedJob
+from src.job_registry import JobRegistry
+from src.ner_snapshot import (load_base_pipeline, load_snapshot, read_meta, pipeline_version,
+                              SnapshotMismatchError)
+from src.utils import StageTimings, ComponentStatus
 
 # Import specialized processors
 from src.processors.ner import NERProcessor
-from src.processors.semantic import SemanticProcessor
+from src.processors.semantic import SemanticProcessor, CVChunks
 from src.processors.fallback_tfidf import FallbackProcessor
 
 
@@ -21,25 +33,41 @@ class HybridMatchEngine:
     between Parsers, Processors, and the final Scoring Logic.
     """
 
-    def __init__(self):
+    def __init__(self, components: Optional[ComponentStatus] = None):
+        """`components` receives the load status and time of every model."""
         print("🚀 Initializing Hybrid Match Engine...")
+        self.timings = StageTimings()
+        self.components = components or ComponentStatus()
 
         # 1. Load Shared Models
-        # Load Spacy once and pass it to all processors to save RAM
-        print(f"⏳ Loading Spacy ({SPACY_MODEL_NAME})...")
-        try:
-            # Explicitly disable 'ner' here because we will inject our own EntityRuler
-            # in the NERProcessor. Tagger/parser are needed for Action Verbs & Chunking.
-            self.nlp = spacy.load(SPACY_MODEL_NAME, disable=["ner"])
-        except OSError:
-            print(
-                f"❌ Spacy model '{SPACY_MODEL_NAME}' not found. Downloading...")
-            from spacy.cli import download
-            download(SPACY_MODEL_NAME)
-            self.nlp = spacy.load(SPACY_MODEL_NAME, disable=["ner"])
-
-        print(f"⏳ Loading SBERT ({SBERT_MODEL_NAME})...")
-        self.sbert = SentenceTransformer(SBERT_MODEL_NAME)
+        # Load Spacy once and pass it to all processors to save RAM.
+        # A prebuilt snapshot already holds the skill patterns and tokenizer
+        # special cases (scripts/build_ner_snapshot.py).
+        self.ner_processor: Optional[NERProcessor] = None
+        self.ner_snapshot: Optional[Dict[str, Any]] = None
+        with self.components.measure("spacy"):
+            if NER_SNAPSHOT_PATH:
+                try:
+                    self.nlp, self.ner_processor = load_snapshot(NER_SNAPSHOT_PATH)
+                    self.ner_snapshot = read_meta(NER_SNAPSHOT_PATH)
+                    print(f"⚡ Loaded NER snapshot from {NER_SNAPSHOT_PATH} "
+                          f"(built {self.ner_snapshot['created_at']}).")
+                except FileNotFoundError:
+                    print(f"ℹ️  No NER snapshot at {NER_SNAPSHOT_PATH}; "
+                          f"run scripts/build_ner_snapshot.py for faster startup.")
+                except SnapshotMismatchError as e:
+                    print(f"⚠️  Ignoring stale NER snapshot: {e}")
+            if self.ner_processor is None:
+                print(f"⏳ Loading Spacy ({SPACY_MODEL_NAME})...")
+                self.nlp = load_base_pipeline(SPACY_MODEL_NAME)
+
+        with self.components.measure("sbert"):
+            print(f"⏳ Loading SBERT ({SBERT_MODEL_NAME}, backend: {SBERT_BACKEND})...")
+            self.sbert = load_sbert(SBERT_BACKEND)
+            # All SBERT calls go through the batcher, so concurrent requests
+            # share forward passes instead of fighting over the same cores.
+            self.encoder = BatchingEncoder(self.sbert)
+            self.embedding_cache = EmbeddingCache(self.sbert.model_id)
 
         # 2. Initialize Parsers
         self.cv_parser = CVParser()
@@ -47,55 +75,313 @@ class HybridMatchEngine:
 
         # 3. Initialize Processors (Dependency Injection)
         print("⚙️  Configuring Processors...")
-        self.ner_processor = NERProcessor(self.nlp)
-        self.semantic_processor = SemanticProcessor(self.nlp, self.sbert)
+        with self.components.measure("ner"):
+            if self.ner_processor is None:
+                self.ner_processor = NERProcessor(self.nlp)
+        # Serialized parses of recently seen texts (resubmitted CVs, repeated job ads)
+        self.parsed_doc_cache = ParsedDocCache(
+            self.nlp.vocab, pipeline_version(self.nlp, self.ner_processor.backend))
+        self.semantic_processor = SemanticProcessor(
+            self.nlp, self.encoder, embedding_cache=self.embedding_cache)
         self.fallback_processor = FallbackProcessor(self.nlp)
 
+        # 4. Registered job offers (precomputed job-side artifacts)
+        with self.components.measure("job_registry"):
+            self.job_registry = JobRegistry(self.sbert.model_id, JOB_REGISTRY_PATH)
+
         print("✅ Engine Ready.")
 
+    def close(self) -> None:
+        """Releases background workers owned by the engine."""
+        self.encoder.close()
+        self.job_registry.close()
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Runtime counters of the engine components."""
+        return {
+            "sbert": {"backend": self.sbert.backend, "model_id": self.sbert.model_id},
+            "encoder": self.encoder.stats(),
+            "embedding_cache": self.embedding_cache.stats(),
+            "parsed_doc_cache": self.parsed_doc_cache.stats(),
+            "stages": self.timings.stats(),
+            "ner": self.ner_processor.stats(),
+            "job_registry": self.job_registry.stats(),
+            "ner_snapshot": self.ner_snapshot,
+        }
+
+    def register_job(self, request: JobRegisterRequest) -> JobInfo:
+        """
+        Parses and prepares a job offer once and stores the artifacts, so
+        later matches by job_id skip all job-side work.
+        """
+        with self.timings.measure("section_parsing"):
+            sections = self.job_parser.parse(request.job_description)
+        job_doc = self._parse_texts(
+            [self._job_signal_text(request.job_description, sections)])[0]
+        job = self._prepare_job(job_doc)
+        self._job_lemmas(job)
+
+        return JobInfo(**self.job_registry.register(
+            JobRegistry.make_job_id(request.job_description), sections, job,
+            ttl_days=request.expires_in_days))
+
+    def get_job(self, job_id: str) -> JobInfo:
+        return JobInfo(**self.job_registry.info(job_id))
+
+    def delete_job(self, job_id: str) -> bool:
+        return self.job_registry.delete(job_id)
+
     def calculate_match(self, request: MatchRequest) -> MatchResponse:
         """
         Main pipeline execution:
         Raw Text -> Parsed Sections -> AI Analysis -> Weighted Scoring -> Response
         """
-        # --- STEP 1: PARSING ---
-        cv_sections = self.cv_parser.parse(request.cv_text)
-        job_data = self.job_parser.parse(request.job_description)
+        return self.calculate_matches([request])[0]
 
-        # Prepare text representations
-        # CV: Join valuable sections for NER
-        cv_full_text = " ".join(
-            [txt for sec, txt in cv_sections.items()])
-
-        # Job: Use extracted "Signal" (Requirements + Responsibilities + Education + Uncategorized)
-        job_signal_text = " ".join(
-            [txt for sec, txt in job_data.items()])
-
-        if not job_signal_text:
-            # Fallback if parser found nothing (e.g. very unstructured text)
-            job_signal_text = request.job_description
+    def calculate_matches(self, requests: List[MatchRequest]) -> List[MatchResponse]:
+        """
+        Batch variant of calculate_match: the texts of ALL requests go through
+        spaCy in a single nlp.pipe call, then every request is scored.
+        """
+        # --- STEP 1: PARSING ---
+        # Every text goes through spaCy exactly once; all processors below
+        # read from this shared annotated document.
+        documents = self._build_documents(requests)
+
+        responses = []
+        for document, request in zip(documents, requests):
+            if request.job_id is not None:
+                # Registered job: no job-side work at all
+                job = self.job_registry.get(request.job_id)
+            else:
+                job = self._prepare_job(document.job_doc)
+            responses.append(self._score_cv(job, document.cv, request.alpha))
+        return responses
+
+    def iter_match_events(self, request: MatchRequest) -> Iterator[Dict[str, Any]]:
+        """
+        Progressive variant of calculate_match: yields one JSON-ready event per
+        completed stage (sections, keywords, action_verbs, semantic, final).
+        Cheap stages come first, SBERT encoding runs only in the semantic stage.
+        The final event holds exactly what /match returns.
+        """
+        split = self._split_request(request)
+        yield {"event": "sections", "data": {"cv_sections": list(split[1].keys())}}
+
+        document = self._parse_documents([split])[0]
+        if request.job_id is not None:
+            job = self.job_registry.get(request.job_id)
+        else:
+            job = self._prepare_job(document.job_doc, encode=False)
+
+        for stage, result in self._score_stages(job, document.cv, request.alpha):
+            if stage == "keywords":
+                keyword_score, common_keywords, missing_keywords = result
+                data = {"keyword_score": round(keyword_score, 4),
+                        "common_keywords": common_keywords,
+                        "missing_keywords": missing_keywords}
+            elif stage == "action_verbs":
+                data = {"action_verb_score": round(result, 4)}
+            elif stage == "semantic":
+                semantic_score, details, section_breakdown = result
+                data = {"semantic_score": round(semantic_score, 4),
+                        "section_scores": section_breakdown,
+                        "details": [detail.model_dump() for detail in details]}
+            else:
+                data = result.model_dump()
+            yield {"event": stage, "data": data}
+
+    def match_events(self, request: MatchRequest) -> List[Dict[str, Any]]:
+        """All events of iter_match_events at once (used across processes)."""
+        return list(self.iter_match_events(request))
+
+    def rank_cvs(self, request: RankRequest) -> RankResponse:
+        """
+        Ranks many CVs against one job offer.
+        The job side is parsed, chunked, encoded and NER-tagged ONCE. CVs are
+        processed in groups of RANK_BATCH_SIZE (one nlp.pipe call and one
+        encode per group). Every CV goes through the same _score_cv as /match.
+        """
+        job_doc = self._parse_texts([self._job_signal_text(request.job_description)])[0]
+        job = self._prepare_job(job_doc)
+
+        results: List[RankedCV] = []
+        for start in range(0, len(request.cv_texts), RANK_BATCH_SIZE):
+            cvs = self._build_cv_documents(request.cv_texts[start:start + RANK_BATCH_SIZE])
+            for offset, response in enumerate(self._score_cvs(job, cvs, request.alpha)):
+                results.append(RankedCV(cv_index=start + offset, **dict(response)))
+
+        # Stable sort: ties keep the input order
+        results.sort(key=lambda r: r.final_score, reverse=True)
+        if request.top_k:
+            results = results[:request.top_k]
+        if not request.include_details:
+            for result in results:
+                result.details = []
+
+        return RankResponse(total_cvs=len(request.cv_texts), results=results)
+
+    def match_jobs(self, request: JobsMatchRequest) -> JobsMatchResponse:
+        """
+        Matches one CV against many job offers.
+        All texts go through one nlp.pipe call; the CV side (sections, skills,
+        chunk embeddings, action verbs) is computed ONCE, the chunks of all
+        jobs are encoded in one call and compared to the CV in a single
+        similarity matrix.
+        """
+        timings = self.timings
+        job_texts = [self._job_signal_text(text) for text in request.job_descriptions]
+        with timings.measure("section_parsing"):
+            cv_sections = self.cv_parser.parse(request.cv_text)
+
+        docs = self._parse_texts(job_texts + list(cv_sections.values()))
+        cv = CVDocument.from_section_docs(
+            self.nlp, dict(zip(cv_sections.keys(), docs[len(job_texts):])))
+        jobs = self._prepare_jobs(docs[:len(job_texts)])
+
+        # CV side, once
+        with timings.measure("ner"):
+            cv_skills = self.ner_processor.extract_cv_skills(cv.sections)
+        with timings.measure("semantic"):
+            cv_chunks = self.semantic_processor.prepare_cv(cv.sections)
+            semantic_results = self.semantic_processor.score_jobs(
+                [(job.chunks, job.embeddings) for job in jobs], cv_chunks)
+        with timings.measure("action_verbs"):
+            action_verb_score = self._analyze_action_verbs(
+                cv.select(['experience', 'projects']))
+
+        results = []
+        for job, semantic_result in zip(jobs, semantic_results):
+            with timings.measure("ner"):
+                keyword_result = self.ner_processor.score_skills(job.skills, cv_skills)
+            keyword_result = self._apply_fallback(job, cv, keyword_result)
+            results.append(self._final_response(
+                request.alpha, keyword_result, semantic_result, action_verb_score))
+
+        return JobsMatchResponse(results=results)
+
+    def embed_cv(self, cv_text: str) -> Tuple[List[Dict[str, str]], np.ndarray]:
+        """
+        Chunk embeddings of a CV for the candidate search index, with the
+        section and text of every chunk.
+        """
+        cv = self._build_cv_documents([cv_text])[0]
+        with self.timings.measure("semantic"):
+            cv_chunks = self.semantic_processor.prepare_cv(cv.sections)
+            if not cv_chunks.texts:
+                return [], np.empty((0, 0), dtype=np.float32)
+            embeddings = self.semantic_processor.encode(cv_chunks.texts)
+
+        payloads = [{"section": section, "text": text}
+                    for section, text in zip(cv_chunks.sections, cv_chunks.texts)]
+        return payloads, embeddings.to("cpu", torch.float32).numpy()
+
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """L2-normalized embeddings of raw texts (e.g. search queries)."""
+        with self.timings.measure("semantic"):
+            return self.semantic_processor.encode(texts).to("cpu", torch.float32).numpy()
+
+    def _prepare_job(self, job_doc: Doc, encode: bool = True) -> PreparedJob:
+        """
+        Job-side work (skills, chunks, embeddings) that does not depend on the CV.
+        With encode=False the embeddings are left to the semantic stage.
+        """
+        if not encode:
+            with self.timings.measure("ner"):
+                skills = self.ner_processor.extract_job_skills(job_doc)
+            with self.timings.measure("semantic"):
+                chunks, _ = self.semantic_processor.prepare_job(job_doc, encode=False)
+            return PreparedJob(chunks, None, skills, job_doc=job_doc)
+        return self._prepare_jobs([job_doc])[0]
+
+    def _prepare_jobs(self, job_docs: List[Doc]) -> List[PreparedJob]:
+        """Job-side work for many jobs; all job chunks are encoded in one call."""
+        with self.timings.measure("ner"):
+            skills = [self.ner_processor.extract_job_skills(doc) for doc in job_docs]
+        with self.timings.measure("semantic"):
+            prepared = self.semantic_processor.prepare_jobs(job_docs)
+        return [PreparedJob(chunks, embeddings, job_skills, job_doc=doc)
+                for doc, job_skills, (chunks, embeddings) in zip(job_docs, skills, prepared)]
+
+    def _score_cvs(self, job: PreparedJob, cvs: List[CVDocument],
+                   alpha: float) -> List[MatchResponse]:
+        """
+        Scores many CVs against one prepared job.
+        The chunks of all CVs are encoded in a single call.
+        """
+        with self.timings.measure("semantic"):
+            cv_chunks = [self.semantic_processor.prepare_cv(cv.sections) for cv in cvs]
+            all_texts = [text for chunks in cv_chunks for text in chunks.texts]
+            embeddings = (self.semantic_processor.encode(all_texts)
+                          if all_texts and job.chunks else None)
+
+        responses = []
+        offset = 0
+        for cv, chunks in zip(cvs, cv_chunks):
+            end = offset + len(chunks.texts)
+            cv_embeddings = embeddings[offset:end] if embeddings is not None else None
+            responses.append(self._score_cv(job, cv, alpha, chunks, cv_embeddings))
+            offset = end
+        return responses
+
+    def _score_cv(self, job: PreparedJob, cv: CVDocument, alpha: float,
+                  cv_chunks: Optional[CVChunks] = None,
+                  cv_embeddings: Optional[torch.Tensor] = None) -> MatchResponse:
+        """
+        STEPS 2-4 for one CV against a prepared job. CV chunks/embeddings may
+        be passed in when they were batch-encoded with other CVs.
+        """
+        for _, result in self._score_stages(job, cv, alpha, cv_chunks, cv_embeddings):
+            pass
+        return result  # The last stage is the final response
+
+    def _score_stages(self, job: PreparedJob, cv: CVDocument, alpha: float,
+                      cv_chunks: Optional[CVChunks] = None,
+                      cv_embeddings: Optional[torch.Tensor] = None
+                      ) -> Iterator[Tuple[str, Any]]:
+        """
+        STEPS 2-4 as a sequence of (stage, result) pairs, cheapest first:
+        keywords (NER + fallback), action verbs, semantic, final response.
+        /match runs it to the end; /match/stream forwards every stage.
+        """
+        timings = self.timings
 
         # --- STEP 2: PROCESSORS EXECUTION ---
 
-        # A. PRE-PROCESSING
-        job_doc = self.nlp(job_signal_text)
-        cv_sec_docs: Dict[str, Doc] = {sec: self.nlp(txt) for sec, txt in cv_sections.items()}
+        # A. NER & Gap Analysis (Keywords), with the STEP 3 fallback
+        with timings.measure("ner"):
+            keyword_result = self.ner_processor.analyze_skills(job.skills, cv.sections)
+        keyword_result = self._apply_fallback(job, cv, keyword_result)
+        yield "keywords", keyword_result
 
-        # B. NER & Gap Analysis (Keywords)
-        keyword_score, common_keywords, missing_keywords = self.ner_processor.analyze(
-            job_doc, cv_sec_docs
-        )
+        # C. Action Verbs (Style/Tone)
+        # Analyze only narrative sections (Experience, Projects)
+        with timings.measure("action_verbs"):
+            narrative_docs = cv.select(['experience', 'projects'])
+            action_verb_score = self._analyze_action_verbs(narrative_docs)
+        yield "action_verbs", action_verb_score
+
+        # B. Semantic Analysis (SBERT + Weighted Sections)
+        with timings.measure("semantic"):
+            if job.embeddings is None and job.chunks:
+                job.embeddings = self.semantic_processor.encode(job.chunks)
+            if cv_chunks is None:
+                cv_chunks = self.semantic_processor.prepare_cv(cv.sections)
+            semantic_result = self.semantic_processor.score(
+                job.chunks, job.embeddings, cv_chunks, cv_embeddings
+            )
+        yield "semantic", semantic_result
 
-        # C. Semantic Analysis (SBERT + Weighted Sections)
-        semantic_score, details, section_breakdown = self.semantic_processor.analyze(
-            job_doc, cv_sec_docs
-        )
+        yield "final", self._final_response(alpha, keyword_result,
+                                            semantic_result, action_verb_score)
 
-        # D. Action Verbs (Style/Tone)
-        # Analyze only narrative sections (Experience, Projects)
-        narrative_docs = [cv_sec_docs.get('experience'), cv_sec_docs.get('projects')]
-        narrative_docs = [d for d in narrative_docs if d is not None]
-        action_verb_score = self._analyze_action_verbs(narrative_docs)
+    def _apply_fallback(self, job: PreparedJob, cv: CVDocument,
+                        keyword_result: Tuple[float, List[str], List[str]]
+                        ) -> Tuple[float, List[str], List[str]]:
+        """
+        STEP 3: TF-IDF safety net on top of the NER keyword result.
+        """
+        keyword_score, common_keywords, missing_keywords = keyword_result
 
         # --- STEP 3: FALLBACK MECHANISM ---
         # If the main models failed to find ANY signal (e.g. language mismatch, empty intersection),
@@ -105,9 +391,10 @@ class HybridMatchEngine:
         # if True:
             # Run fallback only when necessary to save compute time,
             # OR run always if need to log it. Here we use it to boost score.
-            fallback_score, fallback_keywords = self.fallback_processor.analyze(
-                job_doc, self.nlp(cv_full_text)
-            )
+            with self.timings.measure("fallback"):
+                fallback_score, fallback_keywords = self.fallback_processor.analyze_lemmas(
+                    self._job_lemmas(job), self._cv_lemmas(cv)
+                )
             # Boost keywords score slightly using statistical similarity
             keyword_score = max(keyword_score, fallback_score)
 
@@ -115,12 +402,24 @@ class HybridMatchEngine:
             if not common_keywords and fallback_keywords:
                 common_keywords = fallback_keywords[:5]
 
+        return keyword_score, common_keywords, missing_keywords
+
+    def _final_response(self, alpha: float,
+                        keyword_result: Tuple[float, List[str], List[str]],
+                        semantic_result: Tuple[float, List[MatchDetail], Dict[str, float]],
+                        action_verb_score: float) -> MatchResponse:
+        """
+        STEP 4: final scoring from the processor results.
+        """
+        keyword_score, common_keywords, missing_keywords = keyword_result
+        semantic_score, details, section_breakdown = semantic_result
+
         # --- STEP 4: FINAL SCORING CALCULATION ---
 
         # 1. Base Score: Weighted average of Semantic (Context) and Keyword (Hard Skills)
         # Alpha determines the balance (default 0.7 = 70% Semantic)
-        base_score = (request.alpha * semantic_score) + \
-            ((1.0 - request.alpha) * keyword_score)
+        base_score = (alpha * semantic_score) + \
+            ((1.0 - alpha) * keyword_score)
 
         # 2. Style Bonus: Action Verbs
         # We allow a small bonus (max +5%) for good writing style, but we don't penalize heavily.
@@ -149,7 +448,105 @@ class HybridMatchEngine:
             details=details
         )
 
-    def _analyze_action_verbs(self, docs: List[Doc]) -> float:
+    def _job_lemmas(self, job: PreparedJob) -> str:
+        """Lemmatized job text for the TF-IDF fallback (computed on first use)."""
+        if job.lemmatized_text is None:
+            job.lemmatized_text = self.fallback_processor.lemmatize(job.job_doc)
+        return job.lemmatized_text
+
+    def _cv_lemmas(self, cv: CVDocument) -> str:
+        """Lemmatized CV text for the TF-IDF fallback (computed on first use)."""
+        if cv.lemmatized_text is None:
+            cv.lemmatized_text = self.fallback_processor.lemmatize(cv.doc)
+        return cv.lemmatized_text
+
+    def _job_signal_text(self, job_description: str,
+                         job_data: Optional[Dict[str, str]] = None) -> str:
+        """Requirements + Responsibilities + Education + Uncategorized."""
+        if job_data is None:
+            with self.timings.measure("section_parsing"):
+                job_data = self.job_parser.parse(job_description)
+
+        job_signal_text = " ".join(
+            [txt for sec, txt in job_data.items()])
+
+        if not job_signal_text:
+            # Fallback if parser found nothing (e.g. very unstructured text);
+            # normalized, so formatting variants still parse alike
+            job_signal_text = self.job_parser.normalize(job_description)
+        return job_signal_text
+
+    def _parse_texts(self, texts: List[str]) -> List[Doc]:
+        """
+        Parsed docs of the texts: cached parses are deserialized, the other
+        (distinct) texts are streamed through a single nlp.pipe call.
+        """
+        with self.timings.measure("spacy"):
+            docs = self.parsed_doc_cache.get_many(texts)
+            missing = list(dict.fromkeys(t for t, doc in zip(texts, docs) if doc is None))
+            if missing:
+                parsed = list(self.nlp.pipe(missing,
+                                            batch_size=SPACY_PIPE_BATCH_SIZE,
+                                            n_process=SPACY_N_PROCESS))
+                self.parsed_doc_cache.put_many(missing, parsed)
+                by_text = dict(zip(missing, parsed))
+                docs = [doc if doc is not None else by_text[text]
+                        for text, doc in zip(texts, docs)]
+            return docs
+
+    def _build_documents(self, requests: List[MatchRequest]) -> List[MatchDocument]:
+        """
+        Splits all inputs into sections and parses every text once.
+        The job signal and CV sections of all requests are streamed through a
+        single nlp.pipe call instead of one nlp() call per text.
+        """
+        return self._parse_documents([self._split_request(r) for r in requests])
+
+    def _split_request(self, request: MatchRequest) -> Tuple[Optional[str], Dict[str, str]]:
+        """
+        Section parsing of one request: the job signal text (None for a
+        registered job) and the CV sections.
+        """
+        job_signal_text = None
+        if request.job_id is None:
+            job_signal_text = self._job_signal_text(request.job_description)
+        with self.timings.measure("section_parsing"):
+            cv_sections = self.cv_parser.parse(request.cv_text)
+        return job_signal_text, cv_sections
+
+    def _parse_documents(self, splits: List[Tuple[Optional[str], Dict[str, str]]]
+                         ) -> List[MatchDocument]:
+        """Runs the texts of already split requests through one nlp.pipe call."""
+        texts: List[str] = []
+        for job_signal_text, cv_sections in splits:
+            if job_signal_text is not None:
+                texts.append(job_signal_text)
+            texts.extend(cv_sections.values())
+
+        docs = iter(self._parse_texts(texts))
+
+        documents = []
+        for job_signal_text, cv_sections in splits:
+            job_doc = next(docs) if job_signal_text is not None else None
+            cv_sec_docs: Dict[str, Doc] = {sec: next(docs) for sec in cv_sections}
+            documents.append(MatchDocument.from_docs(self.nlp, job_doc, cv_sec_docs))
+
+        return documents
+
+    def _build_cv_documents(self, cv_texts: List[str]) -> List[CVDocument]:
+        """Parses the sections of many CVs with a single nlp.pipe call."""
+        with self.timings.measure("section_parsing"):
+            all_sections = [self.cv_parser.parse(text) for text in cv_texts]
+
+        docs = iter(self._parse_texts(
+            [txt for sections in all_sections for txt in sections.values()]))
+
+        return [
+            CVDocument.from_section_docs(self.nlp, {sec: next(docs) for sec in sections})
+            for sections in all_sections
+        ]
+
+    def _analyze_action_verbs(self, docs: List[Union[Doc, Span]]) -> float:
         """
         Calculates the ratio of 'strong action verbs' to total verbs.
         Uses the shared NLP pipeline (tagger).
@@ -21,6 +21,18 @@ class BaseParser:
         # Regex to detect bullet points AND numbered lists
         self.bullet_cleaner = re.compile(r'^\s*(?:[-*•‣➤➔►◆▫▪]|\d+\.)\s+')
 
+    def normalize(self, text: str) -> str:
+        """
+        Text with its lines stripped, empty lines dropped and bullets as '- '
+        (the backend derives its cache keys from the same form).
+        """
+        lines = []
+        for line in text.split('\n'):
+            line = line.strip()
+            if line:
+                lines.append(self.bullet_cleaner.sub('- ', line, count=1))
+        return '\n'.join(lines)
+
     def _parse_core(self, text: str) -> Dict[str, List[str]]:
         """
         Core parsing loop. Returns a dictionary of lists (buffers).
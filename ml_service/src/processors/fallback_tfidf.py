@@ -1,10 +1,10 @@
-from typing import Tuple, List, Optional
+from typing import Tuple, List, Optional, Union
 
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import spacy
-from spacy.tokens import Doc
+from spacy.tokens import Doc, Span
 
 
 class FallbackProcessor:
@@ -29,9 +29,13 @@ class FallbackProcessor:
         """
         # 1. Preprocessing (Lemmatization)
         # We process the FULL text to catch everything
-        clean_job = self._lemmatize(job_doc)
-        clean_cv = self._lemmatize(cv_doc)
+        return self.analyze_lemmas(self.lemmatize(job_doc), self.lemmatize(cv_doc))
 
+    def analyze_lemmas(self, clean_job: str, clean_cv: str) -> Tuple[float, List[str]]:
+        """
+        Same as `analyze`, for texts that were already lemmatized
+        (e.g. a job prepared once and matched against many CVs).
+        """
         if not clean_job or not clean_cv:
             return 0.0, []
 
@@ -74,7 +78,7 @@ class FallbackProcessor:
             # Handle empty vocabulary cases (e.g., text contained only stop words)
             return 0.0, []
 
-    def _lemmatize(self, doc: Doc) -> str:
+    def lemmatize(self, doc: Union[Doc, Span]) -> str:
         """
         Helper: Cleans text and converts words to base form.
         Uses the injected Spacy model.
@@ -1,25 +1,84 @@
 import csv
 from pathlib import Path
 import pickle
-from typing import List, Set, Dict, Tuple
+from typing import Any, List, Set, Dict, Tuple, Union, Optional
 
 from spacy.language import Language
-from spacy.tokens import Doc
+from spacy.matcher import PhraseMatcher
+from spacy.strings import hash_string
+from spacy.tokens import Doc, Span
+from spacy.attrs import LOWER, SPACY
 from spacy.symbols import ORTH
+from spacy.util import filter_spans
 
-from src.config import SECTION_WEIGHTS, NER_SKILLS_DATA_PATH
+from src.config import SECTION_WEIGHTS, NER_SKILLS_DATA_PATH, SKILL_MATCHER_BACKEND
+from src.processors.skill_index import SkillIndex
+
+SKILL_MATCHER_BACKENDS = ("phrase", "trie", "ruler")
 
 
 class NERProcessor:
     """
     Processor responsible for Named Entity Recognition and Gap Analysis.
+
+    Skill matching backends:
+      'phrase' - PhraseMatcher over lowercase token text, called only on the
+                 docs whose skills are extracted (job signal, CV sections)
+      'trie'   - SkillIndex, an Aho-Corasick automaton over the same phrases
+                 in compact arrays (one pass over the doc with hashed
+                 transitions: linear in the doc, independent of the
+                 taxonomy size), also called only where needed
+      'ruler'  - EntityRuler pipeline component, runs on every parsed doc
+
+    `state` (from `export_state`) restores a processor from a snapshot
+    without loading the patterns again (see src/ner_snapshot.py).
     """
 
-    def __init__(self, nlp: Language):
+    def __init__(self, nlp: Language, backend: str = SKILL_MATCHER_BACKEND,
+                 state: Optional[Dict[str, Any]] = None):
         self.nlp = nlp
+        self.backend = backend
         self.uri_to_canonical: Dict[str, str] = {}
         self.label_to_canonical: Dict[str, str] = {}
-        self._setup_entity_ruler()
+        self.matcher: Optional[PhraseMatcher] = None
+        self.skill_index: Optional[SkillIndex] = None
+        if backend not in SKILL_MATCHER_BACKENDS:
+            raise ValueError(f"Unknown skill matcher backend '{backend}'.")
+        if state is not None:
+            self._restore_state(state)
+        elif backend == "ruler":
+            self._setup_entity_ruler()
+        else:
+            self._setup_phrase_matcher()
+
+    def export_state(self) -> Dict[str, Any]:
+        """
+        Everything the processor needs besides the pipeline itself: the
+        canonical maps and the phrase table ('phrase') or automaton ('trie').
+        Tokenizer special cases and the EntityRuler live in the pipeline.
+        """
+        state: Dict[str, Any] = {"backend": self.backend}
+        patterns = self._get_mvp_patterns()
+        state["canonical"] = self.uri_to_canonical
+        state["label_to_canonical"] = self.label_to_canonical
+        if self.backend == "phrase":
+            state["phrases"] = self._phrase_table(patterns)
+        elif self.backend == "trie":
+            state["skill_index"] = self.skill_index
+        return state
+
+    def _restore_state(self, state: Dict[str, Any]) -> None:
+        if state.get("backend") != self.backend:
+            raise ValueError(f"State built for the '{state.get('backend')}' backend, "
+                             f"not '{self.backend}'.")
+        self.uri_to_canonical = state["canonical"]
+        self.label_to_canonical = state["label_to_canonical"]
+        if self.backend == "phrase":
+            self.matcher = self._build_phrase_matcher(state["phrases"])
+        elif self.backend == "trie":
+            self.skill_index = state["skill_index"]
+        elif "entity_ruler" not in self.nlp.pipe_names:
+            raise ValueError("The 'ruler' backend needs a pipeline with its entity_ruler.")
 
     def _setup_entity_ruler(self):
         """
@@ -34,16 +93,77 @@ class NERProcessor:
         patterns = self._get_mvp_patterns()
         ruler.add_patterns(patterns)
 
-    def analyze(self, job_doc: Doc, cv_sec_docs: Dict[str, Doc]
+    def _setup_phrase_matcher(self):
+        """
+        Configures the PhraseMatcher (or SkillIndex) with the same patterns. It
+        is not a pipeline component, so docs parsed only for chunking never
+        pay for it.
+        """
+        if "entity_ruler" in self.nlp.pipe_names:
+            self.nlp.remove_pipe("entity_ruler")
+        phrases = self._phrase_table(self._get_mvp_patterns())
+        if self.backend == "trie":
+            self.skill_index = SkillIndex(phrases)
+        else:
+            self.matcher = self._build_phrase_matcher(phrases)
+
+    def stats(self) -> Dict[str, Any]:
+        """Skill matcher backend (and the size of the SkillIndex)."""
+        stats: Dict[str, Any] = {"backend": self.backend}
+        if self.skill_index is not None:
+            stats["skill_index"] = self.skill_index.stats()
+        return stats
+
+    @staticmethod
+    def _phrase_table(patterns: List[Dict]) -> Dict[str, List[Tuple[int, ...]]]:
+        """
+        One matcher key per concept URI (or label when there is no URI), with
+        every label of the concept as a phrase of LOWER hashes. Pattern tokens
+        are already lowercase, so hashing them equals token.lower on a Doc,
+        without building a Doc (and vocab entries) per label.
+        """
+        phrases: Dict[str, List[Tuple[int, ...]]] = {}
+        for pattern in patterns:
+            words = [token["LOWER"] for token in pattern["pattern"]]
+            if not words:
+                continue
+            key = pattern.get("id") or " ".join(words)
+            phrases.setdefault(key, []).append(tuple(hash_string(word) for word in words))
+        return phrases
+
+    def _build_phrase_matcher(self, phrases: Dict[str, List[Tuple[int, ...]]]) -> PhraseMatcher:
+        matcher = PhraseMatcher(self.nlp.vocab, attr="LOWER")
+        for key, keywords in phrases.items():
+            matcher.add(key, keywords)
+        return matcher
+
+    def analyze(self, job_doc: Doc, cv_sec_docs: Dict[str, Union[Doc, Span]]
                 ) -> Tuple[float, List[str], List[str]]:
         """
         Performs the Gap Analysis and calculates the Weighted Keyword Score.
         """
-        job_skills = self._extract_skills(job_doc)
+        return self.analyze_skills(self.extract_job_skills(job_doc), cv_sec_docs)
+
+    def extract_job_skills(self, job_doc: Doc) -> List[str]:
+        """Job side of the Gap Analysis (independent of the CV)."""
+        return self._extract_skills(job_doc)
 
+    def analyze_skills(self, job_skills: List[str],
+                       cv_sec_docs: Dict[str, Union[Doc, Span]]
+                       ) -> Tuple[float, List[str], List[str]]:
+        """
+        Gap Analysis against already extracted job skills.
+        """
         if not job_skills:
             return 0.0, [], []
+        return self.score_skills(job_skills, self.extract_cv_skills(cv_sec_docs))
 
+    def extract_cv_skills(self, cv_sec_docs: Dict[str, Union[Doc, Span]]
+                          ) -> Dict[str, float]:
+        """
+        CV side of the Gap Analysis: every skill with the highest weight of
+        the sections it appears in. Independent of the job offer.
+        """
         cv_skill_weights: Dict[str, float] = {}
 
         for section, doc in cv_sec_docs.items():
@@ -56,6 +176,16 @@ class NERProcessor:
                 current_max = cv_skill_weights.get(skill, 0.0)
                 cv_skill_weights[skill] = max(current_max, section_weight)
 
+        return cv_skill_weights
+
+    def score_skills(self, job_skills: List[str], cv_skill_weights: Dict[str, float]
+                     ) -> Tuple[float, List[str], List[str]]:
+        """
+        Weighted Keyword Score of extracted job skills against extracted CV skills.
+        """
+        if not job_skills:
+            return 0.0, [], []
+
         common_keywords = []
         missing_keywords = []
         total_score = 0.0
@@ -70,7 +200,7 @@ class NERProcessor:
         final_score = total_score / len(job_skills)
         return round(final_score, 4), common_keywords, missing_keywords
 
-    def _extract_skills(self, doc: Doc) -> List[str]:
+    def _extract_skills(self, doc: Union[Doc, Span]) -> List[str]:
         """
         Returns unique SKILL entities (lowercase).
         """
@@ -81,11 +211,7 @@ class NERProcessor:
         uri_to_canonical = self.uri_to_canonical
         label_to_canonical = self.label_to_canonical
 
-        for ent in doc.ents:
-            if ent.label_ != "SKILL":
-                continue
-            lower_text = ent.text.lower()
-            skill_id = ent.ent_id_ or lower_text
+        for lower_text, skill_id in self._skill_matches(doc):
             canonical = (
                 uri_to_canonical.get(skill_id)
                 or label_to_canonical.get(lower_text)
@@ -95,6 +221,33 @@ class NERProcessor:
 
         return sorted(skills)
 
+    def _skill_matches(self, doc: Union[Doc, Span]) -> List[Tuple[str, str]]:
+        """
+        (lowercase text, concept id) of every skill mention. Overlapping
+        phrase matches are resolved like the EntityRuler does: longest first.
+        """
+        if self.skill_index is not None:
+            # One array read (no Token objects); match texts are rebuilt
+            # from the lowercase strings and trailing whitespace flags
+            attrs = doc.to_array([LOWER, SPACY])
+            strings = self.nlp.vocab.strings
+            lower, spaces = attrs[:, 0], attrs[:, 1].tolist()
+            return [("".join(strings[int(lower[i])] + " " * spaces[i]
+                             for i in range(start, end)).rstrip(), key)
+                    for start, end, key in SkillIndex.longest(self.skill_index.find(lower))]
+
+        if self.matcher is not None:
+            spans = filter_spans(self.matcher(doc, as_spans=True))
+            return [(span.text.lower(), span.label_) for span in spans]
+
+        matches = []
+        for ent in doc.ents:
+            if ent.label_ != "SKILL":
+                continue
+            lower_text = ent.text.lower()
+            matches.append((lower_text, ent.ent_id_ or lower_text))
+        return matches
+
     def _get_mvp_patterns(self) -> List[Dict]:
         """
         Load patterns from processed file or create from raw CSVs.
@@ -1,12 +1,17 @@
-from typing import List, Dict, Tuple, Any
+from bisect import bisect_right
+from typing import List, Dict, Tuple, Union, Optional
 
 from spacy.language import Language
-from spacy.tokens import Doc
-from sentence_transformers import SentenceTransformer, util
+from spacy.tokens import Doc, Span
+from sentence_transformers import SentenceTransformer
 import torch
+import torch.nn.functional as F
 
 from src.config import SECTION_WEIGHTS
 from src.data_models import MatchDetail
+from src.encoding import BatchingEncoder
+from src.inference_backends import SBERTBackend
+from src.caching import EmbeddingCache
 
 NOISE_PHRASES = {
     'nice to have', 'good to have', 'optional', 'benefits', 'what we offer'
@@ -14,6 +19,22 @@ NOISE_PHRASES = {
 TRANS_TABLE = str.maketrans('', '', '():')
 
 
+class CVChunks:
+    """
+    CV side of the semantic analysis: flattened chunks with their section,
+    section weight and section index (tensors for vectorized aggregation).
+    """
+    __slots__ = ("texts", "sections", "weights", "section_ids", "section_names")
+
+    def __init__(self, texts: List[str], sections: List[str], weights: torch.Tensor,
+                 section_ids: torch.Tensor, section_names: List[str]):
+        self.texts = texts
+        self.sections = sections
+        self.weights = weights
+        self.section_ids = section_ids
+        self.section_names = section_names
+
+
 class SemanticProcessor:
     """
     Processor responsible for Contextual Semantic Matching using SBERT.
@@ -21,202 +42,315 @@ class SemanticProcessor:
     via efficient matrix operations.
     """
 
-    def __init__(self, nlp: Language, sbert_model: SentenceTransformer):
+    def __init__(self, nlp: Language,
+                 sbert_model: Union[SentenceTransformer, SBERTBackend, BatchingEncoder],
+                 embedding_cache: Optional[EmbeddingCache] = None):
         """
         Initializes the processor with pre-loaded models injected from the Orchestrator.
+        `sbert_model` may be the raw model, an inference backend or the
+        cross-request BatchingEncoder.
         """
         self.nlp = nlp
         self.model = sbert_model
+        self.embedding_cache = embedding_cache
 
-    def analyze(self, job_doc: Doc, cv_sec_docs: Dict[str, Doc]
+    def analyze(self, job_doc: Doc, cv_sec_docs: Dict[str, Union[Doc, Span]]
                 ) -> Tuple[float, List[MatchDetail], Dict[str, float]]:
         """
         Main entry point for semantic analysis.
         Orchestrates chunking, encoding, matrix calculation, and statistics.
         """
-
         # 1. Prepare Job Data (Signal)
-        job_chunks = self._chunk_text(job_doc)
-        if not job_chunks:
-            return 0.0, [], {}
-
-        job_embeddings = self.model.encode(job_chunks, convert_to_tensor=True)
+        job_chunks, job_embeddings = self.prepare_job(job_doc)
 
         # 2. Prepare CV Data (flattened chunks with metadata)
-        cv_chunks_data, cv_weights = self._prepare_cv_data(cv_sec_docs)
+        cv_chunks = self.prepare_cv(cv_sec_docs)
+
+        # 3. Matrix calculation and aggregation
+        return self.score(job_chunks, job_embeddings, cv_chunks)
+
+    def prepare_job(self, job_doc: Doc, encode: bool = True
+                    ) -> Tuple[List[str], Optional[torch.Tensor]]:
+        """
+        Job side of the analysis: chunks and their embeddings.
+        Independent of the CV, so it can be computed once and reused.
+        With encode=False only the chunks are returned (embeddings None).
+        """
+        job_chunks = self._chunk_text(job_doc)
+        if not job_chunks or not encode:
+            return job_chunks, None
+        return job_chunks, self.encode(job_chunks)
 
-        if not cv_chunks_data:
+    def prepare_jobs(self, job_docs: List[Doc]
+                     ) -> List[Tuple[List[str], Optional[torch.Tensor]]]:
+        """
+        Same as `prepare_job` for many job offers: the chunks of all jobs are
+        encoded in a single call.
+        """
+        chunk_lists = [self._chunk_text(doc) for doc in job_docs]
+        all_chunks = [chunk for chunks in chunk_lists for chunk in chunks]
+        embeddings = self.encode(all_chunks) if all_chunks else None
+
+        prepared = []
+        offset = 0
+        for chunks in chunk_lists:
+            if not chunks:
+                prepared.append(([], None))
+                continue
+            prepared.append((chunks, embeddings[offset:offset + len(chunks)]))
+            offset += len(chunks)
+        return prepared
+
+    def score(self, job_chunks: List[str], job_embeddings: Optional[torch.Tensor],
+              cv_chunks: "CVChunks", cv_embeddings: Optional[torch.Tensor] = None
+              ) -> Tuple[float, List[MatchDetail], Dict[str, float]]:
+        """
+        Scores prepared job chunks against prepared CV chunks.
+        `cv_embeddings` can be passed in when they were batch-encoded together
+        with other CVs; otherwise they are encoded here.
+        """
+        if not job_chunks or not cv_chunks.texts:
             return 0.0, [], {}
 
-        cv_texts = [item["text"] for item in cv_chunks_data]
-        cv_embeddings = self.model.encode(cv_texts, convert_to_tensor=True)
+        if cv_embeddings is None:
+            cv_embeddings = self.encode(cv_chunks.texts)
 
-        # 3. Core Matrix Calculation (Vectorized)
-        details, total_weighted_score, raw_scores_map = self._compute_weighted_matches(
-            job_embeddings, cv_embeddings, job_chunks, cv_chunks_data, cv_weights
+        # Core Matrix Calculation (Vectorized)
+        details, total_weighted_score, section_breakdown = self._compute_weighted_matches(
+            job_embeddings, cv_embeddings, job_chunks, cv_chunks
         )
 
-        # 4. Final Aggregation
-        final_score = total_weighted_score / len(job_chunks)
-        # Clamp to keep semantic_score within [0,1]
+        return self._final_score(total_weighted_score, len(job_chunks)), details, section_breakdown
+
+    def score_jobs(self, jobs: List[Tuple[List[str], Optional[torch.Tensor]]],
+                   cv_chunks: "CVChunks", cv_embeddings: Optional[torch.Tensor] = None
+                   ) -> List[Tuple[float, List[MatchDetail], Dict[str, float]]]:
+        """
+        Scores many prepared jobs against one CV. The chunks of all jobs are
+        stacked into a single similarity matrix against the CV chunks, then
+        every job is aggregated from its own rows.
+        """
+        empty = (0.0, [], {})
+        if not cv_chunks.texts or not any(chunks for chunks, _ in jobs):
+            return [empty for _ in jobs]
+
+        if cv_embeddings is None:
+            cv_embeddings = self.encode(cv_chunks.texts)
+
+        # Shape: (sum of N_job over all jobs, M_cv)
+        similarity_matrix = torch.cat(
+            [emb for chunks, emb in jobs if chunks]) @ cv_embeddings.T
+
+        results = []
+        offset = 0
+        for chunks, _ in jobs:
+            if not chunks:
+                results.append(empty)
+                continue
+            rows = similarity_matrix[offset:offset + len(chunks)]
+            offset += len(chunks)
+            details, total_weighted_score, section_breakdown = self._aggregate_matches(
+                rows, chunks, cv_chunks)
+            results.append((self._final_score(total_weighted_score, len(chunks)),
+                            details, section_breakdown))
+        return results
+
+    @staticmethod
+    def _final_score(total_weighted_score: float, n_job_chunks: int) -> float:
+        """Average over job chunks, clamped to keep semantic_score within [0,1]."""
+        final_score = total_weighted_score / n_job_chunks
         final_score = max(0.0, min(final_score, 1.0))
-        section_breakdown = self._calculate_section_stats(raw_scores_map)
+        return round(final_score, 4)
+
+    def encode(self, texts: List[str]) -> torch.Tensor:
+        """
+        Encodes chunks into L2-normalized embeddings, sending only cache
+        misses to the model. Duplicated chunks within one call are encoded once.
+        Normalized rows turn cosine similarity into a plain matmul.
+        """
+        if self.embedding_cache is None:
+            return F.normalize(
+                self.model.encode(texts, convert_to_tensor=True), dim=1)
+
+        rows = self.embedding_cache.get_many(texts)
+        missing = list(dict.fromkeys(
+            t for t, row in zip(texts, rows) if row is None))
 
-        return round(final_score, 4), details, section_breakdown
+        if missing:
+            fresh = F.normalize(
+                self.model.encode(missing, convert_to_tensor=True), dim=1)
+            self.embedding_cache.put_many(missing, fresh)
+            fresh_rows = dict(zip(missing, fresh.to("cpu")))
+            rows = [fresh_rows[t] if row is None else row
+                    for t, row in zip(texts, rows)]
 
-    def _prepare_cv_data(self, cv_sec_docs: Dict[str, Doc]
-                         ) -> Tuple[List[Dict[str, Any]], Any]:
+        return torch.stack(rows)
+
+    def prepare_cv(self, cv_sec_docs: Dict[str, Union[Doc, Span]]) -> "CVChunks":
         """
-        Flattens CV sections into a list of chunks and a corresponding tensor of weights.
-        Returns:
-            (cv_chunks_data, weights_tensor)
+        Flattens CV sections into a list of chunks plus per-chunk tensors of
+        section weights and section indices (for vectorized aggregation).
         """
-        cv_chunks_data = []
+        texts = []
+        sections = []
         weights_list = []
+        section_ids = []
+        section_names: List[str] = []
 
         for section, doc in cv_sec_docs.items():
             if not doc or not doc.text.strip():
                 continue
 
             chunks = self._chunk_text(doc)
+            if not chunks:
+                continue
+
             weight = SECTION_WEIGHTS.get(section, 0.5)
+            section_id = len(section_names)
+            section_names.append(section)
 
             for c in chunks:
-                cv_chunks_data.append({
-                    "text": c,
-                    "section": section
-                })
+                texts.append(c)
+                sections.append(section)
                 weights_list.append(weight)
-
-        # Convert weights to a tensor for broadcasting later
-        # Shape: (1, M) where M is number of CV chunks
-        if weights_list:
-            weights_tensor = torch.tensor(weights_list)
-        else:
-            weights_tensor = torch.tensor([])
-
-        return cv_chunks_data, weights_tensor
+                section_ids.append(section_id)
+
+        # Shape: (M,) where M is number of CV chunks
+        return CVChunks(
+            texts=texts,
+            sections=sections,
+            weights=torch.tensor(weights_list, dtype=torch.float64),
+            section_ids=torch.tensor(section_ids, dtype=torch.long),
+            section_names=section_names,
+        )
 
     def _compute_weighted_matches(self,
-                                  job_emb,
-                                  cv_emb,
+                                  job_emb: torch.Tensor,
+                                  cv_emb: torch.Tensor,
                                   job_chunks: List[str],
-                                  cv_chunks_data: List[Dict],
-                                  cv_weights: torch.Tensor
+                                  cv_chunks: "CVChunks"
                                   ) -> Tuple[List[MatchDetail],
-                                             float, Dict[str, List[float]]]:
+                                             float, Dict[str, float]]:
         """
-        Performs cosine similarity and applies weights using matrix operations.
+        Cosine similarity, best-match selection, weighting and per-section
+        aggregation as whole-tensor operations. Tensors are converted to
+        Python objects in one bulk step at the end (no per-row syncs).
         """
-        # A. Calculate Raw Cosine Similarity
+        # A. Raw Cosine Similarity (embeddings are L2-normalized)
         # Shape: (N_job, M_cv)
-        similarity_matrix = util.cos_sim(job_emb, cv_emb)
-
-        # B. Apply Weights (Broadcasting)
-        # We multiply every column j by the weight of CV chunk j
-        # Ensure weights are on the same device
-        if job_emb.device != cv_weights.device:
-            cv_weights = cv_weights.to(job_emb.device)
-
-        # C. Extract Best Matches (choose by raw similarity, then apply weight)
-        details = []
-        total_weighted_score = 0.0
-
-        # Helper to collect stats per section
-        # Key: section_name, Value: list of raw scores chosen as best matches
-        raw_scores_map: Dict[str, List[float]] = {}
-
-        # Iterate over job requirements (Rows)
-        for i, job_req in enumerate(job_chunks):
-            # 1) Select the best raw semantic match (no weights) to avoid overweighting sections
-            best_idx = int(torch.argmax(similarity_matrix[i]))
-
-            # Extract raw score and weight for that chunk
-            raw_score = float(similarity_matrix[i][best_idx])
-            weight = float(cv_weights[best_idx]) if len(
-                cv_weights) > best_idx else 1.0
-
-            # Apply section weight after selecting the best semantic match
-            weighted_score = raw_score * weight
-
-            # Clip weighted score to [0.0, 1.0]
-            final_score = max(0.0, min(weighted_score, 1.0))
-
-            # Get metadata
-            best_match_data = cv_chunks_data[best_idx]
-            section = best_match_data["section"]
-
-            details.append(MatchDetail(
+        similarity_matrix = job_emb @ cv_emb.T
+        return self._aggregate_matches(similarity_matrix, job_chunks, cv_chunks)
+
+    def _aggregate_matches(self, similarity_matrix: torch.Tensor,
+                           job_chunks: List[str], cv_chunks: "CVChunks"
+                           ) -> Tuple[List[MatchDetail], float, Dict[str, float]]:
+        """Steps B-E of `_compute_weighted_matches` on a (N_job, M_cv) matrix."""
+        # B. Best raw semantic match per job chunk (no weights) to avoid
+        # overweighting sections. Shapes: (N_job,)
+        raw_scores, best_idx = similarity_matrix.max(dim=1)
+        raw_scores = raw_scores.to("cpu", torch.float64)
+        best_idx = best_idx.to("cpu")
+
+        # C. Apply section weight after selecting the match, clip to [0.0, 1.0]
+        final_scores = (raw_scores * cv_chunks.weights[best_idx]).clamp(0.0, 1.0)
+        total_weighted_score = float(final_scores.sum())
+
+        # D. Average raw similarity per section of the selected matches
+        best_sections = cv_chunks.section_ids[best_idx]
+        section_names = cv_chunks.section_names
+        n_sections = len(section_names)
+        section_sums = torch.zeros(n_sections, dtype=torch.float64).index_add_(
+            0, best_sections, raw_scores)
+        section_counts = torch.bincount(best_sections, minlength=n_sections)
+
+        # E. Bulk conversion to Python objects
+        raw_list = raw_scores.tolist()
+        final_list = final_scores.tolist()
+        idx_list = best_idx.tolist()
+        best_section_list = best_sections.tolist()
+
+        cv_texts = cv_chunks.texts
+        cv_sections = cv_chunks.sections
+        details = [
+            MatchDetail(
                 job_requirement=job_req,
-                best_cv_match=best_match_data["text"],
-                cv_section=section,
-                score=round(final_score, 4),
-                raw_semantic_score=round(raw_score, 4)
-            ))
-
-            total_weighted_score += final_score
-
-            # Collect stats
-            if section not in raw_scores_map:
-                raw_scores_map[section] = []
-            raw_scores_map[section].append(raw_score)
-
-        return details, total_weighted_score, raw_scores_map
-
-    def _calculate_section_stats(self, raw_scores_map: Dict[str, List[float]]
+                best_cv_match=cv_texts[idx],
+                cv_section=cv_sections[idx],
+                score=round(final, 4),
+                raw_semantic_score=round(raw, 4)
+            )
+            for job_req, idx, final, raw in zip(job_chunks, idx_list, final_list, raw_list)
+        ]
+
+        section_breakdown = self._calculate_section_stats(
+            section_names, best_section_list,
+            section_sums.tolist(), section_counts.tolist())
+
+        return details, total_weighted_score, section_breakdown
+
+    def _calculate_section_stats(self, section_names: List[str],
+                                 best_sections: List[int],
+                                 sums: List[float], counts: List[int]
                                  ) -> Dict[str, float]:
         """
-        Calculates average raw similarity per section based on selected matches.
+        Average raw similarity per section, ordered by first appearance
+        among the selected matches.
         """
         section_breakdown = {}
-        for section, scores in raw_scores_map.items():
-            if scores:
-                avg = sum(scores) / len(scores)
-                section_breakdown[section] = round(avg, 3)
-            else:
-                section_breakdown[section] = 0.0
+        for section_id in dict.fromkeys(best_sections):
+            avg = sums[section_id] / counts[section_id]
+            section_breakdown[section_names[section_id]] = round(avg, 3)
         return section_breakdown
 
-    def _chunk_text(self, doc: Doc) -> List[str]:
+    def _chunk_text(self, doc: Union[Doc, Span]) -> List[str]:
         """
-        Chunk text by newlines first, then refine with spaCy sentencizer per line.
+        Chunk text by newlines first, then refine with the sentences of the
+        shared parse. The pipeline forces a sentence start after every line
+        break, so no line is re-parsed here.
         This avoids collapsing header-ish lines and keeps real sentences.
         """
         chunks = []
         noise_phrases = NOISE_PHRASES
         trans_table = TRANS_TABLE
 
-        for line in doc.text.split('\n'):
+        text = doc.text
+        offset = doc.start_char if isinstance(doc, Span) else 0
+
+        # 1. Line-level header / metadata filters, indexed by line start offset
+        line_starts: List[int] = []
+        line_allowed: List[bool] = []
+        pos = 0
+        for line in text.split('\n'):
+            line_starts.append(pos)
+            pos += len(line) + 1
+
             line = line.strip()
-            if not line:
+            # drop empty lines and very short items like "Offer.", "AWS.", "B2B"
+            if not line or len(line.split()) < 4:
+                line_allowed.append(False)
+            elif line.endswith(':'):
+                line_allowed.append(False)
+            else:
+                line_allowed.append(True)
+
+        # 2. Sentences of the allowed lines (avoids long run-ons)
+        for sent in doc.sents:
+            raw_text = sent.text
+            sent_text = raw_text.strip()
+            if not sent_text:
                 continue
 
-            # Quick header / metadata filters
-            word_count = len(line.split())
-            if word_count < 4:  # drop very short items like "Offer.", "AWS.", "B2B"
+            first_char = sent.start_char - offset + (len(raw_text) - len(raw_text.lstrip()))
+            if not line_allowed[bisect_right(line_starts, first_char) - 1]:
                 continue
-            if line.endswith(':'):
+
+            # Re-run minimal length / noise checks on the sentence
+            if len(sent_text.split()) < 4:
+                continue
+            clean_text = sent_text.lower().translate(trans_table).strip()
+            if clean_text in noise_phrases:
                 continue
-            # if ':' in line:
-            #     before_colon = line.split(':')[0]
-            #     # allow language lines like "Languages: Polish, English (C1)"
-            #     lang_hint = 'language' in before_colon.lower() or 'languages' in before_colon.lower()
-            #     if len(before_colon.split()) <= 3 and not lang_hint:
-            #         continue
-
-            # Split the remaining line into sentences using spaCy to avoid long run-ons
-            for sent in self.nlp(line).sents:
-                sent_text = sent.text.strip()
-                if not sent_text:
-                    continue
-
-                # Re-run minimal length / noise checks on the sentence
-                if len(sent_text.split()) < 4:
-                    continue
-                clean_text = sent_text.lower().translate(trans_table).strip()
-                if clean_text in noise_phrases:
-                    continue
-
-                chunks.append(sent_text)
+
+            chunks.append(sent_text)
 
         return chunks
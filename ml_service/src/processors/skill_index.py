@@ -0,0 +1,233 @@
+import sys
+from array import array
+from collections import deque
+from typing import Dict, List, Sequence, Tuple, Any
+
+import numpy as np
+
+# Fibonacci hashing: multiplier 2^64 / golden ratio, the top bits index the table
+_HASH_MULT = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+def _table_bits(entries: int) -> int:
+    """log2 of an open-addressing table size keeping the load factor <= 3/4."""
+    return max((4 * entries + 2) // 3 - 1, 7).bit_length()
+
+
+def _place(home: np.ndarray, bits: int) -> np.ndarray:
+    """
+    Slot of every entry of a linear-probing table, given its home slot.
+    Vectorized insertion: each round, every free slot goes to one of the
+    entries probing it and the others move on to the next slot.
+    """
+    mask = (1 << bits) - 1
+    taken = np.zeros(1 << bits, dtype=bool)
+    slots = home.astype(np.int64)
+    pending = np.arange(len(home))
+    while len(pending):
+        probe = slots[pending]
+        free = np.flatnonzero(~taken[probe])
+        won, first = np.unique(probe[free], return_index=True)
+        taken[won] = True
+        keep = np.ones(len(pending), dtype=bool)
+        keep[free[first]] = False
+        pending = pending[keep]
+        slots[pending] = (slots[pending] + 1) & mask
+    return slots
+
+
+class SkillIndex:
+    """
+    Token-level Aho-Corasick automaton over skill phrases.
+
+    Phrases are sequences of token hashes (spaCy LOWER), grouped by key
+    (concept URI). `find` maps the tokens to ids in one vectorized hash
+    lookup, then walks them once; every transition is a hash table probe
+    (failure links add amortized O(1) per token). The cost is O(n) for n
+    tokens, independent of the number of phrases.
+
+    The automaton is stored in flat typed arrays (no Python object per node),
+    the two hash tables with open addressing and linear probing:
+      token_keys - phrase token hashes, by slot (`hash & mask`)
+      token_table - token id of each slot (-1: empty)
+      edge_keys  - `node * n_tokens + token id` of every non-root trie edge,
+                   by slot (Fibonacci hash of the key; -1: empty)
+      edge_child - target node of each slot
+      root_child - target node of the root edge of every token (0: none)
+      fail       - failure link of each node (longest proper suffix in the trie)
+      out_key    - key of the phrase ending at the node (-1: none)
+      out_link   - nearest node on the failure chain with a phrase (0: none)
+      depth      - phrase length in tokens
+    """
+
+    def __init__(self, phrases: Dict[str, List[Tuple[int, ...]]]):
+        self.keys: List[str] = list(phrases)
+        self.phrases = 0
+
+        token_set = sorted({token for keywords in phrases.values()
+                            for keyword in keywords for token in keyword})
+        token_id = {token: i for i, token in enumerate(token_set)}
+        self.token_count = len(token_set)
+
+        # Build-time trie: one dict of children per node (discarded afterwards)
+        children: List[Dict[int, int]] = [{}]
+        out_key, depth = [-1], [0]
+        for key_index, keywords in enumerate(phrases.values()):
+            for keyword in keywords:
+                if not keyword:
+                    continue
+                node = 0
+                for token in keyword:
+                    t = token_id[token]
+                    child = children[node].get(t)
+                    if child is None:
+                        child = len(children)
+                        children[node][t] = child
+                        children.append({})
+                        out_key.append(-1)
+                        depth.append(depth[node] + 1)
+                    node = child
+                # A phrase listed under several keys keeps the first one
+                if out_key[node] < 0:
+                    out_key[node] = key_index
+                    self.phrases += 1
+
+        # Breadth-first failure and output links
+        fail, out_link = [0] * len(children), [0] * len(children)
+        queue = deque(children[0].values())
+        while queue:
+            node = queue.popleft()
+            for t, child in children[node].items():
+                suffix = fail[node]
+                while suffix and t not in children[suffix]:
+                    suffix = fail[suffix]
+                target = children[suffix].get(t, 0)
+                fail[child] = target if target != child else 0
+                out_link[child] = (fail[child] if out_key[fail[child]] >= 0
+                                   else out_link[fail[child]])
+                queue.append(child)
+
+        # Token table: spaCy hashes are uniformly distributed, the low bits
+        # are the home slot
+        bits = _table_bits(len(token_set))
+        hashes = np.array(token_set, dtype=np.uint64)
+        slots = _place(hashes & np.uint64((1 << bits) - 1), bits)
+        token_keys = np.zeros(1 << bits, dtype=np.uint64)
+        token_table = np.full(1 << bits, -1, dtype=np.int32)
+        token_keys[slots] = hashes
+        token_table[slots] = np.arange(len(token_set), dtype=np.int32)
+        self.token_keys = array('Q', token_keys.tobytes())
+        self.token_table = array('i', token_table.tobytes())
+
+        # Edge table (non-root edges): Fibonacci hash of the edge key
+        n_tokens = max(len(token_set), 1)
+        self.n_tokens = n_tokens
+        edges = np.array([(node * n_tokens + t, child)
+                          for node in range(1, len(children))
+                          for t, child in children[node].items()],
+                         dtype=np.int64).reshape(-1, 2)
+        self.n_edges = len(edges)
+        self.edge_bits = _table_bits(self.n_edges)
+        home = (edges[:, 0].astype(np.uint64) * np.uint64(_HASH_MULT)
+                >> np.uint64(64 - self.edge_bits))
+        slots = _place(home, self.edge_bits)
+        edge_keys = np.full(1 << self.edge_bits, -1, dtype=np.int64)
+        edge_child = np.zeros(1 << self.edge_bits, dtype=np.int32)
+        edge_keys[slots], edge_child[slots] = edges[:, 0], edges[:, 1]
+        self.edge_keys = array('q', edge_keys.tobytes())
+        self.edge_child = array('i', edge_child.tobytes())
+        # Every mismatch restarts at the root: its edges get a direct table
+        root_child = array('i', bytes(4 * n_tokens))
+        for t, child in children[0].items():
+            root_child[t] = child
+        self.root_child = root_child
+        self.fail = array('i', fail)
+        self.out_key = array('i', out_key)
+        self.out_link = array('i', out_link)
+        self.depth = array('i', depth)
+
+    def __len__(self) -> int:
+        return self.phrases
+
+    def token_ids(self, tokens: Sequence[int]) -> List[int]:
+        """Token id of every hash, -1 for tokens that occur in no phrase."""
+        keys = np.frombuffer(self.token_keys, dtype=np.uint64)
+        table = np.frombuffer(self.token_table, dtype=np.int32)
+        tokens = np.asarray(tokens, dtype=np.uint64)
+        ids = np.full(len(tokens), -1, dtype=np.int64)
+        mask = len(table) - 1
+        slots = (tokens & np.uint64(mask)).astype(np.int64)
+        # All tokens probe in lockstep; each round drops the resolved ones
+        pending = np.arange(len(tokens))
+        while len(pending):
+            probe = slots[pending]
+            found = table[probe]
+            hit = (found >= 0) & (keys[probe] == tokens[pending])
+            ids[pending[hit]] = found[hit]
+            pending = pending[(found >= 0) & ~hit]
+            slots[pending] = (slots[pending] + 1) & mask
+        return ids.tolist()
+
+    def _child(self, node: int, t: int) -> int:
+        """Target of the edge (node, t); 0 (the root) when there is none."""
+        if not node:
+            return self.root_child[t]
+        key = node * self.n_tokens + t
+        edge_keys, mask = self.edge_keys, (1 << self.edge_bits) - 1
+        slot = ((key * _HASH_MULT) & _MASK64) >> (64 - self.edge_bits)
+        while True:
+            found = edge_keys[slot]
+            if found == key:
+                return self.edge_child[slot]
+            if found < 0:
+                return 0
+            slot = (slot + 1) & mask
+
+    def find(self, tokens: Sequence[int]) -> List[Tuple[int, int, str]]:
+        """Every (start, end, key) phrase occurrence in a sequence of token hashes."""
+        fail, out_key, out_link, depth = self.fail, self.out_key, self.out_link, self.depth
+        matches = []
+        node = 0
+        for end, t in enumerate(self.token_ids(tokens), start=1):
+            if t < 0:
+                node = 0
+                continue
+            child = self._child(node, t)
+            while not child and node:
+                node = fail[node]
+                child = self._child(node, t)
+            node = child
+
+            hit = node if out_key[node] >= 0 else out_link[node]
+            while hit:
+                matches.append((end - depth[hit], end, self.keys[out_key[hit]]))
+                hit = out_link[hit]
+        return matches
+
+    @staticmethod
+    def longest(matches: Sequence[Tuple[int, int, str]]) -> List[Tuple[int, int, str]]:
+        """Non-overlapping matches, longest first (same rule as spacy.util.filter_spans)."""
+        taken, seen = [], set()
+        for start, end, key in sorted(matches, key=lambda m: (m[0] - m[1], m[0])):
+            if seen.isdisjoint(range(start, end)):
+                taken.append((start, end, key))
+                seen.update(range(start, end))
+        return sorted(taken)
+
+    def nbytes(self) -> int:
+        """Memory held by the automaton (arrays plus the key strings)."""
+        arrays = (self.token_keys, self.token_table, self.edge_keys, self.edge_child,
+                  self.root_child,
+                  self.fail, self.out_key, self.out_link, self.depth)
+        size = sum(a.itemsize * len(a) for a in arrays)
+        return size + sys.getsizeof(self.keys) + sum(sys.getsizeof(key) for key in self.keys)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "phrases": self.phrases,
+            "keys": len(self.keys),
+            "nodes": len(self.fail),
+            "tokens": self.token_count,
+            "bytes": self.nbytes(),
+        }
@@ -0,0 +1,108 @@
+import json
+import threading
+import time
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from src.config import WARMUP_CORPUS_PATH, WARMUP_ROUNDS
+from src.data_models import MatchRequest
+from src.utils import ComponentStatus
+
+# Used when the configured warmup corpus file is missing
+WARMUP_REQUEST = MatchRequest(
+    job_description=(
+        "Requirements:\n"
+        "- Experience building REST APIs in Python and SQL databases.\n"
+        "- Ability to work together effectively in cross-functional teams."
+    ),
+    cv_text=(
+        "Experience\n"
+        "- Developed REST APIs in Python backed by PostgreSQL databases.\n"
+        "- Led a team of three engineers delivering data pipelines."
+    ),
+)
+
+
+def load_warmup_corpus(path: str = WARMUP_CORPUS_PATH) -> List[MatchRequest]:
+    """The warmup /match requests ('' disables the warmup)."""
+    if not path:
+        return []
+    if not Path(path).exists():
+        print(f"⚠️  Warmup corpus {path} not found, using the built-in request.")
+        return [WARMUP_REQUEST]
+    with open(path, encoding="utf-8") as f:
+        return [MatchRequest(**item) for item in json.load(f)]
+
+
+def warm_up(engine, requests: List[MatchRequest], executor: Optional[Executor] = None,
+            rounds: int = WARMUP_ROUNDS) -> int:
+    """
+    Runs every request `rounds` times through the full /match pipeline, so
+    lazy allocations (spaCy, torch, caches) happen before real traffic. With
+    an executor the requests run concurrently on it, which also spins up the
+    threads that will serve the API. Returns the number of requests run.
+    """
+    batch = [request for _ in range(rounds) for request in requests]
+    if executor is None:
+        for request in batch:
+            engine.calculate_match(request)
+    else:
+        for future in [executor.submit(engine.calculate_match, request) for request in batch]:
+            future.result()
+    return len(batch)
+
+
+class BackgroundLoader:
+    """
+    Runs the service startup (model loading, warmup) in a background thread,
+    so the API answers liveness probes at once and reports per-component
+    progress until it is ready.
+    """
+
+    def __init__(self):
+        self.components = ComponentStatus()
+        self.status = "pending"  # pending -> loading -> ready | failed
+        self.error: Optional[str] = None
+        self._started: Optional[float] = None
+        self._seconds: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, load: Callable[[ComponentStatus], None]) -> None:
+        """Calls `load(self.components)` in a daemon thread."""
+        self.status = "loading"
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, args=(load,),
+                                        name="model-loader", daemon=True)
+        self._thread.start()
+
+    def _run(self, load: Callable[[ComponentStatus], None]) -> None:
+        try:
+            load(self.components)
+            self.status = "ready"
+            print("✅ Service ready.")
+        except Exception as e:
+            self.error = str(e)
+            self.status = "failed"
+            print(f"❌ Startup failed: {e}")
+        finally:
+            self._seconds = round(time.perf_counter() - self._started, 3)
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Blocks until loading finished (or the timeout expired)."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    @property
+    def ready(self) -> bool:
+        return self.status == "ready"
+
+    def report(self) -> Dict[str, Any]:
+        report: Dict[str, Any] = {"status": self.status}
+        if self._started is not None:
+            report["seconds"] = (self._seconds if self._seconds is not None
+                                 else round(time.perf_counter() - self._started, 3))
+        report["components"] = self.components.stats()
+        if self.error:
+            report["error"] = self.error
+        return report
@@ -1,7 +1,10 @@
 import re
+import threading
+import time
+from contextlib import contextmanager
 
 import spacy
-from typing import List
+from typing import Any, Dict, List
 from spacy.tokens import Doc
 
 from src.config import CHUNK_WINDOW_SIZE, CHUNK_OVERLAP_SIZE
@@ -44,3 +47,69 @@ def chunk_text(text: str, nlp: spacy.Language,
         chunks.append(' '.join(group))
 
     return chunks
+
+
+class StageTimings:
+    """Thread-safe accumulator of wall-clock time spent in each pipeline stage."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+
+    @contextmanager
+    def measure(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._totals[stage] = self._totals.get(stage, 0.0) + seconds
+            self._counts[stage] = self._counts.get(stage, 0) + 1
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per stage: number of runs, total and average time in ms."""
+        with self._lock:
+            return {
+                stage: {
+                    "count": self._counts[stage],
+                    "total_ms": round(total * 1000, 2),
+                    "avg_ms": round(total * 1000 / self._counts[stage], 3),
+                }
+                for stage, total in self._totals.items()
+            }
+
+
+class ComponentStatus:
+    """
+    Thread-safe load status of the service components
+    (loading -> ready | failed) and the time each one took.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._components: Dict[str, Dict[str, Any]] = {}
+
+    @contextmanager
+    def measure(self, component: str):
+        self._set(component, {"status": "loading"})
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self._set(component, {"status": "failed", "error": str(e),
+                                  "seconds": round(time.perf_counter() - start, 3)})
+            raise
+        self._set(component, {"status": "ready",
+                              "seconds": round(time.perf_counter() - start, 3)})
+
+    def _set(self, component: str, status: Dict[str, Any]) -> None:
+        with self._lock:
+            self._components[component] = status
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: dict(status) for name, status in self._components.items()}
@@ -0,0 +1,188 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import (PROCESS_POOL_WORKERS, PROCESS_POOL_TORCH_THREADS,
+                        PROCESS_POOL_START_TIMEOUT)
+from src.data_models import (MatchRequest, MatchResponse, RankRequest, RankResponse,
+                             JobsMatchRequest, JobsMatchResponse, JobRegisterRequest,
+                             JobInfo)
+
+# Engine owned by the current worker process (set by the pool initializer)
+_worker_engine = None
+# Why the worker's warmup failed (None: warm, or warmup disabled)
+_worker_warmup_error: Optional[str] = None
+
+
+def _init_worker(torch_threads: int, warmup: bool) -> None:
+    """Runs once in every worker process: loads (and warms up) its own engine."""
+    global _worker_engine, _worker_warmup_error
+    import torch
+    from src.orchestrator import HybridMatchEngine
+    from src.startup import load_warmup_corpus, warm_up
+
+    torch.set_num_threads(torch_threads)
+    _worker_engine = HybridMatchEngine()
+    if warmup:
+        try:
+            warm_up(_worker_engine, load_warmup_corpus())
+        except Exception as e:
+            # The engine still serves (cold); the API reports it under 'warmup'
+            _worker_warmup_error = str(e)
+
+
+def _call_engine(method: str, *args) -> Any:
+    return getattr(_worker_engine, method)(*args)
+
+
+def _ping(hold: float = 0.0) -> Dict[str, Any]:
+    # Holding the worker briefly lets the other (idle) workers take pings too
+    time.sleep(hold)
+    return {"pid": os.getpid(), "engine_loaded": _worker_engine is not None,
+            "warmup_error": _worker_warmup_error}
+
+
+class ProcessPoolEngine:
+    """
+    Engine facade for the 'process' execution mode.
+
+    Every worker process loads its own HybridMatchEngine once (spaCy and the
+    Python-level parts of the pipeline are GIL-bound, so threads stop scaling
+    after a few cores). Exposes the same methods as HybridMatchEngine, so the
+    API dispatches to either one the same way. A crashed worker breaks the
+    pool; it is then restarted and the call retried once.
+    """
+
+    def __init__(self, workers: int = PROCESS_POOL_WORKERS,
+                 torch_threads: int = PROCESS_POOL_TORCH_THREADS,
+                 warmup: bool = True):
+        self.workers = workers
+        self.torch_threads = torch_threads
+        self.warmup = warmup
+        self.restarts = 0
+        self._lock = threading.Lock()
+        self._warmup_errors: List[str] = []
+        self._pool = self._start_pool()
+
+    def _start_pool(self) -> ProcessPoolExecutor:
+        print(f"🚀 Starting {self.workers} engine worker processes...")
+        # 'spawn': forking a process that already runs torch threads is unsafe
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.torch_threads, self.warmup),
+        )
+        # Pings spawn the workers now; a worker only answers once its
+        # initializer (engine load) has finished. The first worker up could
+        # take every ping, so pings are resent until each worker process
+        # answered, and the first real requests don't pay for the loading.
+        deadline = time.monotonic() + PROCESS_POOL_START_TIMEOUT
+        pings: Dict[int, Dict[str, Any]] = {}
+        while len(pings) < self.workers:
+            pings = [pool.submit(_ping, 0.05) for _ in range(self.workers)]
+            done, not_done = wait(pings, timeout=max(deadline - time.monotonic(), 0))
+            if not_done or any(f.exception() for f in done):
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise RuntimeError("Engine worker processes failed to start.")
+            pings.update((f.result()["pid"], f.result()) for f in done)
+        self._warmup_errors = [ping["warmup_error"] for ping in pings.values()
+                               if ping["warmup_error"]]
+        print("✅ Engine workers ready.")
+        return pool
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._pool is not broken:
+                return  # Another thread already restarted it
+            print("⚠️  Engine worker died, restarting the process pool...")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._pool = self._start_pool()
+            self.restarts += 1
+
+    def _call(self, method: str, *args) -> Any:
+        """Runs an engine method in a worker and blocks until it returns."""
+        for attempt in range(2):
+            pool = self._pool
+            try:
+                return pool.submit(_call_engine, method, *args).result()
+            except BrokenProcessPool:
+                if attempt:
+                    raise
+                self._restart(pool)
+
+    def calculate_match(self, request: MatchRequest) -> MatchResponse:
+        return self._call("calculate_match", request)
+
+    def calculate_matches(self, requests: List[MatchRequest]) -> List[MatchResponse]:
+        return self._call("calculate_matches", requests)
+
+    def iter_match_events(self, request: MatchRequest) -> Iterator[Dict[str, Any]]:
+        # Generators can't cross processes: the worker runs every stage and
+        # the events are replayed here (same content, no early delivery).
+        # Lazy, so the blocking call runs on the first next(), in the executor.
+        yield from self._call("match_events", request)
+
+    def rank_cvs(self, request: RankRequest) -> RankResponse:
+        return self._call("rank_cvs", request)
+
+    def match_jobs(self, request: JobsMatchRequest) -> JobsMatchResponse:
+        return self._call("match_jobs", request)
+
+    def register_job(self, request: JobRegisterRequest) -> JobInfo:
+        # The registry is a shared SQLite file: any worker can serve the job later
+        return self._call("register_job", request)
+
+    def get_job(self, job_id: str) -> JobInfo:
+        return self._call("get_job", job_id)
+
+    def delete_job(self, job_id: str) -> bool:
+        return self._call("delete_job", job_id)
+
+    def embed_cv(self, cv_text: str) -> Tuple[List[Dict[str, str]], np.ndarray]:
+        return self._call("embed_cv", cv_text)
+
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        return self._call("embed_texts", texts)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Pool health plus the counters of one (arbitrary) worker."""
+        return {"pool": self.health(), "worker": self._call("get_stats")}
+
+    def health(self) -> Dict[str, Any]:
+        """
+        Number of live worker processes and restarts so far.
+
+        ProcessPoolExecutor has no public API for its processes: this reads
+        the private `_processes` / `_broken` attributes of the CPython
+        implementation (missing ones report 0 alive / not broken).
+        """
+        processes: Optional[dict] = getattr(self._pool, "_processes", None) or {}
+        alive = sum(1 for p in processes.values() if p.is_alive())
+        return {
+            "mode": "process",
+            "workers": self.workers,
+            "alive": alive,
+            # A broken pool is restarted by the next call
+            "broken": bool(getattr(self._pool, "_broken", False)),
+            "restarts": self.restarts,
+        }
+
+    def check_warmup(self) -> None:
+        """
+        Raises RuntimeError if a worker's warmup failed. Workers warm up in
+        their initializer, before answering the startup pings, so the
+        corpus does not need to run through the pool again.
+        """
+        if self._warmup_errors:
+            raise RuntimeError(f"{len(self._warmup_errors)} of {self.workers} workers "
+                               f"failed to warm up: {self._warmup_errors[0]}")
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
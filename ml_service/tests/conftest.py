@@ -1,68 +1,43 @@
 import pytest
 from unittest.mock import MagicMock, patch
 import numpy as np
+import spacy
+from spacy.language import Language
 import torch
 
 from src.orchestrator import HybridMatchEngine
 
 
+@Language.component("mock_tagger")
+def mock_tagger(doc):
+    """Lemma = lowercase text; only 'manage'/'lead' are verbs."""
+    for token in doc:
+        token.lemma_ = token.lower_
+        token.pos_ = "VERB" if token.lower_ in ["manage", "lead"] else "NOUN"
+    return doc
+
+
 @pytest.fixture
-def mock_engine():
+def mock_engine(tmp_path):
     """
     Creates an instance of HybridMatchEngine with mocked internal models.
     """
-    with patch("src.orchestrator.spacy.load") as mock_spacy_load, \
-            patch("src.orchestrator.SentenceTransformer") as mock_sbert_cls, \
+    with patch("src.orchestrator.JOB_REGISTRY_PATH", str(tmp_path / "jobs.sqlite3")), \
+            patch("src.orchestrator.NER_SNAPSHOT_PATH", str(tmp_path / "ner_snapshot")), \
+            patch("src.ner_snapshot.spacy.load") as mock_spacy_load, \
+            patch("src.inference_backends.SentenceTransformer") as mock_sbert_cls, \
             patch("src.processors.fallback_tfidf.TfidfVectorizer") as mock_tfidf_cls, \
-            patch("src.processors.semantic.util.cos_sim") as mock_cos_sim:
+            patch("src.processors.ner.NERProcessor._get_mvp_patterns") as mock_patterns:
 
         # 1. Mocking NLP (spaCy)
-        nlp_mock = MagicMock()
-        nlp_mock.pipe_names = []
-
-        def simple_pipeline(text, disable=None):
-            doc_mock = MagicMock()
-
-            # Mock sentences
-            if not text or not text.strip():
-                doc_mock.sents = []
-                doc_mock.ents = []
-            else:
-                sentences = [MagicMock(text=t.strip())
-                             for t in text.split('.') if t.strip()]
-                if not sentences:
-                    sentences = [MagicMock(text=text)]
-                doc_mock.sents = sentences
-
-            # Mock Entities (Simple heuristic for testing)
-            ents = []
-            for word in text.split():
-                if word.lower() in ["python", "sql", "java"]:
-                    ent = MagicMock()
-                    ent.text = word
-                    ent.label_ = "SKILL"
-                    ents.append(ent)
-            doc_mock.ents = ents
-
-            # Mock Tokens
-            tokens = []
-            for word in text.split():
-                token = MagicMock()
-                token.lemma_ = word.lower()
-                token.text = word
-                token.is_alpha = word.isalpha()
-                token.is_stop = False
-                token.pos_ = "VERB" if word.lower(
-                ) in ["manage", "lead"] else "NOUN"
-                token.dep_ = "ROOT"
-                token.children = []
-                tokens.append(token)
-
-            doc_mock.__iter__.return_value = tokens
-            return doc_mock
-
-        nlp_mock.side_effect = simple_pipeline
-        mock_spacy_load.return_value = nlp_mock
+        # A blank pipeline keeps real Doc/Span objects (the engine builds one
+        # annotated document per request) without downloading a model.
+        # The sentencizer stands in for the dependency parser.
+        nlp = spacy.blank("en")
+        nlp.add_pipe("sentencizer", name="parser",
+                     config={"punct_chars": [".", "!", "?", "\n"]})
+        nlp.add_pipe("mock_tagger", before="parser")
+        mock_spacy_load.return_value = nlp
 
         # 2. Mocking SBERT
         mock_sbert_instance = MagicMock()
@@ -81,10 +56,12 @@ def mock_engine():
             f"word_{i}" for i in range(10)]
         mock_tfidf_cls.return_value = mock_tfidf_instance
 
-        # 4. Mocking Cosine Similarity
-        def mock_cos_sim_side_effect(a, b):
-            return torch.rand(a.shape[0], b.shape[0])
-
-        mock_cos_sim.side_effect = mock_cos_sim_side_effect
+        # 4. Mocking ESCO patterns (simple skill heuristic for testing)
+        mock_patterns.return_value = [
+            {"label": "SKILL", "pattern": [{"LOWER": word}], "id": word}
+            for word in ["python", "sql", "java"]
+        ]
 
-        yield HybridMatchEngine()
+        engine = HybridMatchEngine()
+        yield engine
+        engine.close()
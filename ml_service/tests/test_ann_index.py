@@ -0,0 +1,105 @@
+import numpy as np
+
+from src.ann_index import IVFIndex
+from src.candidate_index import CandidateIndex
+from src.data_models import CandidateIndexRequest, CandidateSearchRequest
+from tests.test_data import CV_CANDIDATE
+
+
+def _clustered(n, dim=32, clusters=50, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    data = centers[rng.integers(0, clusters, n)] + 0.3 * rng.normal(size=(n, dim))
+    return (data / np.linalg.norm(data, axis=1, keepdims=True)).astype(np.float32)
+
+
+def _filled_index(n=6000, n_lists=16):
+    data = _clustered(n)
+    index = IVFIndex(32, n_lists=n_lists, n_probe=4)
+    for start in range(0, n, 20):
+        index.add(f"doc{start}", data[start:start + 20],
+                  [{"row": row} for row in range(start, start + 20)])
+    return index, data
+
+
+def test_ivf_recall_against_exact_search():
+    index, data = _filled_index()
+    assert index.stats()["trained"]
+
+    queries = data[:40]
+    exact = index.search(queries, k=10, exact=True)
+    approx = index.search(queries, k=10)
+    full_scan = index.search(queries, k=10, n_probe=index.n_lists)
+
+    def rows(hits):
+        return {payload["row"] for _, _, payload in hits}
+
+    recall = np.mean([len(rows(a) & rows(e)) / 10 for a, e in zip(approx, exact)])
+    assert recall >= 0.9
+    assert [rows(h) for h in full_scan] == [rows(h) for h in exact]
+
+
+def test_ivf_delete_replace_and_persistence(tmp_path):
+    index, data = _filled_index()
+    query = data[0]
+    assert index.search(query, k=1)[0][0][0] == "doc0"
+
+    index.remove("doc0")
+    assert all(doc != "doc0" for doc, _, _ in index.search(query, k=50)[0])
+
+    index.add("doc20", data[:1], [{"row": 0}])   # replaces doc20's 20 vectors
+    assert len(index) == 6000 - 20 - 19
+
+    path = str(tmp_path / "index.npz")
+    index.save(path)
+    restored = IVFIndex.load(path)
+    assert len(restored) == len(index)
+    assert restored.search(data[:5], k=5) == index.search(data[:5], k=5)
+
+
+def test_candidate_search_finds_indexed_cv(mock_engine, tmp_path):
+    """CV chunks are indexed with the engine's embeddings and searchable by text."""
+    candidates = CandidateIndex(mock_engine, str(tmp_path / "cv_chunks.npz"))
+    other_cv = CV_CANDIDATE.replace("Python", "Java") + "\nLed migrations of legacy systems to the cloud."
+    info = candidates.add_cv(CandidateIndexRequest(cv_id="cv-1", cv_text=CV_CANDIDATE))
+    candidates.add_cv(CandidateIndexRequest(cv_id="cv-2", cv_text=other_cv))
+    assert info["chunks"] > 0
+
+    # A chunk text is embedded to the same (cached) vector as the indexed chunk
+    payloads, _ = mock_engine.embed_cv(CV_CANDIDATE)
+    response = candidates.search(CandidateSearchRequest(requirement=payloads[0]["text"], top_k=2))
+
+    assert response.results[0].cv_id in {"cv-1", "cv-2"}
+    assert response.results[0].best_cv_match == payloads[0]["text"]
+    assert len({hit.cv_id for hit in response.results}) == len(response.results)
+
+    assert candidates.remove_cv("cv-1")
+    candidates.close()
+    restored = CandidateIndex(mock_engine, str(tmp_path / "cv_chunks.npz"))
+    assert restored.stats()["documents"] == 1
+
+
+def test_ivf_replacements_trigger_compaction():
+    index = IVFIndex(32, n_lists=4)
+    data = _clustered(40, clusters=4)
+    index.add("doc", data[:20])
+    for _ in range(3):
+        index.add("doc", data[20:])   # each replacement tombstones 20 rows
+    assert index.stats()["tombstones"] <= 20
+    assert len(index) == 20
+
+
+def test_candidate_index_rebuilds_on_dimension_change(mock_engine, tmp_path):
+    """An index built with another model is re-embedded from the stored chunk texts."""
+    path = str(tmp_path / "cv_chunks.npz")
+    stale = IVFIndex(8)
+    stale.add("cv-1", _clustered(2, dim=8), [{"section": "experience", "text": "Python developer"},
+                                             {"section": "skills", "text": "Docker"}])
+    stale.save(path)
+
+    candidates = CandidateIndex(mock_engine, path)
+    assert candidates.index.dim == 384
+    assert candidates.stats()["documents"] == 1
+    assert IVFIndex.load(path).dim == 384
+    response = candidates.search(CandidateSearchRequest(requirement="Docker", top_k=1))
+    assert response.results[0].cv_id == "cv-1"
@@ -1,5 +1,13 @@
+import asyncio
+import json
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
 from fastapi.testclient import TestClient
 from main import app, get_engine
+from src.data_models import MatchRequest
+from src.job_registry import JobNotFoundError
+from src.worker_pool import ProcessPoolEngine
 from tests.test_data import JOB_OFFERS, CV_CANDIDATE
 
 client = TestClient(app)
@@ -47,3 +55,113 @@ def test_match_endpoint_validation_error(mock_engine):
     response = client.post("/match", json=payload)
     app.dependency_overrides = {}
     assert response.status_code == 422
+
+
+def test_rank_endpoint_integration(mock_engine):
+    """/match/rank returns one sorted result per CV."""
+    app.dependency_overrides[get_engine] = lambda: mock_engine
+    payload = {
+        "job_description": JOB_OFFERS['perfect']['text'],
+        "cv_texts": [CV_CANDIDATE, JOB_OFFERS['poor']['text']],
+        "include_details": True
+    }
+    response = client.post("/match/rank", json=payload)
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_cvs"] == 2
+    assert sorted(r["cv_index"] for r in data["results"]) == [0, 1]
+    assert data["results"][0]["final_score"] >= data["results"][1]["final_score"]
+
+
+def test_match_requires_exactly_one_job_source(mock_engine):
+    """Either job_description or job_id, never both or neither."""
+    app.dependency_overrides[get_engine] = lambda: mock_engine
+    response = client.post("/match", json={"cv_text": CV_CANDIDATE})
+    unknown = client.post("/match", json={"cv_text": CV_CANDIDATE, "job_id": "missing"})
+    app.dependency_overrides = {}
+
+    assert response.status_code == 422
+    assert unknown.status_code == 404
+
+
+def test_match_stream_endpoint(mock_engine):
+    """/match/stream returns one JSON event per line, ending with 'final'."""
+    app.dependency_overrides[get_engine] = lambda: mock_engine
+    payload = {"job_description": JOB_OFFERS['medium']['text'], "cv_text": CV_CANDIDATE}
+    response = client.post("/match/stream", json=payload)
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[0]["event"] == "sections"
+    assert events[-1]["event"] == "final"
+    assert "final_score" in events[-1]["data"]
+
+
+def test_match_response_is_serialized_once(mock_engine):
+    """/match returns the engine's response as is: no response_model re-validation."""
+    app.dependency_overrides[get_engine] = lambda: mock_engine
+    payload = {"job_description": JOB_OFFERS['medium']['text'], "cv_text": CV_CANDIDATE}
+    with patch("fastapi.routing.serialize_response") as serialize:
+        response = client.post("/match", json=payload)
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    serialize.assert_not_called()
+    expected = mock_engine.calculate_match(MatchRequest(**payload))
+    assert response.json() == expected.model_dump(mode="json")
+
+
+def test_openapi_keeps_response_schemas():
+    """The fast path still documents the response models."""
+    paths = client.get("/openapi.json").json()["paths"]
+    for path, model in [("/match", "MatchResponse"), ("/match/rank", "RankResponse"),
+                        ("/match/jobs", "JobsMatchResponse")]:
+        schema = paths[path]["post"]["responses"]["200"]["content"]["application/json"]["schema"]
+        assert schema == {"$ref": f"#/components/schemas/{model}"}
+
+
+def test_match_stream_reports_process_pool_errors():
+    """In process mode the worker call runs lazily, so failures become 'error' events."""
+    engine = ProcessPoolEngine.__new__(ProcessPoolEngine)
+    payload = {"job_id": "missing", "cv_text": CV_CANDIDATE}
+    app.dependency_overrides[get_engine] = lambda: engine
+    responses = []
+    for error in (JobNotFoundError("missing"), BrokenProcessPool("worker died")):
+        with patch.object(engine, "_call", side_effect=error):
+            responses.append(client.post("/match/stream", json=payload))
+    with patch.object(engine, "_call", side_effect=JobNotFoundError("missing")):
+        not_found = client.post("/match", json=payload)
+    app.dependency_overrides = {}
+
+    events = [[json.loads(line) for line in r.text.splitlines()] for r in responses]
+    assert [r.status_code for r in responses] == [200, 200]
+    # Same wording as the /match 404, built from the request's job_id
+    assert not_found.status_code == 404
+    assert events[0] == [{"event": "error", "detail": not_found.json()["detail"]}]
+    assert events[1][0]["event"] == "error"
+    assert "worker died" in events[1][0]["detail"]
+
+
+def test_stats_run_off_the_event_loop(mock_engine):
+    """/stats may wait on a worker process: it must not block the event loop."""
+    loops = []
+
+    def get_stats():
+        try:
+            loops.append(asyncio.get_running_loop())
+        except RuntimeError:
+            loops.append(None)
+        return {"stages": {}}
+
+    app.dependency_overrides[get_engine] = lambda: mock_engine
+    with patch.object(mock_engine, "get_stats", get_stats):
+        response = client.get("/stats")
+    app.dependency_overrides = {}
+
+    assert response.status_code == 200
+    assert loops == [None]
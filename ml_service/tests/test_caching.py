@@ -0,0 +1,118 @@
+from unittest.mock import MagicMock, patch
+
+import spacy
+import torch
+
+from src.caching import EmbeddingCache, ParsedDocCache
+from src.data_models import MatchRequest
+from src.processors.semantic import SemanticProcessor
+from tests.test_data import JOB_OFFERS, CV_CANDIDATE
+
+
+def test_embedding_cache_lru_eviction_by_entries():
+    """Least recently used rows are dropped first."""
+    cache = EmbeddingCache("model", max_entries=2, max_bytes=10_000)
+    cache.put_many(["a", "b"], torch.ones(2, 4))
+    cache.get_many(["a"])                      # 'a' becomes most recent
+    cache.put_many(["c"], torch.ones(1, 4))
+
+    assert [r is not None for r in cache.get_many(["a", "b", "c"])] == [True, False, True]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_embedding_cache_byte_budget_and_counters():
+    """Byte bound is enforced and hit/miss counters are exposed."""
+    cache = EmbeddingCache("model", max_entries=100, max_bytes=3 * 16)
+    cache.put_many(["a", "b", "c", "d"], torch.ones(4, 4))  # 16 bytes per row
+
+    stats = cache.stats()
+    assert stats["entries"] == 3
+    assert stats["bytes"] <= 3 * 16
+
+    cache.get_many(["d", "a"])
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_embedding_cache_key_depends_on_model():
+    assert EmbeddingCache("m1").make_key("text") != EmbeddingCache("m2").make_key("text")
+
+
+def test_semantic_processor_encodes_only_misses():
+    """Cached chunks never reach model.encode."""
+    model = MagicMock()
+    model.encode.side_effect = lambda texts, convert_to_tensor=True: torch.rand(
+        len(texts), 8)
+    processor = SemanticProcessor(MagicMock(), model,
+                                  embedding_cache=EmbeddingCache("model"))
+
+    first = processor.encode(["x", "y", "x"])
+    second = processor.encode(["y", "z"])
+
+    assert first.shape == (3, 8)
+    assert torch.equal(first[0], first[2])
+    assert torch.equal(first[1], second[0])
+    assert model.encode.call_args_list[0].args[0] == ["x", "y"]
+    assert model.encode.call_args_list[1].args[0] == ["z"]
+
+
+def test_parsed_doc_cache_round_trip():
+    """Cached docs keep the annotations the engine reads (sentences, lemmas, POS)."""
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer")
+    doc = nlp("Led a team. Built REST APIs in Python.")
+    for token in doc:
+        token.lemma_ = token.lower_
+        token.pos_ = "VERB" if token.lower_ in ("led", "built") else "NOUN"
+    cache = ParsedDocCache(nlp.vocab, "v1")
+    cache.put_many([doc.text], [doc])
+
+    cached, missing = cache.get_many([doc.text, "other text"])
+
+    assert missing is None
+    assert cached.text == doc.text
+    assert [s.text for s in cached.sents] == [s.text for s in doc.sents]
+    assert [t.lemma_ for t in cached] == [t.lemma_ for t in doc]
+    assert [t.pos_ for t in cached] == [t.pos_ for t in doc]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert 0 < stats["bytes"] < 1024
+
+
+def test_parsed_doc_cache_key_depends_on_pipeline_version():
+    vocab = spacy.blank("en").vocab
+    assert ParsedDocCache(vocab, "v1").make_key("text") != ParsedDocCache(vocab, "v2").make_key("text")
+
+
+def test_parsed_doc_cache_disabled_with_zero_bytes():
+    nlp = spacy.blank("en")
+    cache = ParsedDocCache(nlp.vocab, "v1", max_bytes=0)
+    cache.put_many(["some text"], [nlp("some text")])
+    assert cache.get_many(["some text"]) == [None]
+
+
+def test_engine_reuses_parsed_sections(mock_engine):
+    """A resubmitted CV and job ad are deserialized, not parsed again."""
+    request = MatchRequest(job_description=JOB_OFFERS['perfect']['text'], cv_text=CV_CANDIDATE)
+    first = mock_engine.calculate_match(request)
+
+    with patch.object(mock_engine.nlp, "pipe", wraps=mock_engine.nlp.pipe) as pipe:
+        second = mock_engine.calculate_match(request)
+        other_job = mock_engine.calculate_match(MatchRequest(
+            job_description=JOB_OFFERS['poor']['text'], cv_text=CV_CANDIDATE))
+
+    assert second == first
+    assert pipe.call_count == 1
+    assert pipe.call_args.args[0] == [mock_engine._job_signal_text(JOB_OFFERS['poor']['text'])]
+    assert other_job.final_score >= 0.0
+    stats = mock_engine.get_stats()["parsed_doc_cache"]
+    assert stats["hits"] > 0
+    assert stats["bytes"] > 0
+
+
+def test_job_signal_fallback_is_normalized(mock_engine):
+    """Without signal sections the raw text is normalized, like the backend cache key."""
+    crlf = "Company overview\r\n  * We build tools for recruiters.\r\n"
+    lf = "Company overview\n- We build tools for recruiters."
+    assert mock_engine._job_signal_text(crlf) == mock_engine._job_signal_text(lf) == lf
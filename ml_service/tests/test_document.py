@@ -0,0 +1,67 @@
+from unittest.mock import MagicMock
+
+import spacy
+
+from src.document import MatchDocument, add_newline_boundaries
+from src.processors.semantic import SemanticProcessor
+
+
+def _nlp():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer", name="parser")
+    add_newline_boundaries(nlp)
+    return nlp
+
+
+def test_newline_always_starts_a_sentence():
+    """Lines without final punctuation must not merge into one sentence."""
+    nlp = _nlp()
+    doc = nlp("Built data pipelines in Python\nLed a team of five engineers")
+
+    assert [s.text.strip() for s in doc.sents] == [
+        "Built data pipelines in Python",
+        "Led a team of five engineers",
+    ]
+
+
+def test_match_document_section_spans():
+    """Sections are parsed once and exposed as spans of a single CV doc."""
+    nlp = _nlp()
+    docs = {
+        "summary": nlp("Passionate developer who loves clean code."),
+        "experience": nlp("Worked at Google for three years.\nBuilt ETL pipelines with Python."),
+    }
+    document = MatchDocument.from_docs(nlp, nlp("Python developer wanted."), docs)
+
+    assert document.cv_sections["summary"].text == docs["summary"].text
+    assert document.cv_sections["experience"].text == docs["experience"].text
+    assert [s.text for s in document.sections(["projects", "experience"])] == [
+        docs["experience"].text]
+    assert "Worked at Google" in document.cv_doc.text
+
+
+def test_chunking_reads_shared_parse():
+    """Chunking works on section spans without calling the pipeline again."""
+    nlp = _nlp()
+    docs = {
+        "summary": nlp("Short line.\nPassionate developer who loves clean code."),
+        "experience": nlp("Experience:\nWorked at Google for three years. Built ETL pipelines with Python."),
+    }
+    document = MatchDocument.from_docs(nlp, nlp("Python developer wanted."), docs)
+
+    spy_nlp = MagicMock()
+    processor = SemanticProcessor(spy_nlp, MagicMock())
+
+    assert processor._chunk_text(document.cv_sections["summary"]) == [
+        "Passionate developer who loves clean code."]
+    assert processor._chunk_text(document.cv_sections["experience"]) == [
+        "Worked at Google for three years.", "Built ETL pipelines with Python."]
+    spy_nlp.assert_not_called()
+
+
+def test_empty_cv_document():
+    nlp = _nlp()
+    document = MatchDocument.from_docs(nlp, nlp(""), {})
+
+    assert document.cv_sections == {}
+    assert document.cv_doc.text == ""
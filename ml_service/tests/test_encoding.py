@@ -0,0 +1,65 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import torch
+
+from src.encoding import BatchingEncoder
+
+
+class CountingModel:
+    """Fake SBERT: embedding row = [len(text), first char code]."""
+
+    def __init__(self):
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def encode(self, sentences, convert_to_tensor=True):
+        with self.lock:
+            self.calls += 1
+        return torch.tensor([[float(len(s)), float(ord(s[0]))] for s in sentences])
+
+
+class FailingModel:
+    def encode(self, sentences, convert_to_tensor=True):
+        raise ValueError("boom")
+
+
+def test_batching_encoder_scatters_rows_to_callers():
+    """Each caller gets exactly the rows for its own texts."""
+    model = CountingModel()
+    encoder = BatchingEncoder(model, max_wait_ms=50, max_batch_size=1000)
+
+    inputs = [[f"{chr(97 + i)}" * (i + 1), f"{chr(65 + i)}x"] for i in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(encoder.encode, inputs))
+    encoder.close()
+
+    for texts, emb in zip(inputs, results):
+        assert emb.shape == (2, 2)
+        assert emb[0].tolist() == [float(len(texts[0])), float(ord(texts[0][0]))]
+        assert emb[1].tolist() == [float(len(texts[1])), float(ord(texts[1][0]))]
+
+    # Concurrent callers must share forward passes
+    assert model.calls < len(inputs)
+    assert encoder.stats()["requests"] == len(inputs)
+
+
+def test_batching_encoder_propagates_errors():
+    """A failing forward pass is raised in every waiting caller."""
+    encoder = BatchingEncoder(FailingModel(), max_wait_ms=0)
+
+    with pytest.raises(ValueError):
+        encoder.encode(["some text"])
+    encoder.close()
+
+
+def test_batching_encoder_rejects_jobs_after_close():
+    """Jobs are either queued before the shutdown sentinel or rejected."""
+    encoder = BatchingEncoder(CountingModel(), max_wait_ms=0)
+    assert encoder.encode(["abc"]).shape == (1, 2)
+    encoder.close()
+    encoder.close()  # idempotent
+
+    with pytest.raises(RuntimeError):
+        encoder.encode(["abc"])
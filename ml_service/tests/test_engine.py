@@ -1,4 +1,11 @@
-from src.data_models import MatchRequest, MatchResponse
+import zlib
+from unittest.mock import patch
+
+import numpy as np
+import torch
+
+from src.config import SECTION_WEIGHTS
+from src.data_models import MatchRequest, MatchResponse, RankRequest, JobsMatchRequest
 from tests.test_data import JOB_OFFERS, CV_CANDIDATE
 
 
@@ -15,7 +22,8 @@ def test_calculate_match_perfect_scenario(mock_engine):
     assert isinstance(response, MatchResponse)
     assert 0.0 <= response.final_score <= 1.0
     assert 0.0 <= response.semantic_score <= 1.0
-    assert 0.0 <= response.keyword_score <= 1.0
+    # Skills found in boosted sections weigh more than 1.0 (not clamped)
+    assert 0.0 <= response.keyword_score <= max(SECTION_WEIGHTS.values())
     assert isinstance(response.details, list)
     assert isinstance(response.common_keywords, list)
 
@@ -55,3 +63,94 @@ def test_guard_clause_empty_input(mock_engine):
     assert response.semantic_score == 0.0
     assert response.details == []
     assert response.common_keywords == []
+
+
+def test_batch_matching_uses_single_pipe_call(mock_engine):
+    """All texts of a batch of requests are parsed by one nlp.pipe call."""
+    requests = [
+        MatchRequest(job_description=JOB_OFFERS[level]['text'], cv_text=CV_CANDIDATE)
+        for level in ('poor', 'medium', 'perfect')
+    ]
+
+    with patch.object(mock_engine.nlp, "pipe", wraps=mock_engine.nlp.pipe) as pipe:
+        responses = mock_engine.calculate_matches(requests)
+
+    assert pipe.call_count == 1
+    assert len(responses) == len(requests)
+    assert all(isinstance(r, MatchResponse) for r in responses)
+    assert mock_engine.get_stats()["stages"]["spacy"]["count"] == 1
+
+
+def test_rank_cvs_matches_single_scores(mock_engine):
+    """Ranking returns the /match scores, sorted, with top_k and compact details."""
+    job = JOB_OFFERS['perfect']['text']
+    cvs = [JOB_OFFERS[level]['text'] for level in ('poor', 'medium')] + [CV_CANDIDATE]
+
+    single = [mock_engine.calculate_match(MatchRequest(job_description=job, cv_text=cv))
+              for cv in cvs]
+    ranked = mock_engine.rank_cvs(RankRequest(job_description=job, cv_texts=cvs, top_k=2))
+
+    assert ranked.total_cvs == 3
+    assert len(ranked.results) == 2
+    scores = [r.final_score for r in ranked.results]
+    assert scores == sorted(scores, reverse=True)
+    for result in ranked.results:
+        expected = single[result.cv_index]
+        assert result.final_score == expected.final_score
+        assert result.semantic_score == expected.semantic_score
+        assert result.keyword_score == expected.keyword_score
+        assert result.details == []
+
+
+def test_match_jobs_processes_cv_once(mock_engine):
+    """One CV against many jobs: one pipe call, CV encoded once, /match scores."""
+    encode = mock_engine.sbert.model.encode
+    # Same text -> same embedding, so fresh encodes reproduce /match's scores
+    encode.side_effect = lambda sentences, convert_to_tensor=True: torch.stack([
+        torch.from_numpy(np.random.default_rng(zlib.crc32(s.encode())).random(384)).float()
+        for s in sentences])
+    jobs = [JOB_OFFERS[level]['text'] for level in ('poor', 'medium', 'perfect')]
+    single = [mock_engine.calculate_match(MatchRequest(job_description=job, cv_text=CV_CANDIDATE))
+              for job in jobs]
+
+    cv = mock_engine._build_cv_documents([CV_CANDIDATE])[0]
+    cv_chunks = mock_engine.semantic_processor.prepare_cv(cv.sections).texts
+
+    encode.reset_mock()
+    mock_engine.parsed_doc_cache.clear()  # parse the texts again, in one call
+    mock_engine.embedding_cache.clear()   # and embed every chunk again
+    with patch.object(mock_engine.nlp, "pipe", wraps=mock_engine.nlp.pipe) as pipe, \
+            patch.object(mock_engine.ner_processor, "extract_cv_skills",
+                         wraps=mock_engine.ner_processor.extract_cv_skills) as cv_skills:
+        response = mock_engine.match_jobs(
+            JobsMatchRequest(cv_text=CV_CANDIDATE, job_descriptions=jobs))
+
+    assert pipe.call_count == 1
+    assert cv_skills.call_count == 1
+    # One call for the chunks of all jobs, one for the CV chunks; no text
+    # (CV chunks included) is encoded twice
+    assert encode.call_count == 2
+    encoded = [text for c in encode.call_args_list for text in c.args[0]]
+    assert len(encoded) == len(set(encoded))
+    assert set(cv_chunks) <= set(encoded)
+    assert len(response.results) == len(jobs)
+    for result, expected in zip(response.results, single):
+        assert result.final_score == expected.final_score
+        assert result.semantic_score == expected.semantic_score
+        assert result.missing_keywords == expected.missing_keywords
+
+
+def test_match_events_end_with_the_match_response(mock_engine):
+    """Stages arrive cheapest first; the final event equals /match's response."""
+    request = MatchRequest(job_description=JOB_OFFERS['perfect']['text'], cv_text=CV_CANDIDATE)
+
+    events = list(mock_engine.iter_match_events(request))
+    response = mock_engine.calculate_match(request)
+
+    assert [e["event"] for e in events] == [
+        "sections", "keywords", "action_verbs", "semantic", "final"]
+    final = events[-1]["data"]
+    assert final["keyword_score"] == events[1]["data"]["keyword_score"]
+    assert final["final_score"] == response.final_score
+    assert final["semantic_score"] == response.semantic_score
+    assert final["missing_keywords"] == response.missing_keywords
@@ -0,0 +1,79 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+import torch
+
+from src.inference_backends import (SBERTBackend, load_sbert, parity_report,
+                                    quantize_linear_layers)
+
+
+class TinyEncoder(torch.nn.Module):
+    """Stand-in for SBERT: hashed bag of characters -> Linear layers."""
+
+    def __init__(self):
+        super().__init__()
+        torch.manual_seed(0)
+        self.layers = torch.nn.Sequential(
+            torch.nn.Linear(64, 128), torch.nn.ReLU(), torch.nn.Linear(128, 32))
+
+    def encode(self, sentences, convert_to_tensor=True):
+        features = torch.zeros(len(sentences), 64)
+        for row, text in enumerate(sentences):
+            for char in text:
+                features[row, ord(char) % 64] += 1.0
+        # Quantized modules have no float parameters left
+        dtype = next(self.parameters(), features).dtype
+        return self.layers(features.to(dtype))
+
+
+TEXTS = ["Built ETL pipelines in Python", "Led a team of five engineers",
+         "Designed REST APIs with FastAPI", "Managed cloud infrastructure on AWS"]
+
+
+def test_backend_always_returns_float32():
+    backend = SBERTBackend(TinyEncoder().to(torch.bfloat16), "bf16", "tiny")
+    assert backend.encode(TEXTS).dtype == torch.float32
+    assert backend.model_id == "tiny:bf16"
+    assert SBERTBackend(TinyEncoder(), "fp32", "tiny").model_id == "tiny"
+
+
+@pytest.mark.parametrize("backend", ["fp32", "int8", "bf16"])
+def test_backends_return_the_same_types(backend):
+    """Every backend answers like SentenceTransformer.encode: tensor or ndarray."""
+    model = TinyEncoder()
+    if backend == "int8":
+        model = quantize_linear_layers(model)
+    elif backend == "bf16":
+        model = model.to(torch.bfloat16)
+    sbert = SBERTBackend(model, backend, "tiny")
+
+    assert isinstance(sbert.encode(TEXTS), torch.Tensor)
+    array = sbert.encode(TEXTS, convert_to_tensor=False)
+    assert isinstance(array, np.ndarray)
+    assert array.dtype == np.float32 and array.shape == (len(TEXTS), 32)
+
+
+def test_int8_parity_against_fp32():
+    """Quantized Linear layers stay close to the fp32 reference."""
+    reference = SBERTBackend(TinyEncoder(), "fp32", "tiny")
+    int8 = SBERTBackend(quantize_linear_layers(TinyEncoder()), "int8", "tiny")
+
+    report = parity_report(int8, reference, TEXTS[:2], TEXTS[2:])
+
+    assert report["min_embedding_cosine"] > 0.99
+    assert report["max_score_delta"] < 0.05
+    assert 0.0 <= report["best_match_agreement"] <= 1.0
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        load_sbert("fp8")
+
+
+def test_load_applies_backend():
+    with patch("src.inference_backends.SentenceTransformer") as sbert_cls:
+        sbert_cls.return_value = MagicMock()
+        backend = load_sbert("bf16", model_name="tiny")
+    sbert_cls.return_value.to.assert_called_once_with(torch.bfloat16)
+    assert backend.backend == "bf16"
@@ -0,0 +1,84 @@
+import time
+from unittest.mock import patch
+
+import pytest
+import torch
+
+from src.data_models import JobRegisterRequest, MatchRequest
+from src.document import PreparedJob
+from src.job_registry import JobNotFoundError, JobRegistry
+from tests.test_data import JOB_OFFERS, CV_CANDIDATE
+
+
+def _job():
+    return PreparedJob(["build apis in python"], torch.rand(1, 8), ["python"],
+                       lemmatized_text="build api python")
+
+
+def test_registry_survives_restart(tmp_path):
+    """Artifacts are restored unchanged from the SQLite file."""
+    path = str(tmp_path / "jobs.sqlite3")
+    job = _job()
+    registry = JobRegistry("model", path)
+    registry.register("job-1", {"requirements": "Python"}, job)
+    registry.close()
+
+    restored = JobRegistry("model", path).get("job-1")
+    assert restored.chunks == job.chunks
+    assert restored.skills == job.skills
+    assert restored.lemmatized_text == job.lemmatized_text
+    assert torch.equal(restored.embeddings, job.embeddings)
+
+
+def test_registry_expiry_and_model_mismatch(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+    registry = JobRegistry("model", path)
+    registry.register("live", {}, _job())
+    registry.register("old", {}, _job(), ttl_days=1e-9)
+    time.sleep(0.01)
+
+    with pytest.raises(JobNotFoundError):
+        registry.get("old")
+    assert registry.evict_expired() == 1
+    assert len(registry) == 1
+
+    # Embeddings of another model are never reused
+    with pytest.raises(JobNotFoundError):
+        JobRegistry("other-model", path).get("live")
+
+
+def test_lookups_purge_expired_rows(tmp_path):
+    """Expired rows go away without a new registration."""
+    registry = JobRegistry("model", str(tmp_path / "jobs.sqlite3"), evict_interval=0)
+    registry.register("live", {}, _job())
+    registry.register("old", {}, _job(), ttl_days=1e-9)
+    time.sleep(0.01)
+
+    assert registry.stats()["jobs"] == 1
+    assert registry.evictions == 0   # reading the stats does not purge
+
+    registry.get("live")
+    assert registry.evictions == 1
+    assert registry._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0] == 1
+
+
+def test_match_by_job_id_skips_job_side_work(mock_engine):
+    """A registered job scores the same as its raw text, without re-parsing it."""
+    job_text = JOB_OFFERS['perfect']['text']
+    info = mock_engine.register_job(JobRegisterRequest(job_description=job_text))
+    assert info.job_id == JobRegistry.make_job_id(job_text)
+
+    by_text = mock_engine.calculate_match(
+        MatchRequest(job_description=job_text, cv_text=CV_CANDIDATE))
+    # Any job-side parsing would fail
+    with patch.object(mock_engine.job_parser, "parse", None):
+        by_id = mock_engine.calculate_match(
+            MatchRequest(job_id=info.job_id, cv_text=CV_CANDIDATE))
+
+    assert by_id.semantic_score == pytest.approx(by_text.semantic_score, abs=1e-4)
+    assert by_id.keyword_score == by_text.keyword_score
+    assert by_id.missing_keywords == by_text.missing_keywords
+
+    assert mock_engine.delete_job(info.job_id)
+    with pytest.raises(JobNotFoundError):
+        mock_engine.calculate_match(MatchRequest(job_id=info.job_id, cv_text=CV_CANDIDATE))
@@ -0,0 +1,100 @@
+import random
+from unittest.mock import patch
+
+import pytest
+import spacy
+
+from src.processors.ner import NERProcessor
+from src.processors.skill_index import SkillIndex
+
+PATTERNS = [
+    {"label": "SKILL", "pattern": [{"LOWER": "machine"}, {"LOWER": "learning"}], "id": "uri:ml"},
+    {"label": "SKILL", "pattern": [{"LOWER": "ml"}], "id": "uri:ml"},
+    {"label": "SKILL", "pattern": [{"LOWER": "learning"}], "id": "uri:learn"},
+    {"label": "SKILL", "pattern": [{"LOWER": "python"}], "id": "uri:py"},
+    {"label": "SKILL", "pattern": [{"LOWER": "sql"}]},
+]
+TEXT = "Built Machine Learning models in Python and SQL; ML ops and continuous learning."
+
+
+def _processor(backend):
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer", name="parser")
+    with patch.object(NERProcessor, "_get_mvp_patterns", return_value=PATTERNS):
+        processor = NERProcessor(nlp, backend=backend)
+    processor.uri_to_canonical = {"uri:ml": "machine learning", "uri:py": "python (computer programming)"}
+    return processor
+
+
+def test_phrase_matcher_matches_entity_ruler():
+    """Same skills (longest match wins, canonical names kept) with either backend."""
+    ruler, phrase = _processor("ruler"), _processor("phrase")
+
+    expected = ruler._extract_skills(ruler.nlp(TEXT))
+    assert phrase._extract_skills(phrase.nlp(TEXT)) == expected
+    assert expected == ["learning", "machine learning", "python (computer programming)", "sql"]
+
+
+def test_phrase_matcher_is_not_a_pipeline_component():
+    processor = _processor("phrase")
+    assert "entity_ruler" not in processor.nlp.pipe_names
+    doc = processor.nlp(TEXT)
+    assert doc.ents == ()
+    # Works on section spans too
+    assert processor._extract_skills(doc[:5]) == ["machine learning"]
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        _processor("regex")
+
+
+def test_skill_index_matches_phrase_matcher():
+    """The Aho-Corasick backend extracts exactly what the PhraseMatcher does."""
+    trie, phrase = _processor("trie"), _processor("phrase")
+
+    doc = trie.nlp(TEXT)
+    assert trie._extract_skills(doc) == phrase._extract_skills(phrase.nlp(TEXT))
+    assert trie._extract_skills(doc[:5]) == ["machine learning"]
+    assert trie.stats()["skill_index"]["phrases"] == len(PATTERNS)
+
+
+def test_skill_index_overlaps_and_failure_links():
+    phrases = {
+        "abcd": [(1, 2, 3, 4)],
+        "bc": [(2, 3)],
+        "c": [(3,)],
+        "cx": [(3, 9)],
+    }
+    index = SkillIndex(phrases)
+
+    # 'a b c x': the 'abcd' branch fails at x and falls back to 'c x'
+    assert sorted(index.find([1, 2, 3, 9])) == [(1, 3, "bc"), (2, 3, "c"), (2, 4, "cx")]
+    assert sorted(index.find([7, 1, 2, 3, 4])) == [
+        (1, 5, "abcd"), (2, 4, "bc"), (3, 4, "c")]
+    assert index.find([5, 6]) == []
+    assert SkillIndex({}).find([1, 2]) == []
+
+    assert SkillIndex.longest(index.find([1, 2, 3, 9])) == [(1, 3, "bc")]
+    assert SkillIndex.longest(index.find([2, 3, 9, 1, 2, 3, 4])) == [(0, 2, "bc"), (3, 7, "abcd")]
+
+
+# scale 2**40: every token hash has the same low bits, so all of them
+# collide in the token table and are found by probing
+@pytest.mark.parametrize("scale", [1, 2 ** 40])
+def test_skill_index_random_phrases_match_brute_force(scale):
+    rng = random.Random(0)
+    phrases = {f"k{i}": [tuple(scale * rng.randint(1, 6) for _ in range(rng.randint(1, 3)))]
+               for i in range(40)}
+    index = SkillIndex(phrases)
+    first_key = {}
+    for key, (phrase,) in phrases.items():
+        first_key.setdefault(phrase, key)
+
+    for _ in range(50):
+        tokens = [scale * rng.randint(1, 7) for _ in range(30)]
+        expected = sorted((start, start + len(phrase), key)
+                          for phrase, key in first_key.items()
+                          for start in range(len(tokens) - len(phrase) + 1)
+                          if tuple(tokens[start:start + len(phrase)]) == phrase)
+        assert sorted(index.find(tokens)) == expected
@@ -0,0 +1,74 @@
+import json
+from unittest.mock import patch
+
+import pytest
+import spacy
+
+from src.document import add_newline_boundaries
+from src.ner_snapshot import (build_snapshot, load_snapshot, read_meta,
+                              SnapshotMismatchError)
+from src.processors.ner import NERProcessor
+
+PATTERNS = [
+    {"label": "SKILL", "pattern": [{"LOWER": "c++"}], "id": "uri:cpp"},
+    {"label": "SKILL", "pattern": [{"LOWER": "machine"}, {"LOWER": "learning"}], "id": "uri:ml"},
+    {"label": "SKILL", "pattern": [{"LOWER": "sql"}]},
+]
+TEXT = "Wrote C++ services and machine learning pipelines backed by SQL."
+
+
+def _base_pipeline():
+    nlp = spacy.blank("en")
+    nlp.add_pipe("sentencizer", name="parser")
+    add_newline_boundaries(nlp)
+    return nlp
+
+
+def _build(tmp_path, backend):
+    path = str(tmp_path / "snapshot")
+    with patch.object(NERProcessor, "_get_mvp_patterns", side_effect=lambda: PATTERNS):
+        live = NERProcessor(_base_pipeline(), backend=backend)
+        meta = build_snapshot(_base_pipeline(), path, backend=backend)
+    return path, live, meta
+
+
+@pytest.mark.parametrize("backend", ["phrase", "trie", "ruler"])
+def test_snapshot_restores_the_configured_pipeline(tmp_path, backend):
+    path, live, meta = _build(tmp_path, backend)
+    assert read_meta(path) == meta
+
+    with patch.object(NERProcessor, "_get_mvp_patterns") as get_patterns:
+        nlp, processor = load_snapshot(path, backend=backend, model_name=meta["spacy_model"])
+    get_patterns.assert_not_called()
+
+    # Tokenizer special cases survive the round trip
+    assert "C++" in [token.text for token in nlp(TEXT)]
+    assert processor._extract_skills(nlp(TEXT)) == live._extract_skills(live.nlp(TEXT))
+    assert processor._extract_skills(nlp(TEXT)) == ["c++", "machine learning", "sql"]
+
+
+def test_mismatched_snapshot_is_rejected(tmp_path):
+    path, _, meta = _build(tmp_path, "phrase")
+
+    with pytest.raises(SnapshotMismatchError, match="backend"):
+        load_snapshot(path, backend="ruler", model_name=meta["spacy_model"])
+    with pytest.raises(SnapshotMismatchError, match="spacy_model"):
+        load_snapshot(path, backend="phrase", model_name="en_core_web_lg")
+    with patch("src.ner_snapshot.skills_fingerprint", return_value="changed"), \
+            pytest.raises(SnapshotMismatchError, match="skills_fingerprint"):
+        load_snapshot(path, backend="phrase", model_name=meta["spacy_model"])
+
+    with patch("spacy.util.get_package_version", return_value="99.0.0"), \
+            pytest.raises(SnapshotMismatchError, match="spacy_model_version"):
+        load_snapshot(path, backend="phrase", model_name=meta["spacy_model"])
+    with patch("spacy.util.get_package_version", return_value=meta["spacy_model_version"]):
+        load_snapshot(path, backend="phrase", model_name=meta["spacy_model"])
+
+    (tmp_path / "snapshot" / "meta.json").write_text(json.dumps({**meta, "format": 0}))
+    with pytest.raises(SnapshotMismatchError, match="format"):
+        load_snapshot(path, backend="phrase", model_name=meta["spacy_model"])
+
+
+def test_missing_snapshot(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_snapshot(str(tmp_path / "absent"))
@@ -36,3 +36,15 @@ def test_job_parser_signal_filtering():
     assert "about" not in parsed
     assert "must know python" in parsed["requirements"].lower()
     assert "write code" in parsed["responsibilities"].lower()
+
+
+def test_normalize_matches_across_formatting_variants():
+    """Line endings, indentation, blank lines and bullet styles normalize alike."""
+    parser = JobOfferParser()
+    variants = [
+        "Company overview\n• We build tools for recruiters.\n1. Founded in Berlin.",
+        "  Company overview\r\n\r\n  * We build tools for recruiters.\r\n  -   Founded in Berlin.\r\n",
+    ]
+    assert parser.parse(variants[0]) == {}   # no signal section: the engine falls back
+    normalized = {parser.normalize(text) for text in variants}
+    assert normalized == {"Company overview\n- We build tools for recruiters.\n- Founded in Berlin."}
@@ -0,0 +1,54 @@
+from unittest.mock import MagicMock
+
+import torch
+import torch.nn.functional as F
+from sentence_transformers import util
+
+from src.processors.semantic import SemanticProcessor, CVChunks
+
+
+def _reference_matches(job_emb, cv_emb, cv_weights, cv_sections):
+    """Row-by-row version of the best-match extraction (previous behaviour)."""
+    sim = util.cos_sim(job_emb, cv_emb)
+    scores, per_section = [], {}
+    for i in range(sim.shape[0]):
+        best = int(torch.argmax(sim[i]))
+        raw = float(sim[i][best])
+        scores.append((best, raw, max(0.0, min(raw * cv_weights[best], 1.0))))
+        per_section.setdefault(cv_sections[best], []).append(raw)
+    breakdown = {s: round(sum(v) / len(v), 3) for s, v in per_section.items()}
+    return scores, breakdown
+
+
+def test_vectorized_matches_equal_row_by_row_reference():
+    torch.manual_seed(0)
+    job_emb = torch.randn(60, 16)
+    cv_emb = torch.randn(25, 16)
+    cv_sections = ["experience"] * 10 + ["skills"] * 8 + ["summary"] * 7
+    section_names = ["experience", "skills", "summary"]
+    weights = [1.3] * 10 + [1.05] * 8 + [1.0] * 7
+
+    processor = SemanticProcessor(MagicMock(), MagicMock())
+    details, total, breakdown = processor._compute_weighted_matches(
+        F.normalize(job_emb, dim=1),
+        F.normalize(cv_emb, dim=1),
+        [f"job {i}" for i in range(60)],
+        CVChunks(
+            texts=[f"cv {j}" for j in range(len(cv_sections))],
+            sections=cv_sections,
+            weights=torch.tensor(weights, dtype=torch.float64),
+            section_ids=torch.tensor([section_names.index(s) for s in cv_sections]),
+            section_names=section_names,
+        ),
+    )
+
+    expected, expected_breakdown = _reference_matches(job_emb, cv_emb, weights, cv_sections)
+
+    assert [d.best_cv_match for d in details] == [f"cv {b}" for b, _, _ in expected]
+    for detail, (_, raw, final) in zip(details, expected):
+        assert abs(detail.raw_semantic_score - round(raw, 4)) <= 1e-4
+        assert abs(detail.score - round(final, 4)) <= 1e-4
+    assert abs(total - sum(f for _, _, f in expected)) < 1e-4
+    assert breakdown.keys() == expected_breakdown.keys()
+    for section, avg in expected_breakdown.items():
+        assert abs(breakdown[section] - avg) <= 1e-3
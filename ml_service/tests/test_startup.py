@@ -0,0 +1,154 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from src.candidate_index import CandidateIndex
+from src.startup import (BackgroundLoader, WARMUP_REQUEST, load_warmup_corpus,
+                         warm_up)
+from src.utils import ComponentStatus
+from src.worker_pool import ProcessPoolEngine
+
+client = TestClient(main.app)
+
+
+def test_component_status_records_time_and_failures():
+    components = ComponentStatus()
+    with components.measure("spacy"):
+        pass
+    with pytest.raises(RuntimeError):
+        with components.measure("sbert"):
+            raise RuntimeError("no model")
+
+    stats = components.stats()
+    assert stats["spacy"]["status"] == "ready"
+    assert stats["spacy"]["seconds"] >= 0
+    assert stats["sbert"] == {"status": "failed", "error": "no model",
+                              "seconds": stats["sbert"]["seconds"]}
+
+
+def test_background_loader_reports_failure():
+    def load(components):
+        with components.measure("engine"):
+            raise OSError("model not found")
+
+    loader = BackgroundLoader()
+    loader.start(load)
+    loader.wait(10)
+
+    assert not loader.ready
+    report = loader.report()
+    assert report["status"] == "failed"
+    assert report["error"] == "model not found"
+    assert report["components"]["engine"]["status"] == "failed"
+
+
+def test_warmup_corpus():
+    corpus = load_warmup_corpus()
+    assert corpus and all(request.cv_text for request in corpus)
+    assert load_warmup_corpus("") == []
+    assert load_warmup_corpus("missing.json") == [WARMUP_REQUEST]
+
+
+def test_warm_up_runs_the_full_pipeline(mock_engine):
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert warm_up(mock_engine, [WARMUP_REQUEST], executor, rounds=3) == 3
+    stages = mock_engine.get_stats()["stages"]
+    assert stages["ner"]["count"] >= 3
+    assert stages["semantic"]["count"] >= 3
+
+
+def test_probes_before_startup(monkeypatch):
+    monkeypatch.setattr(main, "loader", BackgroundLoader())
+    assert client.get("/health/live").json() == {"status": "alive"}
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "pending"
+
+
+def test_background_startup_becomes_ready(mock_engine, monkeypatch, tmp_path):
+    """Engine, candidate index and warmup load in the background, then /health/ready is 200."""
+    loader = BackgroundLoader()
+    monkeypatch.setattr(main, "loader", loader)
+    monkeypatch.setattr(main, "ml_models", {})
+    monkeypatch.setattr(main, "CandidateIndex",
+                        lambda engine: CandidateIndex(engine, str(tmp_path / "index.npz")))
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        monkeypatch.setattr(main, "executor", executor)
+        loader.start(main._load_models)
+        loader.wait(60)
+
+    try:
+        response = client.get("/health/ready")
+        assert response.status_code == 200
+        report = response.json()
+        assert report["status"] == "ready"
+        for component in ["spacy", "sbert", "ner", "job_registry", "candidate_index", "warmup"]:
+            assert report["components"][component]["status"] == "ready"
+        assert client.get("/health").json()["ready"] is True
+    finally:
+        main.ml_models["engine"].close()
+
+
+def test_failed_warmup_keeps_the_service_alive(mock_engine, monkeypatch, tmp_path):
+    """A warmup error is reported under 'warmup'; the engine still serves."""
+    loader = BackgroundLoader()
+    monkeypatch.setattr(main, "loader", loader)
+    monkeypatch.setattr(main, "ml_models", {})
+    monkeypatch.setattr(main, "CandidateIndex",
+                        lambda engine: CandidateIndex(engine, str(tmp_path / "index.npz")))
+
+    def failing_warm_up(*args):
+        raise RuntimeError("bad corpus")
+
+    monkeypatch.setattr(main, "warm_up", failing_warm_up)
+    loader.start(main._load_models)
+    loader.wait(60)
+
+    try:
+        assert client.get("/health/live").json() == {"status": "alive"}
+        report = client.get("/health/ready").json()
+        assert report["status"] == "ready"
+        assert report["components"]["warmup"]["status"] == "failed"
+        assert report["components"]["warmup"]["error"] == "bad corpus"
+    finally:
+        main.ml_models["engine"].close()
+
+
+def test_shutdown_does_not_wait_for_a_stuck_startup(monkeypatch):
+    """SIGTERM during a slow model download returns after the bounded wait."""
+    release = threading.Event()
+    monkeypatch.setattr(main, "_load_models", lambda components: release.wait(30))
+    monkeypatch.setattr(main, "SHUTDOWN_LOADER_TIMEOUT", 0.1)
+
+    start = time.perf_counter()
+    with TestClient(main.app):
+        pass
+    assert time.perf_counter() - start < 5
+    release.set()
+
+
+def test_process_mode_checks_worker_warmup_instead_of_rerunning_it(monkeypatch, tmp_path):
+    """Workers warm up in their initializer: the corpus is not run through the pool again."""
+    def init(engine, warmup_errors=()):
+        engine.workers, engine._warmup_errors = 2, list(warmup_errors)
+
+    loader = BackgroundLoader()
+    monkeypatch.setattr(main, "EXECUTION_MODE", "process")
+    monkeypatch.setattr(ProcessPoolEngine, "__init__", init)
+    monkeypatch.setattr(main, "ml_models", {})
+    monkeypatch.setattr(main, "CandidateIndex", lambda engine: None)
+    monkeypatch.setattr(main, "warm_up", MagicMock())
+
+    main._load_models(loader.components)
+    main.warm_up.assert_not_called()
+    assert loader.components.stats()["warmup"]["status"] == "ready"
+
+    monkeypatch.setattr(ProcessPoolEngine, "__init__",
+                        lambda engine: init(engine, ["bad corpus"]))
+    main._load_models(loader.components)
+    assert loader.components.stats()["warmup"]["error"] == "1 of 2 workers failed to warm up: bad corpus"